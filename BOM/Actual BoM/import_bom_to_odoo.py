@@ -5,13 +5,17 @@ Imports Bill of Materials from Excel file to Odoo mrp.bom model
 """
 
 import xmlrpc.client
-from openpyxl import load_workbook
 import sys
+import os
 from typing import List, Dict, Optional
 import logging
 import socket
 from urllib.parse import urlparse
 
+# excel_cache.py (parsed-workbook cache) lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from excel_cache import iter_sheet_rows  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -434,18 +438,17 @@ class OdooBoMImporter:
         Returns:
             List of BoM dictionaries with components
         """
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb.active
+        rows = iter_sheet_rows(excel_path)
         
         boms = []
         current_bom = None
         
         # Read header row
-        header = [cell.value for cell in ws[1]]
+        header = list(next(rows, ()))
         logger.info(f"Excel columns: {header}")
         
         # Process data rows
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        for row_idx, row in enumerate(rows, start=2):
             product_name = row[0]  # Column 1: Product
             reference = row[4] if len(row) > 4 else None  # Column 5: Reference
             component_ref = row[5] if len(row) > 5 else None  # Column 6: Component No
@@ -495,7 +498,6 @@ class OdooBoMImporter:
         if current_bom:
             boms.append(current_bom)
         
-        wb.close()
         logger.info(f"Parsed {len(boms)} BoMs from Excel file")
         return boms
     
@@ -36,6 +36,10 @@ config_path = bom_dir / 'config.py'
 if str(bom_dir) not in sys.path:
     sys.path.insert(0, str(bom_dir))
 
+# excel_cache.py (parsed-workbook cache) lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from excel_cache import iter_sheet_rows  # noqa: E402
+
 # Try to load configuration from central config.py
 try:
     import config
@@ -122,6 +126,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# hr.employee fields downloaded once per run and matched locally (employee key prefix -> field)
+EMPLOYEE_SNAPSHOT_FIELDS = ['identification_id', 'work_email', 'name', 'company_id', 'temp_company_id', 'parent_id']
+EMPLOYEE_MATCH_FIELDS = ['identification_id', 'work_email', 'name']
+
 
 # ---------------------------------------------------------
 # Odoo Connection / Helper
@@ -166,6 +174,17 @@ class OdooEmployeeImporter:
         self.models = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/object')
         logger.info(f"Successfully connected to Odoo database: {db}")
 
+        # Employee snapshot (None until load_employee_snapshot): id -> matched fields,
+        # and (field, value, company_id or None, temp_company_id or None) -> ids
+        self._employees: Optional[Dict[int, dict]] = None
+        self._employee_index: Dict[tuple, set] = {}
+        self._default_company_id: Optional[int] = None
+
+        # Reference caches (None until loaded): country name -> id, (department name, temp_company_id) -> id
+        self._countries_by_name: Optional[Dict[str, int]] = None
+        self._departments: Dict[tuple, int] = {}
+        self._departments_loaded_for: set = set()
+
     def _test_connection(self, url: str):
         """Light socket test before XML-RPC"""
         try:
@@ -211,6 +230,140 @@ class OdooEmployeeImporter:
             [ids, vals]
         )
 
+    # ---------------- Employee snapshot ------------------
+
+    def load_employee_snapshot(self) -> None:
+        """
+        Download all (active) hr.employee records once and index them by code, email and
+        name per company / temp company, so employee lookups need no RPC.
+        """
+        records = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'hr.employee', 'search_read',
+            [[]],
+            {'fields': EMPLOYEE_SNAPSHOT_FIELDS}
+        )
+        # Employees created by this run get the user's current company
+        user_data = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'res.users', 'read',
+            [[self.uid]],
+            {'fields': ['company_id']}
+        )
+        self._default_company_id = (
+            user_data[0]['company_id'][0] if user_data and user_data[0].get('company_id') else None
+        )
+
+        self._employees = {}
+        self._employee_index = {}
+        for rec in records:
+            self._index_employee(rec['id'], {
+                'identification_id': rec.get('identification_id'),
+                'work_email': rec.get('work_email'),
+                'name': rec.get('name'),
+                'company_id': rec['company_id'][0] if rec.get('company_id') else None,
+                'temp_company_id': rec.get('temp_company_id') or None,
+                'parent_id': rec['parent_id'][0] if rec.get('parent_id') else None,
+            })
+        logger.info(f"Loaded snapshot of {len(records)} employees")
+
+    def _employee_index_keys(self, data: dict):
+        for field in EMPLOYEE_MATCH_FIELDS:
+            value = data.get(field)
+            if not value:
+                continue
+            for company_id in {data.get('company_id'), None}:
+                for temp_company_id in {data.get('temp_company_id'), None}:
+                    yield (field, value, company_id, temp_company_id)
+
+    def _index_employee(self, emp_id: int, data: dict) -> None:
+        """Add an employee to the snapshot, or re-index it after its matched fields changed."""
+        if self._employees is None:
+            return
+        old = self._employees.get(emp_id)
+        if old:
+            for key in self._employee_index_keys(old):
+                self._employee_index[key].discard(emp_id)
+            data = dict(old, **data)
+        self._employees[emp_id] = data
+        for key in self._employee_index_keys(data):
+            self._employee_index.setdefault(key, set()).add(emp_id)
+
+    def _find_employee_in_snapshot(self, field: str, value: str, company_id: Optional[int] = None,
+                                   temp_company_id: Optional[str] = None) -> Optional[int]:
+        """Local equivalent of search([(field, '=', value), company filters], limit=1) on hr.employee."""
+        emp_ids = self._employee_index.get((field, value, company_id or None, temp_company_id or None))
+        if not emp_ids:
+            return None
+        # hr.employee is ordered by name, then id
+        return min(emp_ids, key=lambda emp_id: (self._employees[emp_id].get('name') or '', emp_id))
+
+    # ---------------- Reference data ------------------
+
+    def load_countries(self) -> None:
+        """Load all res.country names once (nationality, private country, country of birth)."""
+        records = self.models.execute_kw(
+            self.db, self.uid, self.password,
+            'res.country', 'search_read',
+            [[]],
+            {'fields': ['name']}
+        )
+        self._countries_by_name = {}
+        for rec in sorted(records, key=lambda r: r['id']):
+            self._countries_by_name.setdefault(rec['name'], rec['id'])
+        logger.info(f"Loaded {len(records)} countries")
+
+    def load_departments(self, records: List[Dict], dry_run: bool = False) -> None:
+        """
+        Load the departments of the sheets being imported (by temp_company_id) once,
+        and create the missing (name, temp_company_id) pairs in one batch.
+
+        Args:
+            records: Parsed employee records
+            dry_run: If True, only log the departments that would be created
+        """
+        wanted = []
+        for rec in records:
+            if rec.get('department_name') and rec.get('sheet_title'):
+                key = (rec['department_name'], rec['sheet_title'])
+                if key not in wanted:
+                    wanted.append(key)
+        temp_company_ids = sorted({tcid for _name, tcid in wanted} - self._departments_loaded_for)
+        if temp_company_ids:
+            depts = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'hr.department', 'search_read',
+                [[('temp_company_id', 'in', temp_company_ids)]],
+                {'fields': ['name', 'temp_company_id']}
+            )
+            for dept in sorted(depts, key=lambda r: r['id']):
+                self._departments.setdefault((dept['name'], dept['temp_company_id']), dept['id'])
+            self._departments_loaded_for.update(temp_company_ids)
+            logger.info(f"Loaded {len(depts)} departments for {len(temp_company_ids)} companies")
+
+        missing = [key for key in wanted if key not in self._departments]
+        if not missing:
+            return
+        if dry_run:
+            for name, temp_company_id in missing:
+                logger.info(f"[DRY RUN] Would create department: {name} (temp_company_id: {temp_company_id})")
+            return
+
+        vals_list = [{'name': name, 'temp_company_id': temp_company_id} for name, temp_company_id in missing]
+        try:
+            dept_ids = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'hr.department', 'create',
+                [vals_list]
+            )
+        except Exception as e:
+            # Rows fall back to find_or_create_department one at a time
+            logger.error(f"Error creating {len(vals_list)} departments: {e}")
+            return
+        for (name, temp_company_id), dept_id in zip(missing, dept_ids):
+            self._departments[(name, temp_company_id)] = dept_id
+            logger.info(f"Created department: {name} (ID: {dept_id}, temp_company_id: {temp_company_id})")
+
     # ---------------- Lookups ------------------
 
     def find_department_by_name(self, name: str, temp_company_id: Optional[str] = None) -> Optional[int]:
@@ -230,6 +383,9 @@ class OdooEmployeeImporter:
         if not name:
             return None
 
+        if temp_company_id in self._departments_loaded_for:
+            return self._departments.get((name, temp_company_id))
+
         # Search by name and temp_company_id if provided
         domain = [('name', '=', name)]
         if temp_company_id:
@@ -238,13 +394,15 @@ class OdooEmployeeImporter:
         dept_ids = self._search('hr.department', domain, limit=1)
         return dept_ids[0] if dept_ids else None
 
-    def find_or_create_department(self, name: str, temp_company_id: Optional[str] = None) -> Optional[int]:
+    def find_or_create_department(self, name: str, temp_company_id: Optional[str] = None,
+                                  dry_run: bool = False) -> Optional[int]:
         """
         Find or create department by name and temp_company_id.
         
         Args:
             name: Department name
             temp_company_id: Optional temp company ID (sheet name) to store
+            dry_run: If True, never create (a missing department returns None)
             
         Returns:
             Department ID or None
@@ -259,6 +417,9 @@ class OdooEmployeeImporter:
         dept_id = self.find_department_by_name(name, temp_company_id)
         if dept_id:
             return dept_id
+        if dry_run:
+            # load_departments() already logged the departments a real run would create
+            return None
 
         # Create new department with temp_company_id
         try:
@@ -266,6 +427,8 @@ class OdooEmployeeImporter:
             if temp_company_id:
                 dept_vals['temp_company_id'] = temp_company_id
             dept_id = self._create('hr.department', dept_vals)
+            if temp_company_id:
+                self._departments[(name, temp_company_id)] = dept_id
             logger.info(f"Created department: {name} (ID: {dept_id}, temp_company_id: {temp_company_id})")
             return dept_id
         except Exception as e:
@@ -279,6 +442,8 @@ class OdooEmployeeImporter:
         name = str(name).strip()
         if not name:
             return None
+        if self._countries_by_name is not None:
+            return self._countries_by_name.get(name)
         country_ids = self._search('res.country', [('name', '=', name)], limit=1)
         return country_ids[0] if country_ids else None
 
@@ -299,6 +464,8 @@ class OdooEmployeeImporter:
         code = str(code).strip()
         if not code:
             return None
+        if self._employees is not None:
+            return self._find_employee_in_snapshot('identification_id', code, company_id, temp_company_id)
         domain = [('identification_id', '=', code)]
         if company_id:
             domain.append(('company_id', '=', company_id))
@@ -324,6 +491,8 @@ class OdooEmployeeImporter:
         email = str(email).strip()
         if not email:
             return None
+        if self._employees is not None:
+            return self._find_employee_in_snapshot('work_email', email, company_id, temp_company_id)
         domain = [('work_email', '=', email)]
         if company_id:
             domain.append(('company_id', '=', company_id))
@@ -349,6 +518,8 @@ class OdooEmployeeImporter:
         name = str(name).strip()
         if not name:
             return None
+        if self._employees is not None:
+            return self._find_employee_in_snapshot('name', name, company_id, temp_company_id)
         domain = [('name', '=', name)]
         if company_id:
             domain.append(('company_id', '=', company_id))
@@ -398,30 +569,33 @@ class OdooEmployeeImporter:
             'row_index': int,
         }
         """
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        # Only the sheet names come from the workbook; rows are read through the parsed-workbook cache
+        wb = load_workbook(excel_path, read_only=True)
+        sheet_titles = list(wb.sheetnames)
+        wb.close()
         employees: List[Dict] = []
 
-        for ws in wb.worksheets:
-            # Some sheets may be empty (no rows) or non-standard; safely skip them
-            if ws.max_row is None or ws.max_row < 1 or ws.title == 'lookup':
-                logger.info(f"Sheet '{ws.title}' has no rows, skipping.")
+        for sheet_title in sheet_titles:
+            if sheet_title == 'lookup':
+                logger.info(f"Sheet '{sheet_title}' has no rows, skipping.")
                 continue
 
-            try:
-                header_row = ws[1]
-            except IndexError:
-                logger.info(f"Sheet '{ws.title}' header row not found, skipping.")
+            rows = iter_sheet_rows(excel_path, sheet_title)
+            header = next(rows, None)
+            # Some sheets may be empty (no rows) or non-standard; safely skip them
+            if header is None:
+                logger.info(f"Sheet '{sheet_title}' header row not found, skipping.")
                 continue
 
-            header = [cell.value for cell in header_row]
+            header = list(header)
             header_index = self._build_header_index(header)
-            logger.info(f"Sheet '{ws.title}' columns: {header}")
+            logger.info(f"Sheet '{sheet_title}' columns: {header}")
 
             # Helpers to get header name for each internal key
             def h(key: str) -> Optional[str]:
                 return HEADER_MAPPING.get(key)
 
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            for row_idx, row in enumerate(rows, start=2):
                 emp_name_val = self._get_by_header(row, header_index, h('employee_name'))
                 if not emp_name_val or not str(emp_name_val).strip():
 
@@ -501,12 +675,11 @@ class OdooEmployeeImporter:
                     'department_name': str(dept_val).strip() if dept_val else None,
                     'manager_code': str(mgr_code_val).strip() if mgr_code_val else None,
                     'manager_name': str(mgr_name_val).strip() if mgr_name_val else None,
-                    'sheet_title': ws.title,
+                    'sheet_title': sheet_title,
                     'row_index': row_idx,
                 }
                 employees.append(rec)
 
-        wb.close()
         logger.info(f"Parsed {len(employees)} employees from workbook")
         return employees
 
@@ -640,7 +813,7 @@ class OdooEmployeeImporter:
         # For now, ignore pure numeric values to avoid TypeError in Odoo
         return None
 
-    def _prepare_employee_vals(self, rec: Dict) -> dict:
+    def _prepare_employee_vals(self, rec: Dict, dry_run: bool = False) -> dict:
         vals = {
             'name': rec['employee_name'],
         }
@@ -732,7 +905,9 @@ class OdooEmployeeImporter:
         if rec.get('department_name'):
             # Pass sheet_title as temp_company_id to distinguish departments across companies
             temp_company_id = rec.get('sheet_title')
-            dept_id = self.find_or_create_department(rec['department_name'], temp_company_id=temp_company_id)
+            dept_id = self.find_or_create_department(
+                rec['department_name'], temp_company_id=temp_company_id, dry_run=dry_run
+            )
             if dept_id:
                 vals['department_id'] = dept_id
 
@@ -761,6 +936,56 @@ class OdooEmployeeImporter:
         # parent_id handled in second pass
         return vals
 
+    def _write_parent_links(self, parent_links: Dict[int, tuple], stats: Dict) -> None:
+        """
+        Set parent_id with one write per manager over all of its reports.
+        Employees whose parent_id already matches the snapshot are not written.
+        If a grouped write fails, its employees are retried one at a time.
+
+        Args:
+            parent_links: employee ID -> (manager ID, record asking for that link)
+            stats: Import statistics
+        """
+        reports_by_manager: Dict[int, List[int]] = {}
+        for emp_id, (mgr_id, _rec) in parent_links.items():
+            current = self._employees.get(emp_id, {}).get('parent_id') if self._employees is not None else None
+            if current == mgr_id:
+                stats['parent_links_unchanged'] += 1
+                continue
+            reports_by_manager.setdefault(mgr_id, []).append(emp_id)
+
+        for mgr_id, emp_ids in reports_by_manager.items():
+            try:
+                self._write('hr.employee', emp_ids, {'parent_id': mgr_id})
+                done = emp_ids
+            except Exception as e:
+                logger.warning(
+                    f"Setting manager {mgr_id} on {len(emp_ids)} employees failed ({e}); retrying one by one"
+                )
+                done = []
+                for emp_id in emp_ids:
+                    try:
+                        self._write('hr.employee', [emp_id], {'parent_id': mgr_id})
+                        done.append(emp_id)
+                    except Exception as e2:
+                        rec = parent_links[emp_id][1]
+                        msg = (
+                            f"Sheet {rec['sheet_title']} Row {rec['row_index']}: Error setting manager for "
+                            f"'{rec['employee_name']}': {e2}"
+                        )
+                        logger.error(msg, exc_info=True)
+                        stats['errors'].append(msg)
+                        stats['parent_links_skipped'] += 1
+
+            for emp_id in done:
+                self._index_employee(emp_id, {'parent_id': mgr_id})
+                rec = parent_links[emp_id][1]
+                stats['parent_links_set'] += 1
+                logger.info(
+                    f"Sheet {rec['sheet_title']} Row {rec['row_index']}: Set manager for "
+                    f"employee '{rec['employee_name']}' (Employee ID: {emp_id}, Manager ID: {mgr_id})"
+                )
+
     def import_employees(self, excel_path: str, dry_run: bool = False) -> Dict:
         """Main import flow (2-pass: employees then parents)."""
         stats = {
@@ -769,6 +994,8 @@ class OdooEmployeeImporter:
             'updated_employees': 0,
             'parent_links_set': 0,
             'parent_links_skipped': 0,
+            'parent_links_unchanged': 0,
+            'parent_links_superseded': 0,
             'errors': [],
         }
 
@@ -778,6 +1005,12 @@ class OdooEmployeeImporter:
         if dry_run:
             logger.info("DRY RUN MODE - No records will be created/updated")
 
+        # Match employees of both passes against one snapshot instead of searching per key
+        self.load_employee_snapshot()
+        # Reference data for _prepare_employee_vals: countries, and departments (missing ones created here)
+        self.load_countries()
+        self.load_departments(records, dry_run=dry_run)
+
         # Map: internal key -> hr.employee.id (or negative fake id in dry_run)
         key_to_emp_id: Dict[str, int] = {}
         # ---------- PASS 1: Create/update employees w/o parent_id ----------
@@ -793,11 +1026,18 @@ class OdooEmployeeImporter:
                 # Allow cross-company search to detect if employee exists elsewhere,
                 # but still create new record for current company if needed
                 emp_id = self._find_employee_in_odoo(key, company_id=company_id, temp_company_id=temp_company_id, allow_cross_company=True)
-                vals = self._prepare_employee_vals(rec)
+                vals = self._prepare_employee_vals(rec, dry_run=dry_run)
 
                 if not dry_run:
                     if emp_id:
                         self._write('hr.employee', [emp_id], vals)
+                        changed = {
+                            field: vals[field] for field in EMPLOYEE_MATCH_FIELDS + ['temp_company_id'] if field in vals
+                        }
+                        if 'department_id' in vals:
+                            # parent_id is recomputed from the department's manager: no longer known
+                            changed['parent_id'] = None
+                        self._index_employee(emp_id, changed)
                         stats['updated_employees'] += 1
                         logger.info(
                             f"Sheet {rec['sheet_title']} Row {rec['row_index']}: Updated employee "
@@ -815,6 +1055,14 @@ class OdooEmployeeImporter:
                                 # If it still fails, raise the error
                                 raise e2
     
+                        self._index_employee(emp_id, {
+                            'identification_id': vals.get('identification_id'),
+                            'work_email': vals.get('work_email'),
+                            'name': vals.get('name'),
+                            'company_id': self._default_company_id,
+                            'temp_company_id': vals.get('temp_company_id'),
+                            'parent_id': None,
+                        })
 
                         stats['created_employees'] += 1
                         logger.info(
@@ -842,6 +1090,8 @@ class OdooEmployeeImporter:
                 stats['errors'].append(msg)
 
         # ---------- PASS 2: Set parent/manager ----------
+        # Employee ID -> (manager ID, last record asking for it); written per manager after the loop
+        parent_links: Dict[int, tuple] = {}
         for rec in records:
             emp_key = self._build_employee_key(rec)
             mgr_key = self._build_manager_key(rec)
@@ -897,21 +1147,17 @@ class OdooEmployeeImporter:
                 continue
 
             if not dry_run:
-                try:
-                    self._write('hr.employee', [emp_id], {'parent_id': mgr_id})
-                    stats['parent_links_set'] += 1
+                # Last row wins for an employee listed twice, as with one write per row
+                prev = parent_links.get(emp_id)
+                if prev:
+                    prev_rec = prev[1]
+                    stats['parent_links_superseded'] += 1
                     logger.info(
-                        f"Sheet {rec['sheet_title']} Row {rec['row_index']}: Set manager for "
-                        f"employee '{rec['employee_name']}' (Employee ID: {emp_id}, Manager ID: {mgr_id})"
-                    )
-                except Exception as e:
-                    msg = (
-                        f"Sheet {rec['sheet_title']} Row {rec['row_index']}: Error setting manager for "
-                        f"'{rec['employee_name']}': {e}"
+                        f"Sheet {prev_rec['sheet_title']} Row {prev_rec['row_index']}: Manager for "
+                        f"'{prev_rec['employee_name']}' superseded by Sheet {rec['sheet_title']} "
+                        f"Row {rec['row_index']}"
                     )
-                    logger.error(msg, exc_info=True)
-                    stats['errors'].append(msg)
-                    stats['parent_links_skipped'] += 1
+                parent_links[emp_id] = (mgr_id, rec)
             else:
                 logger.info(
                     f"[DRY RUN] Sheet {rec['sheet_title']} Row {rec['row_index']}: Would set manager for "
@@ -919,6 +1165,9 @@ class OdooEmployeeImporter:
                 )
                 stats['parent_links_set'] += 1
 
+        if parent_links:
+            self._write_parent_links(parent_links, stats)
+
         # Match employees and departments to companies after import
         if not dry_run:
             company_vals = {
@@ -1020,12 +1269,14 @@ def main():
         print("\n" + "=" * 60)
         print("EMPLOYEE IMPORT STATISTICS")
         print("=" * 60)
-        print(f"Rows processed:        {stats['total_rows']}")
-        print(f"Employees created:     {stats['created_employees']}")
-        print(f"Employees updated:     {stats['updated_employees']}")
-        print(f"Manager links created: {stats['parent_links_set']}")
-        print(f"Manager links skipped: {stats['parent_links_skipped']}")
-        print(f"Errors:                {len(stats['errors'])}")
+        print(f"Rows processed:            {stats['total_rows']}")
+        print(f"Employees created:         {stats['created_employees']}")
+        print(f"Employees updated:         {stats['updated_employees']}")
+        print(f"Manager links created:     {stats['parent_links_set']}")
+        print(f"Manager links skipped:     {stats['parent_links_skipped']}")
+        print(f"Manager links already set: {stats['parent_links_unchanged']}")
+        print(f"Manager links superseded:  {stats['parent_links_superseded']}")
+        print(f"Errors:                    {len(stats['errors'])}")
 
         if stats['errors']:
             print("\nErrors (first 10):")
@@ -11,13 +11,19 @@ First row with Product value = main MO, subsequent rows = components.
 
 import sys
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 import os
 from collections import defaultdict
+import queue
+import threading
 
 import xmlrpc.client
-from openpyxl import load_workbook
+
+# excel_cache.py (parsed-workbook cache) and odoo_batch.py (chunked calls and creates) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from excel_cache import iter_sheet_rows  # noqa: E402
+from odoo_batch import create_many, run_chunked  # noqa: E402
 
 # Set up logging to both console and file
 logger = logging.getLogger(__name__)
@@ -49,6 +55,24 @@ logger.info("MRP Production Import Script Started")
 logger.info(f"Log file: {log_file_path}")
 logger.info("=" * 60)
 
+# Max ids/codes per bulk read or "in" domain
+READ_CHUNK_SIZE = 500
+
+# product.product fields kept in the per-run product attribute cache
+PRODUCT_INFO_FIELDS = ['default_code', 'uom_id', 'tracking', 'product_tmpl_id']
+
+# Records per state-transition call (failing chunks are bisected down to single ids)
+TRANSITION_CHUNK_SIZE = 50
+
+# PWOs whose products/lots are resolved together in the import pipeline
+PIPELINE_WINDOW = 25
+
+# Concurrent mrp.production creates (one XML-RPC connection per worker)
+CREATE_WORKERS = 4
+
+# MOs per multi-record mrp.production create (a failing batch is retried one MO at a time)
+MO_CREATE_BATCH_SIZE = 20
+
 
 class OdooMRPProductionImporter:
     """Import MRP Production Orders from Excel to Odoo 18"""
@@ -80,6 +104,15 @@ class OdooMRPProductionImporter:
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo DB '%s' as '%s'", db, username)
 
+        # Per-run product caches: default_code -> product id (None = not found),
+        # product id -> {'uom_id', 'tracking', 'product_tmpl_id'} (many2one ids only)
+        self._product_ids_by_code: Dict[str, Optional[int]] = {}
+        self._product_info: Dict[int, dict] = {}
+
+        # MOs already in Odoo (loaded once per run): old_pwo_id / old_pwo_number -> {'id', 'state'}
+        self._existing_mo_by_pwo_id: Optional[Dict[str, dict]] = None
+        self._existing_mo_by_pwo_number: Dict[str, dict] = {}
+
     # ---------------- Generic helpers ------------------
 
     def _search(self, model: str, domain: list, limit: int = 1) -> List[int]:
@@ -110,6 +143,101 @@ class OdooMRPProductionImporter:
             {'fields': fields}
         )
 
+    def _search_read(self, model: str, domain: list, fields: List[str], limit: Optional[int] = None) -> List[dict]:
+        """Search and read records in one call"""
+        kwargs = {'fields': fields}
+        if limit is not None:
+            kwargs['limit'] = limit
+        return self.models.execute_kw(
+            self.db, self.uid, self.password,
+            model, 'search_read',
+            [domain],
+            kwargs
+        )
+
+    def call_batch(self, model: str, method: str, ids: List[int],
+                   chunk_size: int = TRANSITION_CHUNK_SIZE) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Call a record method (button_set_done, swap_old_name, ...) on chunks of ids.
+        A failing chunk is bisected so only the failing records are reported.
+
+        Returns:
+            tuple: (ok_ids, {failed_id: error message})
+        """
+        return run_chunked(
+            ids,
+            lambda chunk: self.models.execute_kw(
+                self.db, self.uid, self.password,
+                model, method,
+                [chunk]
+            ),
+            chunk_size=chunk_size,
+        )
+
+    # ---------------- Product attribute cache ------------------
+
+    def _store_product_info(self, rec: dict) -> None:
+        """Keep uom_id / tracking / product_tmpl_id of a product.product record (many2one -> id)."""
+        self._product_info[rec['id']] = {
+            'uom_id': rec['uom_id'][0] if rec.get('uom_id') else None,
+            'tracking': rec.get('tracking') or 'none',
+            'product_tmpl_id': rec['product_tmpl_id'][0] if rec.get('product_tmpl_id') else None,
+        }
+
+    def preload_products(self, codes: List[str]) -> None:
+        """
+        Resolve distinct default_codes and snapshot their attributes with one bulk search_read
+        (chunked). Codes not found are cached as None so they are only created, never re-searched.
+        """
+        codes = sorted({str(c).strip() for c in codes if c and str(c).strip()} - set(self._product_ids_by_code))
+        for i in range(0, len(codes), READ_CHUNK_SIZE):
+            chunk = codes[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('product.product', [('default_code', 'in', chunk)], PRODUCT_INFO_FIELDS)
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['default_code'], rec['id'])
+                self._store_product_info(rec)
+            for code in chunk:
+                self._product_ids_by_code[code] = found.get(code)
+        logger.info("Preloaded %d product code(s), %d product snapshot(s)", len(codes), len(self._product_info))
+
+    def get_product_info(self, product_id: int) -> dict:
+        """Cached uom_id / tracking / product_tmpl_id for a product; reads it once if not preloaded."""
+        if product_id not in self._product_info:
+            records = self._read('product.product', [product_id], PRODUCT_INFO_FIELDS)
+            if records:
+                self._store_product_info(records[0])
+            else:
+                self._product_info[product_id] = {'uom_id': None, 'tracking': 'none', 'product_tmpl_id': None}
+        return self._product_info[product_id]
+
+    def load_existing_mo_index(self) -> None:
+        """Index every imported (non-cancelled) mrp.production by old_pwo_id and old_pwo_number in one search_read"""
+        records = self._search_read(
+            'mrp.production',
+            [('state', '!=', 'cancel'), '|', ('old_pwo_id', '!=', False), ('old_pwo_number', '!=', False)],
+            ['old_pwo_id', 'old_pwo_number', 'state'],
+        )
+        self._existing_mo_by_pwo_id = {}
+        self._existing_mo_by_pwo_number = {}
+        for rec in records:
+            info = {'id': rec['id'], 'state': rec.get('state')}
+            if rec.get('old_pwo_id'):
+                self._existing_mo_by_pwo_id.setdefault(str(rec['old_pwo_id']).strip(), info)
+            if rec.get('old_pwo_number'):
+                self._existing_mo_by_pwo_number.setdefault(str(rec['old_pwo_number']).strip(), info)
+        logger.info("Found %d MRP Production order(s) already imported in Odoo", len(records))
+
+    def find_existing_mo(self, pwo_id: Optional[str], pwo_number: Optional[str]) -> Optional[dict]:
+        """Existing MO ({'id', 'state'}) for a PWO, matched by old_pwo_id first, then old_pwo_number"""
+        if self._existing_mo_by_pwo_id is None:
+            self.load_existing_mo_index()
+        if pwo_id and pwo_id in self._existing_mo_by_pwo_id:
+            return self._existing_mo_by_pwo_id[pwo_id]
+        if pwo_number:
+            return self._existing_mo_by_pwo_number.get(pwo_number)
+        return None
+
     # ---------------- Lookups ------------------
 
     def find_product_by_default_code(self, default_code: str) -> Optional[int]:
@@ -119,8 +247,11 @@ class OdooMRPProductionImporter:
         default_code = str(default_code).strip()
         if not default_code:
             return None
+        if default_code in self._product_ids_by_code:
+            return self._product_ids_by_code[default_code]
         product_ids = self._search('product.product', [('default_code', '=', default_code)], limit=1)
-        return product_ids[0] if product_ids else None
+        self._product_ids_by_code[default_code] = product_ids[0] if product_ids else None
+        return self._product_ids_by_code[default_code]
 
     def create_product(self, reference: str, name: str = None, auto_create: bool = True) -> Optional[int]:
         """
@@ -196,6 +327,7 @@ class OdooMRPProductionImporter:
             
             if product_ids:
                 product_id = product_ids[0]
+                self._product_ids_by_code[reference] = product_id
                 logger.info(f"Created product: {name} (Reference: {reference}, ID: {product_id})")
                 return product_id
             else:
@@ -319,14 +451,8 @@ class OdooMRPProductionImporter:
         try:
             # Get default stock location if not provided
             if not location_id:
-                # Try to find stock location
-                location_ids = self._search('stock.location', [
-                    ('usage', '=', 'internal'),
-                    ('active', '=', True)
-                ], limit=1)
-                if location_ids:
-                    location_id = location_ids[0]
-                else:
+                location_id = self.find_stock_location()
+                if not location_id:
                     logger.warning("Could not find stock location for adjustment")
                     return False
             
@@ -372,6 +498,133 @@ class OdooMRPProductionImporter:
             )
             return False
 
+    def find_stock_location(self) -> Optional[int]:
+        """First active internal location (cached for the run)"""
+        if not hasattr(self, '_stock_location_id'):
+            location_ids = self._search('stock.location', [
+                ('usage', '=', 'internal'),
+                ('active', '=', True)
+            ], limit=1)
+            self._stock_location_id = location_ids[0] if location_ids else None
+        return self._stock_location_id
+
+    def provision_opening_lots(self, products: Dict[int, str], dry_run: bool = False) -> Dict[int, int]:
+        """
+        Find or create the "OPENING-X" lots of many products at once
+
+        Args:
+            products: {product_id: product default_code} of lot/serial tracked components
+            dry_run: If True, only log the lots that would be created
+
+        Returns:
+            Dict of product_id -> lot_id (products whose lot could not be found/created are missing)
+        """
+        if not products:
+            return {}
+        lot_names = {pid: f"OPENING-{code}" for pid, code in products.items()}
+        lot_by_product = {}
+        product_ids = sorted(products)
+        for i in range(0, len(product_ids), READ_CHUNK_SIZE):
+            chunk = product_ids[i:i + READ_CHUNK_SIZE]
+            lots = self._search_read('stock.lot', [
+                ('product_id', 'in', chunk),
+                ('name', 'in', [lot_names[pid] for pid in chunk]),
+            ], ['product_id', 'name'])
+            for lot in sorted(lots, key=lambda r: r['id']):
+                pid = lot['product_id'][0]
+                if lot['name'] == lot_names.get(pid):
+                    lot_by_product.setdefault(pid, lot['id'])
+
+        missing = [pid for pid in product_ids if pid not in lot_by_product]
+        if missing and dry_run:
+            for pid in missing:
+                logger.info(f"[DRY RUN] Would create lot '{lot_names[pid]}' for product ID {pid}")
+        elif missing:
+            for i in range(0, len(missing), READ_CHUNK_SIZE):
+                chunk = missing[i:i + READ_CHUNK_SIZE]
+                try:
+                    new_ids = self.models.execute_kw(
+                        self.db, self.uid, self.password,
+                        'stock.lot', 'create',
+                        [[{'product_id': pid, 'name': lot_names[pid]} for pid in chunk]]
+                    )
+                    lot_by_product.update(zip(chunk, new_ids))
+                    logger.info(f"Created {len(new_ids)} OPENING-X lots")
+                except Exception as e:
+                    # Fall back to one lot at a time so a single bad product does not block the rest
+                    logger.warning(f"Bulk lot creation failed ({e}); creating lots one by one")
+                    for pid in chunk:
+                        lot_id = self.find_or_create_opening_lot(pid, products[pid], dry_run=dry_run)
+                        if lot_id:
+                            lot_by_product[pid] = lot_id
+        logger.info(f"OPENING-X lots ready for {len(lot_by_product)} of {len(products)} tracked components")
+        return lot_by_product
+
+    def seed_opening_stock(self, lot_by_product: Dict[int, int], quantity: float = 10000.0,
+                           dry_run: bool = False) -> None:
+        """
+        Set inventory_quantity of all OPENING-X lots in the stock location at once:
+        one write over the existing quants and one multi-create for the missing ones
+
+        Args:
+            lot_by_product: {product_id: lot_id}
+            quantity: Quantity to set (default: 10000)
+            dry_run: If True, only log without writing
+        """
+        if not lot_by_product:
+            return
+        if dry_run:
+            logger.info(f"[DRY RUN] Would set {len(lot_by_product)} OPENING-X lot quantities to {quantity}")
+            return
+        location_id = self.find_stock_location()
+        if not location_id:
+            logger.warning("Could not find stock location for adjustment")
+            return
+        try:
+            lot_ids = sorted(lot_by_product.values())
+            quant_ids = []
+            seeded = set()
+            for i in range(0, len(lot_ids), READ_CHUNK_SIZE):
+                quants = self._search_read('stock.quant', [
+                    ('lot_id', 'in', lot_ids[i:i + READ_CHUNK_SIZE]),
+                    ('location_id', '=', location_id),
+                ], ['product_id', 'lot_id'])
+                for quant in quants:
+                    key = (quant['product_id'][0], quant['lot_id'][0])
+                    if key not in seeded:
+                        seeded.add(key)
+                        quant_ids.append(quant['id'])
+            for i in range(0, len(quant_ids), READ_CHUNK_SIZE):
+                self.models.execute_kw(
+                    self.db, self.uid, self.password,
+                    'stock.quant', 'write',
+                    [quant_ids[i:i + READ_CHUNK_SIZE], {'inventory_quantity': quantity}]
+                )
+            new_quants = [
+                {
+                    'product_id': pid,
+                    'lot_id': lot_id,
+                    'location_id': location_id,
+                    'inventory_quantity': quantity,
+                }
+                for pid, lot_id in lot_by_product.items() if (pid, lot_id) not in seeded
+            ]
+            for i in range(0, len(new_quants), READ_CHUNK_SIZE):
+                self.models.execute_kw(
+                    self.db, self.uid, self.password,
+                    'stock.quant', 'create',
+                    [new_quants[i:i + READ_CHUNK_SIZE]]
+                )
+            logger.info(
+                f"Seeded OPENING-X stock: {len(quant_ids)} quants updated, {len(new_quants)} created "
+                f"(Location ID {location_id}, Quantity {quantity})"
+            )
+        except Exception as e:
+            # Fall back to the per-lot adjustment
+            logger.warning(f"Bulk stock seeding failed ({e}); adjusting lots one by one")
+            for pid, lot_id in lot_by_product.items():
+                self.create_stock_adjustment(pid, lot_id, quantity=quantity, location_id=location_id)
+
     def reset_opening_lot_quantities(self, lot_ids: List[int], dry_run: bool = False):
         """
         Reset all OPENING-X lot quantities to 0 after manufacturing is done
@@ -384,39 +637,45 @@ class OdooMRPProductionImporter:
             return
         
         logger.info(f"Resetting {len(lot_ids)} OPENING-X lot quantities to 0")
-        
-        for lot_id in lot_ids:
+
+        # One search_read over all lots, then one write of 0 over all their quants (chunked)
+        quant_ids = []
+        lot_names = {}
+        unique_lot_ids = sorted(set(lot_ids))
+        for i in range(0, len(unique_lot_ids), READ_CHUNK_SIZE):
+            chunk = unique_lot_ids[i:i + READ_CHUNK_SIZE]
             try:
-                # Get lot info
-                lot_data = self._read('stock.lot', [lot_id], ['product_id', 'name'])
-                if not lot_data:
-                    continue
-                
-                product_id = lot_data[0]['product_id'][0]
-                lot_name = lot_data[0]['name']
-                
-                # Find all quants for this lot
-                quant_ids = self._search('stock.quant', [
-                    ('product_id', '=', product_id),
-                    ('lot_id', '=', lot_id)
-                ])
-                
-                if not quant_ids:
-                    continue
-                
-                if not dry_run:
-                    # Set all quants to 0
-                    self.models.execute_kw(
-                        self.db, self.uid, self.password,
-                        'stock.quant', 'write',
-                        [quant_ids, {'inventory_quantity': 0.0}]
-                    )
-                    logger.info(f"Reset lot '{lot_name}' (ID: {lot_id}) quantity to 0")
-                else:
-                    logger.info(f"[DRY RUN] Would reset lot '{lot_name}' (ID: {lot_id}) quantity to 0")
-                    
+                quants = self._search_read('stock.quant', [('lot_id', 'in', chunk)], ['lot_id'])
             except Exception as e:
-                logger.error(f"Error resetting lot ID {lot_id}: {e}", exc_info=True)
+                logger.error(f"Error reading quants for lot IDs {chunk}: {e}", exc_info=True)
+                continue
+            for quant in quants:
+                quant_ids.append(quant['id'])
+                lot_names[quant['lot_id'][0]] = quant['lot_id'][1]
+
+        if not quant_ids:
+            return
+
+        if dry_run:
+            logger.info(
+                f"[DRY RUN] Would reset {len(quant_ids)} quants of {len(lot_names)} OPENING-X lots to 0"
+            )
+            return
+
+        for i in range(0, len(quant_ids), READ_CHUNK_SIZE):
+            chunk = quant_ids[i:i + READ_CHUNK_SIZE]
+            try:
+                self.models.execute_kw(
+                    self.db, self.uid, self.password,
+                    'stock.quant', 'write',
+                    [chunk, {'inventory_quantity': 0.0}]
+                )
+            except Exception as e:
+                logger.error(f"Error resetting quants {chunk}: {e}", exc_info=True)
+        logger.info(
+            f"Reset {len(quant_ids)} quants of {len(lot_names)} OPENING-X lots to 0: "
+            f"{', '.join(sorted(lot_names.values()))}"
+        )
 
     # ---------------- Parsing helpers ------------------
 
@@ -470,6 +729,110 @@ class OdooMRPProductionImporter:
 
     # ---------------- Excel parsing ------------------
 
+    def _parse_row(self, row_idx: int, row_cells: tuple) -> Optional[Tuple[str, str, Dict]]:
+        """
+        Parse one Excel row
+
+        Returns:
+            (pwo_id, 'mo' | 'component', values), or None if the row carries nothing to import
+        """
+        if len(row_cells) < 15:
+            return None
+
+        # Extract values by column index (0-based)
+        # Column A (0): ProductWorkOrderID (PWO ID)
+        # Column B (1): Display Name (PWO Number)
+        # Column C (2): Start (date_start)
+        # Column D (3): End (date_finished)
+        # Column E (4): Product (product_id - main product, None for components)
+        # Column F (5): Quantity To Produce (product_qty)
+        # Column G (6): State
+        # Column H (7): Components/Product/Internal Reference (component default_code)
+        # Column I (8): Components/Product/Name (component name)
+        # Column J (9): Components/Quantity To Consume (component qty)
+        # Column K (10): sale.order.id (old_so_id)
+        # Column L (11): sale.order.reference (old_so_number)
+        # Column M (12): sw.order.id (old_swo_id)
+        # Column N (13): sw.order.reference (old_swo_number)
+        # Column O (14): ProductWorkOrderID (duplicate)
+
+        pwo_id = row_cells[0] if len(row_cells) > 0 else None
+        pwo_number = row_cells[1] if len(row_cells) > 1 else None
+        start_date = row_cells[2] if len(row_cells) > 2 else None
+        end_date = row_cells[3] if len(row_cells) > 3 else None
+        product_code = row_cells[4] if len(row_cells) > 4 else None
+        product_qty = row_cells[5] if len(row_cells) > 5 else None
+        state = row_cells[6] if len(row_cells) > 6 else None
+        component_code = row_cells[7] if len(row_cells) > 7 else None
+        component_name = row_cells[8] if len(row_cells) > 8 else None
+        component_qty = row_cells[9] if len(row_cells) > 9 else None
+        old_so_id = row_cells[10] if len(row_cells) > 10 else None
+        old_so_number = row_cells[11] if len(row_cells) > 11 else None
+        old_swo_id = row_cells[12] if len(row_cells) > 12 else None
+        old_swo_number = row_cells[13] if len(row_cells) > 13 else None
+
+        if not pwo_id:
+            return None
+
+        pwo_id_str = str(pwo_id).strip()
+
+        # If Product column has value, this is the main MO row
+        if product_code:
+            return pwo_id_str, 'mo', {
+                'pwo_id': pwo_id_str,
+                'pwo_number': str(pwo_number).strip() if pwo_number else None,
+                'start_date': start_date,
+                'end_date': end_date,
+                'product_code': str(product_code).strip() if product_code else None,
+                'product_qty': float(product_qty) if product_qty else 0.0,
+                'state': str(state).strip() if state else None,
+                'old_so_id': str(old_so_id).strip() if old_so_id else None,
+                'old_so_number': str(old_so_number).strip() if old_so_number else None,
+                'old_swo_id': str(old_swo_id).strip() if old_swo_id else None,
+                'old_swo_number': str(old_swo_number).strip() if old_swo_number else None,
+                'row_index': row_idx,
+            }
+        # Otherwise, this is a component row
+        if component_code:
+            return pwo_id_str, 'component', {
+                'component_code': str(component_code).strip() if component_code else None,
+                'component_name': str(component_name).strip() if component_name else None,
+                'component_qty': float(component_qty) if component_qty else 0.0,
+                'row_index': row_idx,
+            }
+        return None
+
+    def iter_pwo_groups(self, excel_path: str, sheet_name: Optional[str] = None, header_row: int = 1):
+        """
+        Stream the Excel file and yield one group per contiguous block of PWO ID rows
+
+        Only the current group is held in memory, so very large exports can be
+        processed without loading the whole sheet.
+
+        Yields:
+            (pwo_id, {'mo_data': {...}, 'components': [...]})
+        """
+        current_id = None
+        current = None
+        rows = iter_sheet_rows(excel_path, sheet_name, min_row=header_row + 1)
+        for row_idx, row_cells in enumerate(rows, header_row + 1):
+            parsed = self._parse_row(row_idx, row_cells)
+            if not parsed:
+                continue
+            pwo_id, kind, values = parsed
+            if pwo_id != current_id:
+                if current is not None:
+                    yield current_id, current
+                current_id = pwo_id
+                current = {'mo_data': None, 'components': []}
+            if kind == 'mo':
+                current['mo_data'] = values
+            else:
+                current['components'].append(values)
+
+        if current is not None:
+            yield current_id, current
+
     def parse_excel(self, excel_path: str, sheet_name: Optional[str] = None, header_row: int = 1) -> Dict[str, Dict]:
         """
         Parse Excel file and group by PWO ID
@@ -482,301 +845,490 @@ class OdooMRPProductionImporter:
         Returns:
             Dict keyed by PWO ID, containing MO data and components
         """
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
-
-        start_row = header_row + 1
-        max_row = ws.max_row
-
         # Group by PWO ID: {pwo_id: {'mo_data': {...}, 'components': [...]}}
         mo_data = defaultdict(lambda: {'mo_data': None, 'components': []})
 
-        for row_idx in range(start_row, max_row + 1):
-            row_cells = [cell.value for cell in ws[row_idx]]
+        for pwo_id, group in self.iter_pwo_groups(excel_path, sheet_name, header_row):
+            if group['mo_data']:
+                mo_data[pwo_id]['mo_data'] = group['mo_data']
+            mo_data[pwo_id]['components'].extend(group['components'])
 
-            if len(row_cells) < 15:
+        logger.info("Parsed %d MRP Production orders from Excel", len(mo_data))
+        return dict(mo_data)
+
+    # ---------------- Import Logic ------------------
+
+    def _parse_stage(self, excel_path: str, sheet_name: Optional[str], groups_q: queue.Queue, failures: list,
+                     stop: threading.Event):
+        """Parser stage: feed PWO groups into the bounded queue until done or stopped, then a None sentinel"""
+        try:
+            for group in self.iter_pwo_groups(excel_path, sheet_name):
+                if stop.is_set():
+                    break
+                groups_q.put(group)
+        except Exception as e:
+            failures.append(e)
+        finally:
+            groups_q.put(None)
+
+    def _resolve_window(self, window: List[Tuple[str, Dict]], tracked_products: Dict[int, str],
+                        opening_lot_by_product: Dict[int, int], dry_run: bool):
+        """
+        Resolution stage: bulk-resolve the products of the next PWOs and provision
+        OPENING-X lots/stock for tracked components not seen in earlier windows
+        """
+        codes = []
+        for _, data in window:
+            if data.get('mo_data'):
+                codes.append(data['mo_data']['product_code'])
+            codes.extend(comp['component_code'] for comp in data.get('components', []))
+        self.preload_products(codes)
+
+        new_tracked = {}
+        for _, data in window:
+            if not data.get('mo_data'):
                 continue
+            for comp in data.get('components', []):
+                comp_product_id = self.find_product_by_default_code(comp['component_code'])
+                if (comp_product_id and comp_product_id not in tracked_products
+                        and self.get_product_info(comp_product_id)['tracking'] in ('lot', 'serial')):
+                    new_tracked.setdefault(comp_product_id, comp['component_code'])
+        if new_tracked:
+            tracked_products.update(new_tracked)
+            new_lots = self.provision_opening_lots(new_tracked, dry_run=dry_run)
+            self.seed_opening_stock(new_lots, quantity=10000.0, dry_run=dry_run)
+            opening_lot_by_product.update(new_lots)
+
+    def _prepare_mo(self, pwo_id: str, data: Dict, stats: Dict, tracked_products: Dict[int, str],
+                    opening_lot_by_product: Dict[int, int], opening_lot_ids: List[int],
+                    dry_run: bool) -> Optional[Tuple[Dict, bool, int]]:
+        """
+        Build the mrp.production values for one PWO group
+
+        Returns:
+            (mo_vals, should_mark_done, component count), or None if the PWO cannot be imported
+        """
+        mo_info = data.get('mo_data')
+        if not mo_info:
+            error_msg = f"PWO ID {pwo_id}: No main MO data found (missing Product column)"
+            logger.error(error_msg)
+            stats['errors'].append(error_msg)
+            return None
 
-            # Extract values by column index (0-based)
-            # Column A (0): ProductWorkOrderID (PWO ID)
-            # Column B (1): Display Name (PWO Number)
-            # Column C (2): Start (date_start)
-            # Column D (3): End (date_finished)
-            # Column E (4): Product (product_id - main product, None for components)
-            # Column F (5): Quantity To Produce (product_qty)
-            # Column G (6): State
-            # Column H (7): Components/Product/Internal Reference (component default_code)
-            # Column I (8): Components/Product/Name (component name)
-            # Column J (9): Components/Quantity To Consume (component qty)
-            # Column K (10): sale.order.id (old_so_id)
-            # Column L (11): sale.order.reference (old_so_number)
-            # Column M (12): sw.order.id (old_swo_id)
-            # Column N (13): sw.order.reference (old_swo_number)
-            # Column O (14): ProductWorkOrderID (duplicate)
-
-            pwo_id = row_cells[0] if len(row_cells) > 0 else None
-            pwo_number = row_cells[1] if len(row_cells) > 1 else None
-            start_date = row_cells[2] if len(row_cells) > 2 else None
-            end_date = row_cells[3] if len(row_cells) > 3 else None
-            product_code = row_cells[4] if len(row_cells) > 4 else None
-            product_qty = row_cells[5] if len(row_cells) > 5 else None
-            state = row_cells[6] if len(row_cells) > 6 else None
-            component_code = row_cells[7] if len(row_cells) > 7 else None
-            component_name = row_cells[8] if len(row_cells) > 8 else None
-            component_qty = row_cells[9] if len(row_cells) > 9 else None
-            old_so_id = row_cells[10] if len(row_cells) > 10 else None
-            old_so_number = row_cells[11] if len(row_cells) > 11 else None
-            old_swo_id = row_cells[12] if len(row_cells) > 12 else None
-            old_swo_number = row_cells[13] if len(row_cells) > 13 else None
-
-            if not pwo_id:
+        # Find or create product by default_code
+        product_id = self.find_or_create_product(mo_info['product_code'], stats=stats)
+        if not product_id:
+            error_msg = f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Failed to find or create product for '{mo_info['product_code']}'"
+            logger.error(error_msg)
+            stats['errors'].append(error_msg)
+            return None
+
+        # Get product UOM
+        uom_id = self.get_product_info(product_id)['uom_id']
+
+        # Map state - returns (state, should_mark_done)
+        mapped_state, should_mark_done = self._map_state(mo_info['state'])
+
+        # Prepare MO values
+        mo_vals = {
+            'product_id': product_id,
+            'product_qty': mo_info['product_qty'],
+            'qty_producing': mo_info['product_qty'] if should_mark_done else None,
+            'product_uom_id': uom_id,
+            'date_start': self._to_datetime_str(mo_info['start_date']),
+            'date_finished': self._to_datetime_str(mo_info['end_date']),
+            # 'state': mapped_state,
+            'old_pwo_id': mo_info['pwo_id'],
+            'old_pwo_number': mo_info['pwo_number'],
+            'old_so_id': mo_info['old_so_id'],
+            'old_so_number': mo_info['old_so_number'],
+            'old_swo_id': mo_info['old_swo_id'],
+            'bom_id': False,
+            'old_swo_number': mo_info['old_swo_number'],
+        }
+
+        # Prepare components (move_raw_ids)
+        components = data.get('components', [])
+        move_raw_vals = []
+        for comp in components:
+            # Find or create component product
+            comp_product_id = self.find_or_create_product(
+                comp['component_code'],
+                name=comp.get('component_name'),
+                stats=stats
+            )
+            if not comp_product_id:
+                logger.warning(
+                    f"PWO ID {pwo_id} (Row {comp['row_index']}): Failed to find or create component product for '{comp['component_code']}'"
+                )
                 continue
 
-            pwo_id_str = str(pwo_id).strip()
-
-            # If Product column has value, this is the main MO row
-            if product_code:
-                mo_data[pwo_id_str]['mo_data'] = {
-                    'pwo_id': pwo_id_str,
-                    'pwo_number': str(pwo_number).strip() if pwo_number else None,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'product_code': str(product_code).strip() if product_code else None,
-                    'product_qty': float(product_qty) if product_qty else 0.0,
-                    'state': str(state).strip() if state else None,
-                    'old_so_id': str(old_so_id).strip() if old_so_id else None,
-                    'old_so_number': str(old_so_number).strip() if old_so_number else None,
-                    'old_swo_id': str(old_swo_id).strip() if old_swo_id else None,
-                    'old_swo_number': str(old_swo_number).strip() if old_swo_number else None,
-                    'row_index': row_idx,
-                }
-            # Otherwise, this is a component row
-            elif component_code:
-                mo_data[pwo_id_str]['components'].append({
-                    'component_code': str(component_code).strip() if component_code else None,
-                    'component_name': str(component_name).strip() if component_name else None,
-                    'component_qty': float(component_qty) if component_qty else 0.0,
-                    'row_index': row_idx,
-                })
-
-        wb.close()
-        logger.info("Parsed %d MRP Production orders from Excel", len(mo_data))
-        return dict(mo_data)
+            # Get component UOM and tracking info
+            comp_info = self.get_product_info(comp_product_id)
+            comp_uom_id = comp_info['uom_id']
+            tracking = comp_info['tracking']
+            
+            # Prepare move raw values
+            move_raw_val = {
+                'product_id': comp_product_id,
+                # 'product_uom_id': comp_uom_id,
+                'product_uom_qty': comp['component_qty'],
+                'quantity': comp['component_qty'],
+                'picked': True,
+            }
+            
+            # If product requires lot tracking, find or create "OPENING-X" lot
+            # Note: lot_id must be set on move_line_ids, not directly on the move
+            if tracking in ('lot', 'serial'):
+                lot_id = opening_lot_by_product.get(comp_product_id)
+                if not lot_id and comp_product_id not in tracked_products:
+                    # Product created during this run (not provisioned up front)
+                    lot_id = self.find_or_create_opening_lot(
+                        comp_product_id,
+                        comp['component_code'],
+                        dry_run=dry_run
+                    )
+                    if lot_id:
+                        opening_lot_by_product[comp_product_id] = lot_id
+                        if not dry_run:
+                            self.create_stock_adjustment(
+                                comp_product_id,
+                                lot_id,
+                                quantity=10000.0,
+                                dry_run=dry_run
+                            )
+                if lot_id:
+                    # Track the lot for later reset
+                    if lot_id not in opening_lot_ids:
+                        opening_lot_ids.append(lot_id)
+                        stats['created_lots'] += 1
+                    
+                    # Set lot_id on move_line_ids (stock.move.line), not on the move itself
+                    move_raw_val['move_line_ids'] = [(0, 0, {
+                        'product_id': comp_product_id,
+                        'product_uom_id': comp_uom_id,
+                        'qty_done': comp['component_qty'],
+                        'lot_id': lot_id,
+                    })]
+                else:
+                    logger.warning(
+                        f"PWO ID {pwo_id} (Row {comp['row_index']}): "
+                        f"Failed to find or create OPENING lot for product '{comp['component_code']}' "
+                        f"that requires {tracking} tracking"
+                    )
+            
+            move_raw_vals.append((0, 0, move_raw_val))
 
-    # ---------------- Import Logic ------------------
+        if move_raw_vals:
+            mo_vals['move_raw_ids'] = move_raw_vals
+
+        return mo_vals, should_mark_done, len(move_raw_vals)
+
+    def _create_mo_batch(self, models, batch: list) -> List[Tuple[tuple, Optional[int], Optional[str]]]:
+        """
+        Create a batch of MOs with one multi-record create; a failing batch is bisected down to the failing MOs
+
+        Returns:
+            [(job, mo_id or None, error message or None)] in batch order
+        """
+        # Filter out None values - XML-RPC cannot marshal None
+        mo_ids, failed = create_many(
+            [{k: v for k, v in job[2].items() if v is not None} for job in batch],
+            lambda vals_list: models.execute_kw(
+                self.db, self.uid, self.password,
+                'mrp.production', 'create',
+                [vals_list]
+            ),
+        )
+        return [(job, mo_id, failed.get(index)) for index, (job, mo_id) in enumerate(zip(batch, mo_ids))]
+
+    def _create_stage(self, create_q: queue.Queue, stats: Dict, created_mos: list,
+                      mos_to_mark_done: list, lock: threading.Lock):
+        """Creation stage worker: create queued batches of MOs over its own XML-RPC connection until a None sentinel"""
+        # ServerProxy is not thread-safe, so every worker keeps its own
+        models = xmlrpc.client.ServerProxy(f"{self.url}/xmlrpc/2/object")
+        while True:
+            batch = create_q.get()
+            if batch is None:
+                break
+            for job, mo_id, error in self._create_mo_batch(models, batch):
+                pwo_id, mo_info, mo_vals, should_mark_done, component_count = job
+                if not mo_id:
+                    error_msg = f"PWO ID {pwo_id}: Error processing MO: {error}"
+                    logger.error(error_msg)
+                    with lock:
+                        stats['errors'].append(error_msg)
+                    continue
+
+                logger.info(
+                    f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Created MO '{mo_info['pwo_number']}' "
+                    f"(ID: {mo_id}) with {component_count} components"
+                )
+                with lock:
+                    stats['created_mo'] += 1
+                    stats['created_components'] += component_count
+                    created_mos.append((pwo_id, mo_info, mo_id))
+                    # If state should be "done", use button_set_done (batched below) instead of setting state directly
+                    if should_mark_done:
+                        mos_to_mark_done.append((pwo_id, mo_info, mo_id))
 
-    def import_mrp_productions(self, excel_path: str, sheet_name: Optional[str] = None, dry_run: bool = True):
+    def _queue_existing_mo(self, pwo_id: str, mo_info: Dict, mo_id: int, stats: Dict, created_mos: list,
+                           mos_to_mark_done: list, lock: threading.Lock, dry_run: bool):
+        """Queue an MO left unfinished by an earlier run for button_set_done and swap_old_name"""
+        if dry_run:
+            logger.info(
+                f"[DRY RUN] PWO ID {pwo_id} (Row {mo_info['row_index']}): Would mark existing MO "
+                f"'{mo_info['pwo_number']}' (ID: {mo_id}) as done using button_set_done"
+            )
+        else:
+            logger.info(
+                f"PWO ID {pwo_id} (Row {mo_info['row_index']}): MO '{mo_info['pwo_number']}' already exists "
+                f"(ID: {mo_id}) but is not done; marking it done"
+            )
+            with lock:
+                created_mos.append((pwo_id, mo_info, mo_id))
+                mos_to_mark_done.append((pwo_id, mo_info, mo_id))
+        stats['finished_existing'] += 1
+
+    def _finish_created_mos(self, created_mos: list, mos_to_mark_done: list, opening_lot_ids: List[int],
+                            stats: Dict, dry_run: bool):
+        """
+        Follow-up steps on the MOs created by the pipeline (and existing MOs left unfinished by an
+        earlier run): mark done, swap_old_name, then reset the OPENING-X lot quantities to 0
+        """
+        # Creates finish out of order; run the follow-up steps in Excel order
+        created_mos.sort(key=lambda item: item[1]['row_index'])
+        mos_to_mark_done.sort(key=lambda item: item[1]['row_index'])
+        # Mark MOs done, then swap_old_name on every created MO, in batches of ids
+        if mos_to_mark_done:
+            ok_ids, failed = self.call_batch('mrp.production', 'button_set_done', [mo_id for _, _, mo_id in mos_to_mark_done])
+            logger.info(f"Marked {len(ok_ids)} MOs as done using button_set_done")
+            for pwo_id, mo_info, mo_id in mos_to_mark_done:
+                if mo_id in failed:
+                    error_msg = f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Failed to mark MO as done: {failed[mo_id]}"
+                    logger.error(error_msg)
+                    stats['errors'].append(error_msg)
+        if created_mos:
+            _, failed = self.call_batch('mrp.production', 'swap_old_name', [mo_id for _, _, mo_id in created_mos])
+            for pwo_id, mo_info, mo_id in created_mos:
+                if mo_id in failed:
+                    error_msg = f"PWO ID {pwo_id}: Error processing MO: swap_old_name failed: {failed[mo_id]}"
+                    logger.error(error_msg)
+                    stats['errors'].append(error_msg)
+
+        # After all MOs are processed and marked as done, reset OPENING-X lot quantities to 0
+        if opening_lot_ids and not dry_run:
+            logger.info("=" * 60)
+            logger.info("Resetting OPENING-X lot quantities to 0 after manufacturing completion")
+            logger.info("=" * 60)
+            self.reset_opening_lot_quantities(opening_lot_ids, dry_run=dry_run)
+        elif opening_lot_ids and dry_run:
+            logger.info(
+                f"[DRY RUN] Would reset {len(opening_lot_ids)} OPENING-X lot quantities to 0 "
+                f"after manufacturing completion"
+            )
+
+    def import_mrp_productions(self, excel_path: str, sheet_name: Optional[str] = None, dry_run: bool = True,
+                               window_size: int = PIPELINE_WINDOW, workers: int = CREATE_WORKERS,
+                               batch_size: int = MO_CREATE_BATCH_SIZE):
         """
         Import MRP production orders from Excel
 
+        Runs as a pipeline connected by bounded queues: a parser thread streams PWO
+        groups, the main thread resolves products/lots for the next ``window_size``
+        PWOs at a time, and ``workers`` threads keep several multi-record MO creates
+        of ``batch_size`` orders in flight.
+
         Args:
             excel_path: Path to Excel file
             sheet_name: Sheet name (default: active sheet)
             dry_run: If True, only log operations without creating records
+            window_size: Number of PWOs whose products are resolved together
+            workers: Number of concurrent mrp.production creates
+            batch_size: Number of MOs per multi-record create
         """
-        mo_data = self.parse_excel(excel_path, sheet_name)
-
-        if not mo_data:
-            logger.warning("No MRP Production orders found in Excel file")
-            return
-
         stats = {
-            'total_mo': len(mo_data),
+            'total_mo': 0,
             'created_mo': 0,
             'created_components': 0,
             'created_products': 0,
             'created_lots': 0,
+            'skipped_existing': 0,
+            'finished_existing': 0,
             'errors': [],
         }
 
         # Track all OPENING-X lots created during import
         opening_lot_ids = []
 
-        if dry_run:
-            logger.info("DRY RUN MODE - No records will be created in Odoo")
-
-        for pwo_id, data in mo_data.items():
-            try:
-                mo_info = data.get('mo_data')
-                if not mo_info:
-                    error_msg = f"PWO ID {pwo_id}: No main MO data found (missing Product column)"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
-                    continue
+        # Created (or resumed) MOs: (pwo_id, mo_info, mo_id); state transitions run in batches after the pipeline
+        created_mos = []
+        mos_to_mark_done = []
 
-                # Find or create product by default_code
-                product_id = self.find_or_create_product(mo_info['product_code'], stats=stats)
-                if not product_id:
-                    error_msg = f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Failed to find or create product for '{mo_info['product_code']}'"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
-                    continue
+        # OPENING-X lots provisioned so far, grown one resolution window at a time
+        tracked_products = {}
+        opening_lot_by_product = {}
 
-                # Get product UOM
-                product_data = self._read('product.product', [product_id], ['uom_id'])
-                uom_id = product_data[0]['uom_id'][0] if product_data and product_data[0].get('uom_id') else None
-
-                # Map state - returns (state, should_mark_done)
-                mapped_state, should_mark_done = self._map_state(mo_info['state'])
-
-                # Prepare MO values
-                mo_vals = {
-                    'product_id': product_id,
-                    'product_qty': mo_info['product_qty'],
-                    'qty_producing': mo_info['product_qty'] if should_mark_done else None,
-                    'product_uom_id': uom_id,
-                    'date_start': self._to_datetime_str(mo_info['start_date']),
-                    'date_finished': self._to_datetime_str(mo_info['end_date']),
-                    # 'state': mapped_state,
-                    'old_pwo_id': mo_info['pwo_id'],
-                    'old_pwo_number': mo_info['pwo_number'],
-                    'old_so_id': mo_info['old_so_id'],
-                    'old_so_number': mo_info['old_so_number'],
-                    'old_swo_id': mo_info['old_swo_id'],
-                    'bom_id': False,
-                    'old_swo_number': mo_info['old_swo_number'],
-                }
+        if dry_run:
+            logger.info("DRY RUN MODE - No records will be created in Odoo")
 
-                # Prepare components (move_raw_ids)
-                components = data.get('components', [])
-                move_raw_vals = []
-                for comp in components:
-                    # Find or create component product
-                    comp_product_id = self.find_or_create_product(
-                        comp['component_code'],
-                        name=comp.get('component_name'),
-                        stats=stats
-                    )
-                    if not comp_product_id:
-                        logger.warning(
-                            f"PWO ID {pwo_id} (Row {comp['row_index']}): Failed to find or create component product for '{comp['component_code']}'"
-                        )
-                        continue
+        # PWOs already imported are looked up in this index instead of per-PWO searches
+        self.load_existing_mo_index()
+
+        window_size = max(1, window_size)
+        groups_q = queue.Queue(maxsize=window_size * 2)
+        batch_size = max(1, batch_size)
+        create_q = queue.Queue(maxsize=max(2, (window_size * 2) // batch_size))
+        pending = []
+        parse_failures = []
+        lock = threading.Lock()
+        stop_parser = threading.Event()
+
+        parser = threading.Thread(
+            target=self._parse_stage,
+            args=(excel_path, sheet_name, groups_q, parse_failures, stop_parser),
+            daemon=True,
+        )
+        parser.start()
+
+        creators = []
+        if not dry_run:
+            for _ in range(max(1, workers)):
+                creator = threading.Thread(
+                    target=self._create_stage,
+                    args=(create_q, stats, created_mos, mos_to_mark_done, lock),
+                    daemon=True,
+                )
+                creator.start()
+                creators.append(creator)
 
-                    # Get component UOM and tracking info
-                    comp_data = self._read('product.product', [comp_product_id], ['uom_id', 'tracking'])
-                    comp_uom_id = comp_data[0]['uom_id'][0] if comp_data and comp_data[0].get('uom_id') else None
-                    tracking = comp_data[0].get('tracking', 'none') if comp_data else 'none'
-                    
-                    # Prepare move raw values
-                    move_raw_val = {
-                        'product_id': comp_product_id,
-                        # 'product_uom_id': comp_uom_id,
-                        'product_uom_qty': comp['component_qty'],
-                        'quantity': comp['component_qty'],
-                        'picked': True,
-                    }
-                    
-                    # If product requires lot tracking, find or create "OPENING-X" lot
-                    # Note: lot_id must be set on move_line_ids, not directly on the move
-                    if tracking in ('lot', 'serial'):
-                        lot_id = self.find_or_create_opening_lot(
-                            comp_product_id,
-                            comp['component_code'],
-                            dry_run=dry_run
-                        )
-                        if lot_id:
-                            # Track the lot for later reset
-                            if lot_id not in opening_lot_ids:
-                                opening_lot_ids.append(lot_id)
-                                stats['created_lots'] += 1
-                            
-                            # Create stock adjustment with 10k quantity
-                            if not dry_run:
-                                self.create_stock_adjustment(
-                                    comp_product_id,
-                                    lot_id,
-                                    quantity=10000.0,
-                                    dry_run=dry_run
-                                )
-                            
-                            # Set lot_id on move_line_ids (stock.move.line), not on the move itself
-                            move_raw_val['move_line_ids'] = [(0, 0, {
-                                'product_id': comp_product_id,
-                                'product_uom_id': comp_uom_id,
-                                'qty_done': comp['component_qty'],
-                                'lot_id': lot_id,
-                            })]
-                        else:
-                            logger.warning(
-                                f"PWO ID {pwo_id} (Row {comp['row_index']}): "
-                                f"Failed to find or create OPENING lot for product '{comp['component_code']}' "
-                                f"that requires {tracking} tracking"
+        seen_pwo_ids = set()
+        # PWO ID -> existing MO ID still to be marked done / renamed (an earlier run stopped after creating it)
+        existing_to_finish: Dict[str, int] = {}
+        parsing = True
+        try:
+            try:
+                while parsing:
+                    window = []
+                    while len(window) < window_size:
+                        group = groups_q.get()
+                        if group is None:
+                            parsing = False
+                            break
+                        pwo_id = group[0]
+                        if pwo_id in seen_pwo_ids:
+                            # Streaming needs each PWO's rows to be contiguous; a repeated block would duplicate the MO
+                            error_msg = f"PWO ID {pwo_id}: Rows are not contiguous in the Excel file; skipped repeated block"
+                            logger.error(error_msg)
+                            stats['errors'].append(error_msg)
+                            continue
+                        seen_pwo_ids.add(pwo_id)
+                        stats['total_mo'] += 1
+                        mo_info = group[1].get('mo_data')
+                        existing = mo_info and self.find_existing_mo(mo_info['pwo_id'], mo_info['pwo_number'])
+                        if existing:
+                            # Imported by an earlier run: not created again, so reruns after a partial failure do not
+                            # duplicate MOs
+                            _state, should_mark_done = self._map_state(mo_info['state'])
+                            if should_mark_done and existing['state'] != 'done':
+                                # That run stopped before the follow-up steps: finish the MO with this run's MOs
+                                # (its OPENING-X lots are provisioned with the window and reset at the end)
+                                existing_to_finish[pwo_id] = existing['id']
+                                window.append(group)
+                                continue
+                            stats['skipped_existing'] += 1
+                            logger.info(
+                                f"PWO ID {pwo_id} (Row {mo_info['row_index']}): MO '{mo_info['pwo_number']}' already exists "
+                                f"(ID: {existing['id']}, state: {existing['state']}), skipped"
                             )
-                    
-                    move_raw_vals.append((0, 0, move_raw_val))
+                            continue
+                        window.append(group)
 
-                if move_raw_vals:
-                    mo_vals['move_raw_ids'] = move_raw_vals
+                    if not window:
+                        continue
 
-                if not dry_run:
-                    # Create MO
-                    mo_id = self._create('mrp.production', mo_vals)
-                    stats['created_mo'] += 1
-                    stats['created_components'] += len(move_raw_vals)
-                    logger.info(
-                        f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Created MO '{mo_info['pwo_number']}' "
-                        f"(ID: {mo_id}) with {len(move_raw_vals)} components"
-                    )
-                    
-                    # If state should be "done", use button_mark_done instead of setting state directly
-                    if should_mark_done:
+                    try:
+                        self._resolve_window(window, tracked_products, opening_lot_by_product, dry_run)
+                    except Exception as e:
+                        error_msg = f"Error resolving products for PWO IDs {window[0][0]}..{window[-1][0]}: {e}"
+                        logger.error(error_msg, exc_info=True)
+                        stats['errors'].append(error_msg)
+
+                    for pwo_id, data in window:
+                        if pwo_id in existing_to_finish:
+                            self._queue_existing_mo(pwo_id, data['mo_data'], existing_to_finish.pop(pwo_id), stats,
+                                                    created_mos, mos_to_mark_done, lock, dry_run)
+                            continue
                         try:
-                            # Call button_mark_done method
-                            self.models.execute_kw(
-                                self.db, self.uid, self.password,
-                                'mrp.production',
-                                'button_set_done',
-                                [[mo_id]]
-                            )
-                            logger.info(
-                                f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Marked MO '{mo_info['pwo_number']}' "
-                                f"(ID: {mo_id}) as done using button_mark_done"
+                            prepared = self._prepare_mo(
+                                pwo_id, data, stats, tracked_products,
+                                opening_lot_by_product, opening_lot_ids, dry_run
                             )
+                            if not prepared:
+                                continue
+                            mo_vals, should_mark_done, component_count = prepared
+                            mo_info = data['mo_data']
+
+                            if not dry_run:
+                                pending.append((pwo_id, mo_info, mo_vals, should_mark_done, component_count))
+                                if len(pending) >= batch_size:
+                                    create_q.put(pending)
+                                    pending = []
+                            else:
+                                logger.info(
+                                    f"[DRY RUN] PWO ID {pwo_id} (Row {mo_info['row_index']}): Would create MO "
+                                    f"'{mo_info['pwo_number']}' with {component_count} components"
+                                )
+                                if should_mark_done:
+                                    logger.info(
+                                        f"[DRY RUN] PWO ID {pwo_id} (Row {mo_info['row_index']}): Would mark MO "
+                                        f"'{mo_info['pwo_number']}' as done using button_set_done"
+                                    )
+                                stats['created_mo'] += 1
+                                stats['created_components'] += component_count
                         except Exception as e:
-                            error_msg = f"PWO ID {pwo_id} (Row {mo_info['row_index']}): Failed to mark MO as done: {e}"
+                            error_msg = f"PWO ID {pwo_id}: Error processing MO: {e}"
                             logger.error(error_msg, exc_info=True)
                             stats['errors'].append(error_msg)
-                else:
-                    logger.info(
-                        f"[DRY RUN] PWO ID {pwo_id} (Row {mo_info['row_index']}): Would create MO "
-                        f"'{mo_info['pwo_number']}' with {len(move_raw_vals)} components"
-                    )
-                    if should_mark_done:
-                        logger.info(
-                            f"[DRY RUN] PWO ID {pwo_id} (Row {mo_info['row_index']}): Would mark MO "
-                            f"'{mo_info['pwo_number']}' as done using button_mark_done"
-                        )
-                    stats['created_mo'] += 1
-                    stats['created_components'] += len(move_raw_vals)
-                self.models.execute_kw(
-                        self.db, self.uid, self.password,
-                        'mrp.production',
-                        'swap_old_name',
-                        [[mo_id]]
-                    )
-            except Exception as e:
-                error_msg = f"PWO ID {pwo_id}: Error processing MO: {e}"
-                logger.error(error_msg, exc_info=True)
-                stats['errors'].append(error_msg)
-
-        # After all MOs are processed and marked as done, reset OPENING-X lot quantities to 0
-        if opening_lot_ids and not dry_run:
-            logger.info("=" * 60)
-            logger.info("Resetting OPENING-X lot quantities to 0 after manufacturing completion")
-            logger.info("=" * 60)
-            self.reset_opening_lot_quantities(opening_lot_ids, dry_run=dry_run)
-        elif opening_lot_ids and dry_run:
-            logger.info(
-                f"[DRY RUN] Would reset {len(opening_lot_ids)} OPENING-X lot quantities to 0 "
-                f"after manufacturing completion"
+            finally:
+                # Stop the parser (it may be blocked on the full queue) and drain what it already queued
+                stop_parser.set()
+                while parser.is_alive():
+                    try:
+                        groups_q.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                if pending and creators:
+                    create_q.put(pending)
+                for _ in creators:
+                    create_q.put(None)
+                for creator in creators:
+                    creator.join()
+        finally:
+            # Runs on every exit, including a parse failure or an error above: the MOs already
+            # created are still marked done / renamed, and the OPENING-X placeholder stock is reset
+            # Lots seeded for a window whose MOs never got created are reset as well
+            seeded_lot_ids = list(dict.fromkeys(opening_lot_ids + list(opening_lot_by_product.values())))
+            self._finish_created_mos(created_mos, mos_to_mark_done, seeded_lot_ids, stats, dry_run)
+
+        if parse_failures:
+            logger.error(
+                f"Parsing the Excel file failed after {stats['total_mo']} PWOs ({stats['created_mo']} MOs created): "
+                f"{parse_failures[0]}"
             )
+            raise parse_failures[0]
+
+        if not stats['total_mo']:
+            logger.warning("No MRP Production orders found in Excel file")
+            return
 
         # Summary
         logger.info("=" * 60)
         logger.info("Import Summary:")
         logger.info("  Total MOs processed: %d", stats['total_mo'])
         logger.info("  MOs created: %d", stats['created_mo'])
+        logger.info("  MOs already imported (skipped): %d", stats['skipped_existing'])
+        logger.info("  Existing MOs finished (mark done): %d", stats['finished_existing'])
         logger.info("  Components created: %d", stats['created_components'])
         logger.info("  Products created: %d", stats.get('created_products', 0))
         logger.info("  OPENING lots created: %d", stats.get('created_lots', 0))
@@ -835,6 +1387,9 @@ def main():
         EXCEL_FILE = getattr(config, "MRP_EXCEL_FILE", "output.xlsx")
         SHEET_NAME = getattr(config, "MRP_SHEET_NAME", None)
         DRY_RUN = getattr(config, "MRP_DRY_RUN", True)
+        WINDOW_SIZE = getattr(config, "MRP_PIPELINE_WINDOW", PIPELINE_WINDOW)
+        WORKERS = getattr(config, "MRP_CREATE_WORKERS", CREATE_WORKERS)
+        BATCH_SIZE = getattr(config, "MRP_CREATE_BATCH_SIZE", MO_CREATE_BATCH_SIZE)
     except ImportError:
         logger.error(f"Failed to import config from {config_path}")
         logger.error("Please ensure config.py exists in the BOM directory")
@@ -846,6 +1401,9 @@ def main():
         EXCEL_FILE = "output.xlsx"
         SHEET_NAME = "Manufacturing Order (mrp.produc"
         DRY_RUN = True
+        WINDOW_SIZE = PIPELINE_WINDOW
+        WORKERS = CREATE_WORKERS
+        BATCH_SIZE = MO_CREATE_BATCH_SIZE
 
     # CLI overrides
     if len(sys.argv) > 1 and sys.argv[1] not in ("--execute", "--dry-run"):
@@ -872,6 +1430,9 @@ def main():
         excel_path=EXCEL_FILE,
         sheet_name=SHEET_NAME,
         dry_run=DRY_RUN,
+        window_size=WINDOW_SIZE,
+        workers=WORKERS,
+        batch_size=BATCH_SIZE,
     )
 
 
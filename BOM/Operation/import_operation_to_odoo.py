@@ -13,17 +13,26 @@ Column C: Operation Template name
 """
 
 import sys
+import csv
 import logging
 import ast
 import re
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict
 
 import xmlrpc.client
-from openpyxl import load_workbook, Workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill
 
+# csv_sidecar.py (CSV round-trip of streamed report rows) and excel_cache.py (parsed-workbook cache)
+# live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from csv_sidecar import csv_cell  # noqa: E402
+from excel_cache import iter_sheet_rows  # noqa: E402
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +40,203 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Distinct domains whose product ids and BOM records are kept in memory (least recently used evicted first)
+DOMAIN_CACHE_SIZE = 64
+
+# Routing operations per multi-record mrp.routing.workcenter create / BOM ids per routing preload
+ROUTING_BATCH_SIZE = 200
+
+# Sequence of the first operation on a BOM without operations; later ones follow in steps of ROUTING_SEQUENCE_STEP
+ROUTING_FIRST_SEQUENCE = 100
+ROUTING_SEQUENCE_STEP = 10
+
+# Retrieve mode export: columns and header style, built once and shared by every sheet
+RETRIEVE_HEADERS = ['BOM ID', 'Product Name', 'Product Code']
+RETRIEVE_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+RETRIEVE_HEADER_FONT = Font(bold=True, color="FFFFFF")
+
+# product.product fields always included in the local product snapshot (local_domains mode)
+PRODUCT_SNAPSHOT_FIELDS = ['default_code', 'name', 'categ_id']
+
+
+def _like_regex(pattern: str, wrap: bool, ignore_case: bool) -> re.Pattern:
+    """Compile a SQL LIKE pattern (% and _ wildcards, backslash escapes) into a regex"""
+    parts = []
+    chars = iter(str(pattern))
+    for ch in chars:
+        if ch == '\\':
+            parts.append(re.escape(next(chars, '\\')))
+        elif ch == '%':
+            parts.append('.*')
+        elif ch == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(ch))
+    regex = ''.join(parts)
+    if wrap:
+        regex = '.*' + regex + '.*'
+    return re.compile(regex, re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+def _is_id(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _compile_leaf(field: str, operator: str, value: Any, field_type: Optional[str] = None):
+    """Compile one (field, operator, value) leaf into a predicate over a snapshot record, or None if unsupported"""
+    if field_type in ('one2many', 'many2many'):
+        return None
+    if field_type == 'many2one':
+        # Odoo resolves names (e.g. ('workcenter_id', '=', 'Assembly')) through name_search; only ids are
+        # compared locally
+        if operator in ('=', '!=') and not (value is False or value is None or _is_id(value)):
+            return None
+        if operator in ('in', 'not in') and not (
+            isinstance(value, (list, tuple)) and all(_is_id(v) for v in value)
+        ):
+            return None
+        if operator not in ('=', '!=', 'in', 'not in'):
+            return None
+
+    def scalar(record):
+        # Many2one values come as [id, display_name]; compare on the id
+        val = record.get(field)
+        return val[0] if isinstance(val, (list, tuple)) else val
+
+    def text(record):
+        val = record.get(field)
+        if isinstance(val, (list, tuple)):
+            val = val[1] if len(val) > 1 else None
+        return val if val not in (None, False) else None
+
+    if operator in ('=', '!='):
+        if value is False or value is None:
+            is_null = lambda record: scalar(record) in (None, False, '')  # noqa: E731
+            return is_null if operator == '=' else (lambda record: not is_null(record))
+        if operator == '=':
+            return lambda record: scalar(record) == value
+        return lambda record: scalar(record) != value
+
+    if operator in ('in', 'not in'):
+        if not isinstance(value, (list, tuple)):
+            return None
+        values = set(value)
+        with_null = False in values or None in values
+        matches = lambda record: (scalar(record) in values) or (with_null and scalar(record) in (None, False))  # noqa: E731
+        return matches if operator == 'in' else (lambda record: not matches(record))
+
+    like_ops = {
+        'like': (True, False), 'ilike': (True, True),
+        '=like': (False, False), '=ilike': (False, True),
+        'not like': (True, False), 'not ilike': (True, True),
+    }
+    if operator in like_ops:
+        wrap, ignore_case = like_ops[operator]
+        regex = _like_regex(value, wrap, ignore_case)
+        if operator.startswith('not '):
+            # SQL semantics: NOT ILIKE also matches empty values
+            return lambda record: text(record) is None or not regex.fullmatch(str(text(record)))
+        return lambda record: text(record) is not None and regex.fullmatch(str(text(record))) is not None
+
+    return None
+
+
+def compile_domain(domain: List, fields: Dict[str, str]):
+    """
+    Compile an Odoo domain into a predicate over snapshot records.
+
+    Supports '&', '|', '!' (prefix notation, implicit '&' between terms) and the
+    leaf operators =, !=, in, not in, like, ilike, =like, =ilike, not like, not ilike.
+    Many2one leaves are only compiled when the value is an id or a list of ids.
+
+    Args:
+        domain: Odoo domain
+        fields: snapshot field name -> Odoo field type
+
+    Returns:
+        Predicate, or None if the domain uses an operator, a value or a field not in ``fields``
+        that cannot be evaluated locally
+    """
+    stack = []
+    for term in reversed(domain):
+        if term in ('&', '|'):
+            if len(stack) < 2:
+                return None
+            first, second = stack.pop(), stack.pop()
+            if term == '&':
+                stack.append(lambda record, a=first, b=second: a(record) and b(record))
+            else:
+                stack.append(lambda record, a=first, b=second: a(record) or b(record))
+        elif term == '!':
+            if not stack:
+                return None
+            stack.append(lambda record, a=stack.pop(): not a(record))
+        elif isinstance(term, (list, tuple)) and len(term) == 3:
+            field, operator, value = term
+            if field not in fields:
+                return None
+            predicate = _compile_leaf(field, str(operator).lower(), value, fields[field])
+            if predicate is None:
+                return None
+            stack.append(predicate)
+        else:
+            return None
+    predicates = list(reversed(stack))
+    return lambda record: all(predicate(record) for predicate in predicates)
+
+
+class RetrieveSink:
+    """
+    Streams retrieve-mode BOM rows to the output workbook, one sheet per domain.
+
+    Rows are appended (and flushed) to one CSV sidecar per sheet next to the output file, so memory
+    stays flat and a crash still leaves the rows found so far on disk. close() builds the xlsx from
+    the sidecars with a write-only workbook and removes them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        # sheet key -> [sheet title, sidecar path, open file, csv writer], in first-seen order
+        self._sheets: Dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._sheets)
+
+    def add(self, sheet_key: str, title: str, boms: List[Dict[str, Any]]) -> None:
+        """Append the BOMs of one domain to its sheet (the sidecar is created on first use)."""
+        sheet = self._sheets.get(sheet_key)
+        if sheet is None:
+            sidecar_path = self.path.with_name(f"{self.path.stem}.{len(self._sheets) + 1}.csv")
+            f = open(sidecar_path, 'w', newline='', encoding='utf-8')
+            sheet = self._sheets[sheet_key] = [title, sidecar_path, f, csv.writer(f)]
+        writer = sheet[3]
+        for bom in boms:
+            writer.writerow([bom.get('id'), bom.get('product_name', ''), bom.get('product_code', '')])
+        sheet[2].flush()
+
+    def close(self) -> None:
+        """Write the xlsx from the sidecars (only if any domain had BOMs)."""
+        if not self._sheets:
+            return
+        wb = Workbook(write_only=True)
+        for title, sidecar_path, f, _ in self._sheets.values():
+            f.close()
+            ws = wb.create_sheet(title=title)
+            header = []
+            for value in RETRIEVE_HEADERS:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.fill = RETRIEVE_HEADER_FILL
+                cell.font = RETRIEVE_HEADER_FONT
+                header.append(cell)
+            ws.append(header)
+            with open(sidecar_path, newline='', encoding='utf-8') as sidecar:
+                for values in csv.reader(sidecar):
+                    # Product name and code stay text (codes such as 700010 are not numbers)
+                    ws.append([csv_cell(v) if c == 0 else v for c, v in enumerate(values)])
+        wb.save(self.path)
+        for _, sidecar_path, _, _ in self._sheets.values():
+            sidecar_path.unlink()
+
 
 class OdooBoMOperationUpdater:
     """Import BoM operations in Odoo 18 from Excel"""
@@ -62,6 +268,29 @@ class OdooBoMOperationUpdater:
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo DB '%s' as '%s'", db, username)
 
+        # LRU of normalized domain -> (product ids, BOM records)
+        self._domain_cache: "OrderedDict[str, Tuple[List[int], List[Dict[str, Any]]]]" = OrderedDict()
+        # Domains looked up by the _collect_operations() pre-pass, kept for the whole run (never evicted)
+        self._prepass_domains: Dict[str, Tuple[List[int], List[Dict[str, Any]]]] = {}
+
+        # Local product/BOM snapshot, loaded by load_product_snapshot() (local_domains mode);
+        # snapshot field name -> Odoo field type
+        self._product_snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_fields: Dict[str, str] = {}
+        self._boms_by_product: Dict[int, List[Dict[str, Any]]] = {}
+
+        # Existing operations of the BOMs seen so far: (bom_id, template_id) and
+        # (bom_id, workcenter_id, name) keys, plus the next free sequence per BOM
+        self._routing_boms_loaded: set = set()
+        self._routing_keys: set = set()
+        self._next_routing_sequence: Dict[int, int] = {}
+        self._template_names: Dict[int, str] = {}
+
+        # Registries loaded once by load_registries(): name -> id, and template id -> linked work center id
+        self._templates_by_name: Dict[str, int] = {}
+        self._workcenters_by_name: Dict[str, int] = {}
+        self._template_workcenter: Dict[int, Optional[int]] = {}
+
     def _parse_domain(self, domain_str: str) -> Optional[List]:
         """
         Parse domain string from Excel into Odoo domain format.
@@ -194,6 +423,107 @@ class OdooBoMOperationUpdater:
             logger.error("Error searching BOMs for products %s: %s", product_ids, e)
             return []
 
+    def load_product_snapshot(self, extra_fields: Optional[List[str]] = None) -> None:
+        """
+        Load all products and all BOM product links once, so domains can be evaluated locally.
+
+        Args:
+            extra_fields: product.product fields to snapshot besides PRODUCT_SNAPSHOT_FIELDS
+        """
+        fields = list(dict.fromkeys(PRODUCT_SNAPSHOT_FIELDS + list(extra_fields or [])))
+        self._product_snapshot = self.models.execute_kw(
+            self.db,
+            self.uid,
+            self.password,
+            'product.product',
+            'search_read',
+            [[]],
+            {'fields': fields},
+        )
+        field_types = self.models.execute_kw(
+            self.db,
+            self.uid,
+            self.password,
+            'product.product',
+            'fields_get',
+            [fields],
+            {'attributes': ['type']},
+        )
+        self._snapshot_fields = {field: field_types.get(field, {}).get('type') for field in fields}
+        self._snapshot_fields['id'] = 'integer'
+
+        boms = self.models.execute_kw(
+            self.db,
+            self.uid,
+            self.password,
+            'mrp.bom',
+            'search_read',
+            [[('product_id', '!=', False)]],
+            {'fields': ['id', 'product_id', 'product_tmpl_id']},
+        )
+        self._boms_by_product = {}
+        for bom in boms:
+            self._boms_by_product.setdefault(bom['product_id'][0], []).append(bom)
+        logger.info(
+            "Loaded product snapshot: %d products, %d BOMs (fields: %s)",
+            len(self._product_snapshot), len(boms), ', '.join(fields)
+        )
+
+    def _lookup_domain_locally(self, domain: List) -> Optional[Tuple[List[int], List[Dict[str, Any]]]]:
+        """
+        Evaluate a domain against the product snapshot.
+
+        Returns:
+            (product ids, BOM records) like _lookup_domain, or None if the domain
+            cannot be evaluated locally (the caller then asks the server)
+        """
+        predicate = compile_domain(domain, self._snapshot_fields)
+        if predicate is None:
+            logger.info("Domain not supported by local evaluation, searching in Odoo: %s", domain)
+            return None
+
+        products = {p['id']: p for p in self._product_snapshot if predicate(p)}
+        boms = []
+        for product_id, product in products.items():
+            for bom in self._boms_by_product.get(product_id, []):
+                boms.append(dict(
+                    bom,
+                    product_name=product.get('name') or '',
+                    product_code=product.get('default_code') or '',
+                ))
+        boms.sort(key=lambda bom: bom['id'])
+        return list(products), boms
+
+    def _lookup_domain(self, domain: List) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Find products and their BOMs for a domain, memoized per normalized domain.
+
+        Rows with an empty Column A reuse the previous domain, so only the first
+        row of each domain block pays for the product and BOM lookups.
+
+        Args:
+            domain: Parsed Odoo domain filter
+
+        Returns:
+            (product.product IDs, BOM records as returned by _find_boms_by_products)
+        """
+        key = repr(domain)
+        if key in self._prepass_domains:
+            return self._prepass_domains[key]
+        if key in self._domain_cache:
+            self._domain_cache.move_to_end(key)
+            return self._domain_cache[key]
+
+        result = self._lookup_domain_locally(domain) if self._product_snapshot is not None else None
+        if result is None:
+            product_ids = self._find_products_by_domain(domain)
+            result = (product_ids, self._find_boms_by_products(product_ids))
+        product_ids, boms = result
+        self._domain_cache[key] = (product_ids, boms)
+        if len(self._domain_cache) > DOMAIN_CACHE_SIZE:
+            self._domain_cache.popitem(last=False)
+        return product_ids, boms
+
     def _get_or_create_operation_template(self, template_name: str) -> Optional[int]:
         """
         Search for or create mrp.operation.template.
@@ -210,6 +540,8 @@ class OdooBoMOperationUpdater:
         template_name = template_name.strip()
         if not template_name:
             return None
+        if template_name in self._templates_by_name:
+            return self._templates_by_name[template_name]
 
         try:
             # Search for existing template
@@ -223,6 +555,7 @@ class OdooBoMOperationUpdater:
             )
 
             if template_ids:
+                self._templates_by_name[template_name] = template_ids[0]
                 return template_ids[0]
 
             # Create new template
@@ -237,6 +570,9 @@ class OdooBoMOperationUpdater:
             template_id = template_ids[0] if template_ids else None
             if template_id:
                 logger.info("Created operation template: %s (ID: %s)", template_name, template_id)
+                self._templates_by_name[template_name] = template_id
+                self._template_names[template_id] = template_name
+                self._template_workcenter[template_id] = None
             return template_id
         except Exception as e:
             logger.error("Error getting/creating operation template '%s': %s", template_name, e)
@@ -258,6 +594,8 @@ class OdooBoMOperationUpdater:
         workcenter_name = workcenter_name.strip()
         if not workcenter_name:
             return None
+        if workcenter_name in self._workcenters_by_name:
+            return self._workcenters_by_name[workcenter_name]
 
         try:
             # Search for existing work center
@@ -271,6 +609,7 @@ class OdooBoMOperationUpdater:
             )
 
             if workcenter_ids:
+                self._workcenters_by_name[workcenter_name] = workcenter_ids[0]
                 return workcenter_ids[0]
 
             # Create new work center
@@ -285,14 +624,133 @@ class OdooBoMOperationUpdater:
             workcenter_id = workcenter_ids[0] if workcenter_ids else None
             if workcenter_id:
                 logger.info("Created work center: %s (ID: %s)", workcenter_name, workcenter_id)
+                self._workcenters_by_name[workcenter_name] = workcenter_id
             return workcenter_id
         except Exception as e:
             logger.error("Error getting/creating work center '%s': %s", workcenter_name, e)
             return None
 
+    def load_registries(self) -> None:
+        """Load all operation templates (name, linked work center) and work centers once"""
+        templates = self.models.execute_kw(
+            self.db,
+            self.uid,
+            self.password,
+            'mrp.operation.template',
+            'search_read',
+            [[]],
+            {'fields': ['name', 'work_center_id']},
+        )
+        for template in templates:
+            # Keep the first match, like the name search did
+            if template['name'] not in self._templates_by_name:
+                self._templates_by_name[template['name']] = template['id']
+            self._template_names[template['id']] = template['name']
+            self._template_workcenter[template['id']] = (
+                template['work_center_id'][0] if template.get('work_center_id') else None
+            )
+
+        workcenters = self.models.execute_kw(
+            self.db,
+            self.uid,
+            self.password,
+            'mrp.workcenter',
+            'search_read',
+            [[]],
+            {'fields': ['name']},
+        )
+        for workcenter in workcenters:
+            self._workcenters_by_name.setdefault(workcenter['name'], workcenter['id'])
+        logger.info("Loaded %d operation templates and %d work centers", len(templates), len(workcenters))
+
+    def _create_missing_registries(self, operations: Dict[str, str]) -> Tuple[int, int]:
+        """
+        Create, in one batch per model, the work centers and operation templates not in the registries.
+
+        Args:
+            operations: template name -> work center name of the first row using it
+
+        Returns:
+            (templates created, work centers created)
+        """
+        new_workcenters = [
+            name for name in dict.fromkeys(operations.values()) if name not in self._workcenters_by_name
+        ]
+        if new_workcenters:
+            workcenter_ids = self.models.execute_kw(
+                self.db,
+                self.uid,
+                self.password,
+                'mrp.workcenter',
+                'create',
+                [[{'name': name} for name in new_workcenters]],
+            )
+            for name, workcenter_id in zip(new_workcenters, workcenter_ids):
+                self._workcenters_by_name[name] = workcenter_id
+                logger.info("Created work center: %s (ID: %s)", name, workcenter_id)
+
+        new_templates = [name for name in operations if name not in self._templates_by_name]
+        if new_templates:
+            template_ids = self.models.execute_kw(
+                self.db,
+                self.uid,
+                self.password,
+                'mrp.operation.template',
+                'create',
+                [[{'name': name, 'work_center_id': self._workcenters_by_name[operations[name]]}
+                  for name in new_templates]],
+            )
+            for name, template_id in zip(new_templates, template_ids):
+                self._templates_by_name[name] = template_id
+                self._template_names[template_id] = name
+                self._template_workcenter[template_id] = self._workcenters_by_name[operations[name]]
+                logger.info("Created operation template: %s (ID: %s)", name, template_id)
+
+        return len(new_templates), len(new_workcenters)
+
+    def _collect_operations(
+        self,
+        rows: List[tuple],
+        domain_col: int,
+        workcenter_col: int,
+        template_col: int,
+    ) -> Dict[str, str]:
+        """
+        Pre-pass over the sheet rows: template name -> work center name (first row wins)
+        for every row the import loop will act on, i.e. whose domain has BOMs.
+        The domains looked up here are kept for the main pass in _prepass_domains.
+        """
+        operations: Dict[str, str] = {}
+        current_domain: Optional[List] = None
+        for row_cells in rows:
+            if len(row_cells) >= domain_col and row_cells[domain_col - 1] is not None:
+                domain_str = str(row_cells[domain_col - 1]).strip()
+                if domain_str:
+                    current_domain = self._parse_domain(domain_str)
+            workcenter_name = template_name = None
+            if len(row_cells) >= workcenter_col and row_cells[workcenter_col - 1] is not None:
+                workcenter_name = str(row_cells[workcenter_col - 1]).strip()
+            if len(row_cells) >= template_col and row_cells[template_col - 1] is not None:
+                template_name = str(row_cells[template_col - 1]).strip()
+            if not current_domain or not workcenter_name or not template_name:
+                continue
+            if template_name in operations:
+                continue
+            try:
+                product_ids, boms = self._lookup_domain(current_domain)
+            except Exception as e:
+                # The import loop reports this row's error
+                logger.debug("Pre-pass lookup failed for %s: %s", current_domain, e)
+                continue
+            # Keep the result for the main pass (the LRU may evict it before the main pass gets there)
+            self._prepass_domains[repr(current_domain)] = (product_ids, boms)
+            if product_ids and boms:
+                operations[template_name] = workcenter_name
+        return operations
+
     def _link_workcenter_to_template(self, template_id: int, workcenter_id: int) -> bool:
         """
-        Link work center to operation template.
+        Link work center to operation template (no write if it is already linked).
 
         Args:
             template_id: Operation template ID
@@ -301,6 +759,8 @@ class OdooBoMOperationUpdater:
         Returns:
             True if successful, False otherwise
         """
+        if template_id in self._template_workcenter and self._template_workcenter[template_id] == workcenter_id:
+            return True
         try:
             self.models.execute_kw(
                 self.db,
@@ -310,65 +770,138 @@ class OdooBoMOperationUpdater:
                 'write',
                 [[template_id], {'work_center_id': workcenter_id}],
             )
+            self._template_workcenter[template_id] = workcenter_id
             return True
         except Exception as e:
             logger.error("Error linking work center %s to template %s: %s", workcenter_id, template_id, e)
             return False
 
-    def _create_routing_workcenter(
-        self,
-        bom_id: int,
-        template_id: int,
-        workcenter_id: int,
-        sequence: int = 100,
-    ) -> Optional[int]:
+    def _preload_routings(self, bom_ids: List[int]) -> None:
         """
-        Create mrp.routing.workcenter for a BOM.
+        Load the existing mrp.routing.workcenter of BOMs not loaded yet, in one search_read per chunk.
 
         Args:
-            bom_id: BOM ID
-            template_id: Operation template ID
-            workcenter_id: Work center ID
-            sequence: Sequence number (default 100)
-
-        Returns:
-            Routing workcenter ID or None if error
+            bom_ids: BOM IDs about to receive operations
         """
-        try:
-            # Get template name for the operation name
+        missing = [bom_id for bom_id in dict.fromkeys(bom_ids) if bom_id not in self._routing_boms_loaded]
+        for i in range(0, len(missing), ROUTING_BATCH_SIZE):
+            chunk = missing[i:i + ROUTING_BATCH_SIZE]
+            routings = self.models.execute_kw(
+                self.db,
+                self.uid,
+                self.password,
+                'mrp.routing.workcenter',
+                'search_read',
+                [[('bom_id', 'in', chunk)]],
+                {'fields': ['bom_id', 'mrp_operation_temp_id', 'workcenter_id', 'name', 'sequence']},
+            )
+            for routing in routings:
+                bom_id = routing['bom_id'][0]
+                if routing.get('mrp_operation_temp_id'):
+                    self._routing_keys.add((bom_id, routing['mrp_operation_temp_id'][0]))
+                workcenter_id = routing['workcenter_id'][0] if routing.get('workcenter_id') else None
+                self._routing_keys.add((bom_id, workcenter_id, routing.get('name') or ''))
+                next_sequence = (routing.get('sequence') or 0) + ROUTING_SEQUENCE_STEP
+                if next_sequence > self._next_routing_sequence.get(bom_id, ROUTING_FIRST_SEQUENCE):
+                    self._next_routing_sequence[bom_id] = next_sequence
+            self._routing_boms_loaded.update(chunk)
+
+    def _get_template_name(self, template_id: int) -> str:
+        """Operation template name (used as the operation name), read once per template"""
+        if template_id not in self._template_names:
             template_data = self.models.execute_kw(
                 self.db,
                 self.uid,
                 self.password,
                 'mrp.operation.template',
                 'read',
-                [template_id],
+                [[template_id]],
                 {'fields': ['name']},
             )
-            operation_name = template_data[0].get('name', '') if template_data else ''
+            self._template_names[template_id] = template_data[0].get('name', '') if template_data else ''
+        return self._template_names[template_id]
 
-            routing_ids = self.models.execute_kw(
-                self.db,
-                self.uid,
-                self.password,
-                'mrp.routing.workcenter',
-                'create',
-                [[{
-                    'bom_id': bom_id,
-                    'mrp_operation_temp_id': template_id,
-                    'workcenter_id': workcenter_id,
-                    'name': operation_name,
-                    'sequence': sequence,
-                }]],
-            )
-            routing_id = routing_ids[0] if routing_ids else None
-            return routing_id
-        except Exception as e:
-            logger.error(
-                "Error creating routing workcenter for BOM %s, template %s, workcenter %s: %s",
-                bom_id, template_id, workcenter_id, e
-            )
-            return None
+    def _create_routing_workcenters(
+        self,
+        bom_ids: List[int],
+        template_id: int,
+        workcenter_id: int,
+    ) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Create one mrp.routing.workcenter per BOM that does not have this operation yet.
+
+        Operations already on a BOM (same template, or same work center and name) are
+        skipped, so reruns do not duplicate them. New operations are appended after the
+        BOM's existing ones (ROUTING_FIRST_SEQUENCE, then +ROUTING_SEQUENCE_STEP) and
+        created with multi-record creates.
+
+        Args:
+            bom_ids: BOM IDs
+            template_id: Operation template ID
+            workcenter_id: Work center ID
+
+        Returns:
+            (BOM IDs with a created routing, BOM IDs skipped as duplicates, BOM IDs that failed)
+        """
+        self._preload_routings(bom_ids)
+        operation_name = self._get_template_name(template_id)
+
+        skipped = []
+        to_create = []
+        for bom_id in dict.fromkeys(bom_ids):
+            if ((bom_id, template_id) in self._routing_keys
+                    or (bom_id, workcenter_id, operation_name) in self._routing_keys):
+                skipped.append(bom_id)
+                continue
+            sequence = self._next_routing_sequence.get(bom_id, ROUTING_FIRST_SEQUENCE)
+            to_create.append({
+                'bom_id': bom_id,
+                'mrp_operation_temp_id': template_id,
+                'workcenter_id': workcenter_id,
+                'name': operation_name,
+                'sequence': sequence,
+            })
+
+        created = []
+        failed = []
+        for i in range(0, len(to_create), ROUTING_BATCH_SIZE):
+            batch = to_create[i:i + ROUTING_BATCH_SIZE]
+            try:
+                self.models.execute_kw(
+                    self.db,
+                    self.uid,
+                    self.password,
+                    'mrp.routing.workcenter',
+                    'create',
+                    [batch],
+                )
+                done = batch
+            except Exception as e:
+                logger.warning("Batch create of %d routing workcenters failed (%s); retrying one by one", len(batch), e)
+                done = []
+                for vals in batch:
+                    try:
+                        self.models.execute_kw(
+                            self.db,
+                            self.uid,
+                            self.password,
+                            'mrp.routing.workcenter',
+                            'create',
+                            [[vals]],
+                        )
+                        done.append(vals)
+                    except Exception as e2:
+                        logger.error(
+                            "Error creating routing workcenter for BOM %s, template %s, workcenter %s: %s",
+                            vals['bom_id'], template_id, workcenter_id, e2
+                        )
+                        failed.append(vals['bom_id'])
+            for vals in done:
+                self._routing_keys.add((vals['bom_id'], template_id))
+                self._routing_keys.add((vals['bom_id'], workcenter_id, operation_name))
+                self._next_routing_sequence[vals['bom_id']] = vals['sequence'] + ROUTING_SEQUENCE_STEP
+                created.append(vals['bom_id'])
+        return created, skipped, failed
 
     def _sanitize_sheet_name(self, name: str, max_length: int = 31) -> str:
         """
@@ -398,6 +931,8 @@ class OdooBoMOperationUpdater:
         template_col: int = 3,
         retrieve_mode: bool = False,
         output_path: Optional[str] = None,
+        local_domains: bool = False,
+        snapshot_fields: Optional[List[str]] = None,
     ):
         """
         Read Excel and create operation templates, work centers, and routing workcenters.
@@ -411,12 +946,12 @@ class OdooBoMOperationUpdater:
             template_col: 1-based column index of operation template name (Column C)
             retrieve_mode: If True, only retrieve BOMs without creating records
             output_path: Path for output Excel file in retrieve mode
+            local_domains: If True, load a product/BOM snapshot once and evaluate
+                Column A domains locally instead of one product search per domain
+            snapshot_fields: Extra product.product fields to snapshot (for domains on other fields)
         """
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
-
         start_row = header_row + 1
-        max_row = ws.max_row
+        rows = list(iter_sheet_rows(excel_path, sheet_name, min_row=start_row))
 
         # Statistics
         stats = {
@@ -427,6 +962,7 @@ class OdooBoMOperationUpdater:
             'templates_created': 0,
             'workcenters_created': 0,
             'routings_created': 0,
+            'routings_skipped': 0,
         }
 
         # Error log
@@ -436,8 +972,14 @@ class OdooBoMOperationUpdater:
         current_domain: Optional[List] = None
         current_domain_str: Optional[str] = None
 
-        # For retrieve mode
-        retrieve_data: Dict[str, List[Dict]] = {}
+        # For retrieve mode: one sheet per domain, rows streamed to CSV sidecars as BOMs are found
+        retrieve_sink: Optional[RetrieveSink] = None
+        if retrieve_mode:
+            if not output_path:
+                script_dir = Path(excel_path).parent
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_path = str(script_dir / f"retrieved_boms_{timestamp}.xlsx")
+            retrieve_sink = RetrieveSink(Path(output_path))
 
         logger.info("=" * 60)
         logger.info("Starting operation import from Excel")
@@ -445,9 +987,24 @@ class OdooBoMOperationUpdater:
         logger.info("Excel file: %s", excel_path)
         logger.info("Retrieve mode: %s", retrieve_mode)
 
+        if local_domains:
+            self.load_product_snapshot(snapshot_fields)
+
+        if not retrieve_mode:
+            # Resolve every template / work center name up front: one read per model,
+            # one batch create for the missing ones, instead of a search per row
+            self.load_registries()
+            operations = self._collect_operations(rows, domain_col, workcenter_col, template_col)
+            try:
+                templates_created, workcenters_created = self._create_missing_registries(operations)
+                stats['templates_created'] += templates_created
+                stats['workcenters_created'] += workcenters_created
+            except Exception as e:
+                # Rows fall back to get-or-create one by one
+                logger.warning("Batch creation of templates/work centers failed: %s", e)
+
         # Process each row
-        for row_idx in range(start_row, max_row + 1):
-            row_cells = [cell.value for cell in ws[row_idx]]
+        for row_idx, row_cells in enumerate(rows, start_row):
             stats['total_rows'] += 1
 
             try:
@@ -496,8 +1053,8 @@ class OdooBoMOperationUpdater:
                     logger.warning("Row %s: Missing work center or template name", row_idx)
                     continue
 
-                # Find products matching domain
-                product_ids = self._find_products_by_domain(current_domain)
+                # Find products matching domain, and their BOMs (cached per domain)
+                product_ids, boms = self._lookup_domain(current_domain)
                 if not product_ids:
                     logger.warning("Row %s: No products found for domain: %s", row_idx, current_domain_str)
                     errors.append({
@@ -509,8 +1066,6 @@ class OdooBoMOperationUpdater:
                     })
                     continue
 
-                # Find BOMs for these products
-                boms = self._find_boms_by_products(product_ids)
                 if not boms:
                     logger.warning("Row %s: No BOMs found for products matching domain: %s", row_idx, current_domain_str)
                     errors.append({
@@ -525,16 +1080,9 @@ class OdooBoMOperationUpdater:
                 stats['boms_found'] += len(boms)
 
                 if retrieve_mode:
-                    # Store BOM data for export
+                    # Write BOM data for export
                     sheet_key = current_domain_str or f"Row_{row_idx}"
-                    if sheet_key not in retrieve_data:
-                        retrieve_data[sheet_key] = []
-                    for bom in boms:
-                        retrieve_data[sheet_key].append({
-                            'bom_id': bom.get('id'),
-                            'product_name': bom.get('product_name', ''),
-                            'product_code': bom.get('product_code', ''),
-                        })
+                    retrieve_sink.add(sheet_key, self._sanitize_sheet_name(sheet_key), boms)
                     logger.info(
                         "Row %s: Found %d BOMs for domain (retrieve mode)",
                         row_idx, len(boms)
@@ -571,33 +1119,27 @@ class OdooBoMOperationUpdater:
                     # Link work center to template
                     self._link_workcenter_to_template(template_id, workcenter_id)
 
-                    # Create routing workcenter for each BOM
-                    sequence = 100
-                    routing_count = 0
-                    for bom in boms:
-                        routing_id = self._create_routing_workcenter(
-                            bom_id=bom['id'],
-                            template_id=template_id,
-                            workcenter_id=workcenter_id,
-                            sequence=sequence,
-                        )
-                        if routing_id:
-                            routing_count += 1
-                            sequence += 10  # Increment sequence for next operation
-                        else:
-                            errors.append({
-                                'row': row_idx,
-                                'domain': current_domain_str,
-                                'workcenter': workcenter_name,
-                                'template': template_name,
-                                'bom_id': bom['id'],
-                                'error': "Failed to create routing workcenter",
-                            })
-
-                    stats['routings_created'] += routing_count
+                    # Create routing workcenters for the BOMs that do not have this operation yet
+                    created, skipped, failed = self._create_routing_workcenters(
+                        [bom['id'] for bom in boms],
+                        template_id=template_id,
+                        workcenter_id=workcenter_id,
+                    )
+                    for bom_id in failed:
+                        errors.append({
+                            'row': row_idx,
+                            'domain': current_domain_str,
+                            'workcenter': workcenter_name,
+                            'template': template_name,
+                            'bom_id': bom_id,
+                            'error': "Failed to create routing workcenter",
+                        })
+
+                    stats['routings_created'] += len(created)
+                    stats['routings_skipped'] += len(skipped)
                     logger.info(
-                        "Row %s: Created %d routing workcenters for %d BOMs (template: %s, workcenter: %s)",
-                        row_idx, routing_count, len(boms), template_name, workcenter_name
+                        "Row %s: Created %d routing workcenters for %d BOMs, %d already present (template: %s, workcenter: %s)",
+                        row_idx, len(created), len(boms), len(skipped), template_name, workcenter_name
                     )
 
                 stats['processed_rows'] += 1
@@ -614,44 +1156,11 @@ class OdooBoMOperationUpdater:
                     'error': error_msg,
                 })
 
-        wb.close()
-
         # Handle retrieve mode output
-        if retrieve_mode and retrieve_data:
-            if not output_path:
-                script_dir = Path(excel_path).parent
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_path = str(script_dir / f"retrieved_boms_{timestamp}.xlsx")
-
-            output_wb = Workbook()
-            output_wb.remove(output_wb.active)  # Remove default sheet
-
-            for sheet_key, bom_list in retrieve_data.items():
-                sheet_name = self._sanitize_sheet_name(sheet_key)
-                ws_output = output_wb.create_sheet(title=sheet_name)
-
-                # Headers
-                headers = ['BOM ID', 'Product Name', 'Product Code']
-                ws_output.append(headers)
-
-                # Style headers
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(bold=True, color="FFFFFF")
-                for cell in ws_output[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-
-                # Data rows
-                for bom in bom_list:
-                    ws_output.append([
-                        bom.get('bom_id', ''),
-                        bom.get('product_name', ''),
-                        bom.get('product_code', ''),
-                    ])
-
-            output_wb.save(output_path)
+        if retrieve_mode and len(retrieve_sink):
+            retrieve_sink.close()
             logger.info("Retrieved BOMs exported to: %s", output_path)
-            logger.info("Total sheets created: %d", len(retrieve_data))
+            logger.info("Total sheets created: %d", len(retrieve_sink))
 
         # Summary
         logger.info("=" * 60)
@@ -663,6 +1172,7 @@ class OdooBoMOperationUpdater:
             logger.info("  Templates created/found: %d", stats.get('templates_created', 0))
             logger.info("  Workcenters created/found: %d", stats.get('workcenters_created', 0))
             logger.info("  Routing workcenters created: %d", stats['routings_created'])
+            logger.info("  Routing workcenters already present: %d", stats['routings_skipped'])
         logger.info("  Errors: %d", stats['errors'])
         logger.info("=" * 60)
 
@@ -718,6 +1228,8 @@ def main():
         SHEET_NAME = getattr(config, "OPERATION_SHEET_NAME", None)
         DRY_RUN = getattr(config, "OPERATION_DRY_RUN", True)
         RETRIEVE = getattr(config, "OPERATION_RETRIEVE", False)
+        LOCAL_DOMAINS = getattr(config, "OPERATION_LOCAL_DOMAINS", False)
+        SNAPSHOT_FIELDS = getattr(config, "OPERATION_SNAPSHOT_FIELDS", [])
     except ImportError:
         logger.error(f"Failed to import config from {config_path}")
         logger.error("Please ensure config.py exists in the BOM directory")
@@ -730,6 +1242,8 @@ def main():
         SHEET_NAME = None
         DRY_RUN = False
         RETRIEVE = False
+        LOCAL_DOMAINS = False
+        SNAPSHOT_FIELDS = []
 
     ODOO_URL = 'https://lingjack.odoo.com/'
     ODOO_DB = 'alitecpteltd-lingjack-main-21976694'
@@ -737,7 +1251,7 @@ def main():
     ODOO_PASSWORD = 'Admin@123456'
 
     # CLI overrides
-    if len(sys.argv) > 1 and sys.argv[1] not in ("--execute", "--dry-run", "--retrieve"):
+    if len(sys.argv) > 1 and sys.argv[1] not in ("--execute", "--dry-run", "--retrieve", "--local-domains"):
         EXCEL_FILE = sys.argv[1]
 
     if "--execute" in sys.argv:
@@ -749,6 +1263,8 @@ def main():
     if "--retrieve" in sys.argv:
         RETRIEVE = True
         DRY_RUN = False
+    if "--local-domains" in sys.argv:
+        LOCAL_DOMAINS = True
 
     # Resolve Excel path relative to this script directory if not absolute
     excel_path = Path(EXCEL_FILE)
@@ -759,6 +1275,7 @@ def main():
     logger.info("Excel file: %s", EXCEL_FILE)
     logger.info("Dry run: %s", DRY_RUN)
     logger.info("Retrieve mode: %s", RETRIEVE)
+    logger.info("Local domain evaluation: %s", LOCAL_DOMAINS)
 
     if DRY_RUN and not RETRIEVE:
         logger.info("DRY RUN MODE - No records will be created in Odoo")
@@ -773,6 +1290,8 @@ def main():
         workcenter_col=2,  # Column B: Work Center name
         template_col=3,  # Column C: Operation Template name
         retrieve_mode=RETRIEVE,
+        local_domains=LOCAL_DOMAINS,
+        snapshot_fields=SNAPSHOT_FIELDS,
     )
 
 
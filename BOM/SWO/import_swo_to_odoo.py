@@ -15,7 +15,11 @@ from datetime import datetime, date
 import os
 
 import xmlrpc.client
-from openpyxl import load_workbook
+
+# excel_cache.py (parsed-workbook cache) and odoo_batch.py (batched create/call helpers) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from excel_cache import iter_sheet_rows  # noqa: E402
+from odoo_batch import create_many  # noqa: E402
 
 # Set up logging to both console and file
 logger = logging.getLogger(__name__)
@@ -47,6 +51,12 @@ logger.info("SWO Import Script Started")
 logger.info(f"Log file: {log_file_path}")
 logger.info("=" * 60)
 
+# Max values per chunked 'in' / OR-ed domain when preloading products, partners and users
+READ_CHUNK_SIZE = 200
+
+# SWOs (each with its line) per multi-record sale.work.order create (a failing batch is retried one SWO at a time)
+SWO_CREATE_BATCH_SIZE = 50
+
 
 class OdooSaleWorkOrderImporter:
     """Import Sale Work Orders from Excel to Odoo 18"""
@@ -78,6 +88,16 @@ class OdooSaleWorkOrderImporter:
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo DB '%s' as '%s'", db, username)
 
+        # Run-scoped lookup caches (None = looked up, not found)
+        self._products_by_code: Dict[str, Optional[int]] = {}
+        self._product_uom: Dict[int, Optional[int]] = {}
+        self._partners_by_name: Dict[str, Optional[int]] = {}
+        self._users_by_name: Dict[str, Optional[int]] = {}  # keyed by lowercased name (=ilike match)
+        self._internal_group_id: Optional[int] = None
+        self._internal_group_loaded = False
+        self._lines_field: Optional[str] = None
+        self._lines_field_loaded = False
+
     # ---------------- Generic helpers ------------------
 
     def _search(self, model: str, domain: list, limit: int = 1) -> List[int]:
@@ -89,16 +109,190 @@ class OdooSaleWorkOrderImporter:
             {'limit': limit}
         )
 
+    @staticmethod
+    def _clean_vals(vals: dict) -> dict:
+        """Filter out None values - XML-RPC cannot marshal None"""
+        return {k: v for k, v in vals.items() if v is not None}
+
     def _create(self, model: str, vals: dict) -> int:
         """Create a record in Odoo"""
-        # Filter out None values - XML-RPC cannot marshal None
-        filtered_vals = {k: v for k, v in vals.items() if v is not None}
         return self.models.execute_kw(
             self.db, self.uid, self.password,
             model, 'create',
-            [filtered_vals]
+            [self._clean_vals(vals)]
+        )
+
+    def _create_many(self, model: str, vals_list: List[dict]) -> List[Optional[int]]:
+        """
+        Create several records with one multi-record create.
+        If the batch fails, it is bisected down to the failing records, which get None.
+        """
+        ids, failed = create_many(
+            [self._clean_vals(vals) for vals in vals_list],
+            lambda batch: self.models.execute_kw(
+                self.db, self.uid, self.password,
+                model, 'create',
+                [batch]
+            ),
+        )
+        for index, error in failed.items():
+            logger.error(f"Error creating {model} record {vals_list[index].get('name', '')}: {error}")
+        return ids
+
+    def _search_read(self, model: str, domain: list, fields: List[str], context: Optional[dict] = None) -> List[dict]:
+        """Search and read records in Odoo"""
+        kwargs = {'fields': fields}
+        if context:
+            kwargs['context'] = context
+        return self.models.execute_kw(
+            self.db, self.uid, self.password,
+            model, 'search_read',
+            [domain],
+            kwargs
         )
 
+    @staticmethod
+    def _or_domain(leaves: List[tuple]) -> list:
+        """OR together domain leaves in prefix notation"""
+        return ['|'] * (len(leaves) - 1) + list(leaves)
+
+    # ---------------- Preloading ------------------
+
+    def preload_products(self, codes: List[str]) -> None:
+        """Resolve all distinct item codes to product.product ids (with their uom_id) in one chunked search_read"""
+        codes = sorted({str(c).strip() for c in codes if c and str(c).strip()} - set(self._products_by_code))
+        for i in range(0, len(codes), READ_CHUNK_SIZE):
+            chunk = codes[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('product.product', [('default_code', 'in', chunk)], ['default_code', 'uom_id'])
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['default_code'], rec['id'])
+                self._product_uom[rec['id']] = rec['uom_id'][0] if rec.get('uom_id') else None
+            for code in chunk:
+                self._products_by_code[code] = found.get(code)
+        logger.info("Preloaded %d item code(s)", len(codes))
+
+    def preload_customers(self, names: List[str]) -> None:
+        """Resolve all distinct contact names to res.partner ids with one chunked search_read"""
+        names = sorted({str(n).strip() for n in names if n and str(n).strip()} - set(self._partners_by_name))
+        for i in range(0, len(names), READ_CHUNK_SIZE):
+            chunk = names[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('res.partner', [('name', 'in', chunk)], ['name'])
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['name'], rec['id'])
+            for name in chunk:
+                self._partners_by_name[name] = found.get(name)
+        logger.info("Preloaded %d customer name(s)", len(names))
+
+    def preload_users(self, names: List[str], dry_run: bool = False) -> None:
+        """
+        Resolve all distinct issue-by names to res.users ids with one chunked search_read,
+        then create the missing ones (archived internal users) in one batch.
+        """
+        distinct = {}
+        for n in names:
+            if n and str(n).strip():
+                distinct.setdefault(str(n).strip().lower(), str(n).strip())
+        keys = sorted(set(distinct) - set(self._users_by_name))
+        for i in range(0, len(keys), READ_CHUNK_SIZE):
+            chunk = keys[i:i + READ_CHUNK_SIZE]
+            records = self._search_read(
+                'res.users', self._or_domain([('name', '=ilike', distinct[k]) for k in chunk]), ['name']
+            )
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['name'].lower(), rec['id'])
+            for key in chunk:
+                self._users_by_name[key] = found.get(key)
+        missing = [distinct[k] for k in keys if not self._users_by_name[k]]
+        logger.info("Preloaded %d user name(s), %d not found", len(keys), len(missing))
+        if missing:
+            self._create_archived_users(missing, dry_run=dry_run)
+
+    def _get_internal_group_id(self) -> Optional[int]:
+        """Internal user group (base.group_user), looked up once per run"""
+        if not self._internal_group_loaded:
+            # Try to find by external ID first, then by name
+            try:
+                # Try to get by XML ID
+                self._internal_group_id = self.models.execute_kw(
+                    self.db, self.uid, self.password,
+                    'ir.model.data', 'xmlid_to_res_id',
+                    ['base.group_user']
+                )
+            except:
+                # Fallback: search by name
+                internal_group_ids = self._search('res.groups', [
+                    ('category_id.name', '=', 'User Types'),
+                    ('name', '=', 'Internal User')
+                ], limit=1)
+                self._internal_group_id = internal_group_ids[0] if internal_group_ids else None
+            self._internal_group_loaded = True
+        return self._internal_group_id
+
+    def _unique_logins(self, names: List[str]) -> List[str]:
+        """
+        Pick a free login per name: the name-derived login, or that login plus the
+        smallest free number suffix. Taken logins (archived users included) come
+        from a single `login =like` prefix query.
+        """
+        # Generate login from name (lowercase, replace spaces with dots)
+        bases = [name.lower().replace(' ', '.').replace("'", "").replace("-", ".") for name in names]
+        prefixes = sorted(set(bases))
+        taken = set()
+        for i in range(0, len(prefixes), READ_CHUNK_SIZE):
+            chunk = prefixes[i:i + READ_CHUNK_SIZE]
+            records = self._search_read(
+                'res.users', self._or_domain([('login', '=like', f"{prefix}%") for prefix in chunk]), ['login'],
+                context={'active_test': False},
+            )
+            taken.update(rec['login'] for rec in records)
+
+        logins = []
+        for login in bases:
+            if login in taken:
+                # Add a number suffix
+                counter = 1
+                while f"{login}{counter}" in taken:
+                    counter += 1
+                login = f"{login}{counter}"
+            taken.add(login)
+            logins.append(login)
+        return logins
+
+    def _create_archived_users(self, names: List[str], dry_run: bool = False) -> None:
+        """Create archived internal users for names not found, in one multi-record create"""
+        if dry_run:
+            for name in names:
+                logger.info(f"[DRY RUN] Would create archived internal user: {name}")
+            return
+
+        try:
+            internal_group_id = self._get_internal_group_id()
+            vals_list = []
+            for name, login in zip(names, self._unique_logins(names)):
+                user_vals = {
+                    'name': name,
+                    'login': login,
+                    'active': False,  # Archive the user
+                }
+                if internal_group_id:
+                    user_vals['groups_id'] = [(4, internal_group_id)]  # Add to internal user group
+                vals_list.append(user_vals)
+        except Exception as e:
+            logger.error(f"Error preparing users {names}: {e}", exc_info=True)
+            return
+
+        user_ids = self._create_many('res.users', vals_list)
+
+        for user_vals, user_id in zip(vals_list, user_ids):
+            if user_id:
+                self._users_by_name[user_vals['name'].lower()] = user_id
+                logger.info(
+                    f"Created archived internal user '{user_vals['name']}' (ID: {user_id}, login: {user_vals['login']})"
+                )
+
     # ---------------- Lookups ------------------
 
     def find_product_by_default_code(self, default_code: str) -> Optional[int]:
@@ -108,8 +302,47 @@ class OdooSaleWorkOrderImporter:
         default_code = str(default_code).strip()
         if not default_code:
             return None
-        product_ids = self._search('product.product', [('default_code', '=', default_code)], limit=1)
-        return product_ids[0] if product_ids else None
+        if default_code not in self._products_by_code:
+            product_ids = self._search('product.product', [('default_code', '=', default_code)], limit=1)
+            self._products_by_code[default_code] = product_ids[0] if product_ids else None
+        return self._products_by_code[default_code]
+
+    def get_product_uom(self, product_id: int) -> Optional[int]:
+        """uom_id of a product (preloaded with the product, otherwise read once)"""
+        if product_id not in self._product_uom:
+            product_data = self.models.execute_kw(
+                self.db, self.uid, self.password,
+                'product.product', 'read',
+                [[product_id]],
+                {'fields': ['uom_id']}
+            )
+            self._product_uom[product_id] = (
+                product_data[0]['uom_id'][0] if product_data and product_data[0].get('uom_id') else None
+            )
+        return self._product_uom[product_id]
+
+    def get_lines_field(self) -> Optional[str]:
+        """
+        Name of the sale.work.order one2many to sale.work.order.line (inverse work_order_id),
+        read once from fields_get. None if the model has no such field.
+        """
+        if not self._lines_field_loaded:
+            try:
+                fields = self.models.execute_kw(
+                    self.db, self.uid, self.password,
+                    'sale.work.order', 'fields_get',
+                    [],
+                    {'attributes': ['type', 'relation', 'relation_field']}
+                )
+                for name, attrs in sorted(fields.items()):
+                    if (attrs.get('type') == 'one2many' and attrs.get('relation') == 'sale.work.order.line'
+                            and attrs.get('relation_field') == 'work_order_id'):
+                        self._lines_field = name
+                        break
+            except Exception as e:
+                logger.warning(f"Could not read sale.work.order fields ({e}); lines will be created separately")
+            self._lines_field_loaded = True
+        return self._lines_field
 
     def find_customer_by_name(self, name: str) -> Optional[int]:
         """Find res.partner (customer) by name"""
@@ -118,8 +351,10 @@ class OdooSaleWorkOrderImporter:
         name = str(name).strip()
         if not name:
             return None
-        partner_ids = self._search('res.partner', [('name', '=', name)], limit=1)
-        return partner_ids[0] if partner_ids else None
+        if name not in self._partners_by_name:
+            partner_ids = self._search('res.partner', [('name', '=', name)], limit=1)
+            self._partners_by_name[name] = partner_ids[0] if partner_ids else None
+        return self._partners_by_name[name]
 
     def find_user_by_name(self, name: str) -> Optional[int]:
         """Find res.users by name"""
@@ -128,8 +363,10 @@ class OdooSaleWorkOrderImporter:
         name = str(name).strip()
         if not name:
             return None
-        user_ids = self._search('res.users', [('name', '=ilike', name)], limit=1)
-        return user_ids[0] if user_ids else None
+        if name.lower() not in self._users_by_name:
+            user_ids = self._search('res.users', [('name', '=ilike', name)], limit=1)
+            self._users_by_name[name.lower()] = user_ids[0] if user_ids else None
+        return self._users_by_name[name.lower()]
 
     def find_or_create_user_by_name(self, name: str, dry_run: bool = False) -> Optional[int]:
         """
@@ -155,55 +392,8 @@ class OdooSaleWorkOrderImporter:
             return user_id
         
         # User not found - create new one
-        if dry_run:
-            logger.info(f"[DRY RUN] Would create archived internal user: {name}")
-            return None
-        
-        try:
-            # Generate login from name (lowercase, replace spaces with dots)
-            login = name.lower().replace(' ', '.').replace("'", "").replace("-", ".")
-            # Ensure login is unique
-            existing_logins = self._search('res.users', [('login', '=', login)])
-            if existing_logins:
-                # Add a number suffix
-                counter = 1
-                while self._search('res.users', [('login', '=', f"{login}{counter}")]):
-                    counter += 1
-                login = f"{login}{counter}"
-            
-            # Get internal user group (base.group_user)
-            # Try to find by external ID first, then by name
-            try:
-                # Try to get by XML ID
-                internal_group_id = self.models.execute_kw(
-                    self.db, self.uid, self.password,
-                    'ir.model.data', 'xmlid_to_res_id',
-                    ['base.group_user']
-                )
-            except:
-                # Fallback: search by name
-                internal_group_ids = self._search('res.groups', [
-                    ('category_id.name', '=', 'User Types'),
-                    ('name', '=', 'Internal User')
-                ], limit=1)
-                internal_group_id = internal_group_ids[0] if internal_group_ids else None
-            
-            user_vals = {
-                'name': name,
-                'login': login,
-                'active': False,  # Archive the user
-            }
-            
-            if internal_group_id:
-                user_vals['groups_id'] = [(4, internal_group_id)]  # Add to internal user group
-            
-            user_id = self._create('res.users', user_vals)
-            logger.info(f"Created archived internal user '{name}' (ID: {user_id}, login: {login})")
-            return user_id
-            
-        except Exception as e:
-            logger.error(f"Error creating user '{name}': {e}", exc_info=True)
-            return None
+        self._create_archived_users([name], dry_run=dry_run)
+        return self._users_by_name.get(name.lower())
 
     def find_uom_by_name(self, name: str) -> Optional[int]:
         """Find uom.uom by name (default: Units)"""
@@ -293,16 +483,11 @@ class OdooSaleWorkOrderImporter:
         Returns:
             List of dicts with SWO data
         """
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
-
         start_row = header_row + 1
-        max_row = ws.max_row
 
         records = []
 
-        for row_idx in range(start_row, max_row + 1):
-            row_cells = [cell.value for cell in ws[row_idx]]
+        for row_idx, row_cells in enumerate(iter_sheet_rows(excel_path, sheet_name, min_row=start_row), start_row):
 
             # Extract values by column index (0-based)
             # Column A (0): S/N - ignore
@@ -362,13 +547,66 @@ class OdooSaleWorkOrderImporter:
             }
             records.append(record)
 
-        wb.close()
         logger.info("Parsed %d SWO records from Excel", len(records))
         return records
 
     # ---------------- Import Logic ------------------
 
-    def import_sale_work_orders(self, excel_path: str, sheet_name: Optional[str] = None, dry_run: bool = True):
+    def _create_swo_batch(self, batch: List[tuple], stats: dict) -> None:
+        """
+        Create a batch of SWOs, each with its line, in one multi-record create.
+
+        The line goes in as an inline one2many command when sale.work.order has a
+        line field; otherwise the SWOs are created first and their lines in a second
+        multi-record create.
+
+        Args:
+            batch: (record, SWO vals, line vals) per Excel row
+            stats: Import statistics (created counts and errors are updated)
+        """
+        lines_field = self.get_lines_field()
+        if lines_field:
+            swo_ids = self._create_many('sale.work.order', [
+                dict(swo_vals, **{lines_field: [(0, 0, self._clean_vals(line_vals))]})
+                for _rec, swo_vals, line_vals in batch
+            ])
+        else:
+            swo_ids = self._create_many('sale.work.order', [swo_vals for _rec, swo_vals, _line in batch])
+            line_ids = self._create_many('sale.work.order.line', [
+                dict(line_vals, work_order_id=swo_id)
+                for (_rec, _swo, line_vals), swo_id in zip(batch, swo_ids) if swo_id
+            ])
+            line_ids = iter(line_ids)
+
+        for (rec, _swo_vals, _line_vals), swo_id in zip(batch, swo_ids):
+            if not swo_id:
+                error_msg = f"Row {rec['row_index']}: Error processing SWO '{rec.get('swo_number', 'N/A')}': create failed"
+                logger.error(error_msg)
+                stats['errors'].append(error_msg)
+                continue
+            stats['created_swo'] += 1
+            logger.info(
+                f"Row {rec['row_index']}: Created SWO '{rec['swo_number']}' (ID: {swo_id})"
+            )
+            if lines_field:
+                stats['created_lines'] += 1
+                logger.info(
+                    f"Row {rec['row_index']}: Created SWO line for product '{rec['item_code']}'"
+                )
+                continue
+            line_id = next(line_ids)
+            if not line_id:
+                error_msg = f"Row {rec['row_index']}: Failed to create SWO line for product '{rec['item_code']}'"
+                logger.error(error_msg)
+                stats['errors'].append(error_msg)
+                continue
+            stats['created_lines'] += 1
+            logger.info(
+                f"Row {rec['row_index']}: Created SWO line (ID: {line_id}) for product '{rec['item_code']}'"
+            )
+
+    def import_sale_work_orders(self, excel_path: str, sheet_name: Optional[str] = None, dry_run: bool = True,
+                                batch_size: int = SWO_CREATE_BATCH_SIZE):
         """
         Import sale work orders from Excel
 
@@ -376,7 +614,10 @@ class OdooSaleWorkOrderImporter:
             excel_path: Path to Excel file
             sheet_name: Sheet name (default: active sheet)
             dry_run: If True, only log operations without creating records
+            batch_size: SWOs per multi-record create (at least 1)
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
         records = self.parse_excel(excel_path, sheet_name)
 
         if not records:
@@ -397,6 +638,14 @@ class OdooSaleWorkOrderImporter:
         # will automatically create a dummy sale.order if old_so_number is provided
         # We just store old_so_number - no need to create sale orders here
 
+        # Resolve products, customers and CS users once for all rows (missing users are created here)
+        self.preload_products([rec['item_code'] for rec in records])
+        self.preload_customers([rec['contact_name'] for rec in records])
+        self.preload_users([rec['swo_issue_by'] for rec in records], dry_run=dry_run)
+
+        # (record, SWO vals, line vals) waiting for the next multi-record create
+        pending = []
+
         for rec in records:
             try:
                 # Find product by default_code
@@ -427,13 +676,7 @@ class OdooSaleWorkOrderImporter:
                         )
 
                 # Get product UOM
-                product_data = self.models.execute_kw(
-                    self.db, self.uid, self.password,
-                    'product.product', 'read',
-                    [[product_id]],
-                    {'fields': ['uom_id']}
-                )
-                uom_id = product_data[0]['uom_id'][0] if product_data and product_data[0].get('uom_id') else None
+                uom_id = self.get_product_uom(product_id)
 
                 # Prepare SWO values - store old_so_number as char field (not linking to sale.order)
                 # The model's create() method will automatically handle the required sale_order_id
@@ -457,29 +700,21 @@ class OdooSaleWorkOrderImporter:
                 if user_id:
                     swo_vals['cs_in_charge_id'] = user_id
 
-                if not dry_run:
-                    # Create SWO
-                    swo_id = self._create('sale.work.order', swo_vals)
-                    stats['created_swo'] += 1
-                    logger.info(
-                        f"Row {rec['row_index']}: Created SWO '{rec['swo_number']}' (ID: {swo_id})"
-                    )
+                line_vals = {
+                    'product_id': product_id,
+                    'product_qty': rec['committed_qty'],
+                    'product_uom_id': uom_id,
+                    'qty_produced': rec['finished_qty'],
+                    'state': self._map_pwo_status_to_state(rec['pwo_status']),
+                    'remarks': self._combine_remarks(rec['cs_remarks'], rec['prod_remarks']),
+                }
 
-                    # Create SWO line
-                    line_vals = {
-                        'work_order_id': swo_id,
-                        'product_id': product_id,
-                        'product_qty': rec['committed_qty'],
-                        'product_uom_id': uom_id,
-                        'qty_produced': rec['finished_qty'],
-                        'state': self._map_pwo_status_to_state(rec['pwo_status']),
-                        'remarks': self._combine_remarks(rec['cs_remarks'], rec['prod_remarks']),
-                    }
-                    line_id = self._create('sale.work.order.line', line_vals)
-                    stats['created_lines'] += 1
-                    logger.info(
-                        f"Row {rec['row_index']}: Created SWO line (ID: {line_id}) for product '{rec['item_code']}'"
-                    )
+                if not dry_run:
+                    # Create SWOs with their line in batches
+                    pending.append((rec, swo_vals, line_vals))
+                    if len(pending) >= batch_size:
+                        self._create_swo_batch(pending, stats)
+                        pending = []
                 else:
                     logger.info(
                         f"[DRY RUN] Row {rec['row_index']}: Would create SWO '{rec['swo_number']}' "
@@ -496,6 +731,9 @@ class OdooSaleWorkOrderImporter:
                 logger.error(error_msg)
                 stats['errors'].append(error_msg)
 
+        if pending:
+            self._create_swo_batch(pending, stats)
+
         # Summary
         logger.info("=" * 60)
         logger.info("Import Summary:")
@@ -557,6 +795,7 @@ def main():
         EXCEL_FILE = getattr(config, "SWO_EXCEL_FILE", "output.xlsx")
         SHEET_NAME = getattr(config, "SWO_SHEET_NAME", "Outstanding SWO Listing")
         DRY_RUN = getattr(config, "SWO_DRY_RUN", True)
+        BATCH_SIZE = getattr(config, "SWO_CREATE_BATCH_SIZE", SWO_CREATE_BATCH_SIZE)
     except ImportError:
         logger.error(f"Failed to import config from {config_path}")
         logger.error("Please ensure config.py exists in the BOM directory")
@@ -568,15 +807,26 @@ def main():
         EXCEL_FILE = "output.xlsx"
         SHEET_NAME = "Outstanding SWO Listing"
         DRY_RUN = False
+        BATCH_SIZE = SWO_CREATE_BATCH_SIZE
 
     # CLI overrides
-    if len(sys.argv) > 1 and sys.argv[1] not in ("--execute", "--dry-run"):
+    if len(sys.argv) > 1 and not sys.argv[1].startswith("--"):
         EXCEL_FILE = sys.argv[1]
 
     if "--execute" in sys.argv:
         DRY_RUN = False
     if "--dry-run" in sys.argv:
         DRY_RUN = True
+    if "--batch-size" in sys.argv:
+        index = sys.argv.index("--batch-size") + 1
+        try:
+            BATCH_SIZE = int(sys.argv[index])
+        except (IndexError, ValueError):
+            logger.error("--batch-size needs an integer value (SWOs per create call)")
+            sys.exit(2)
+    if BATCH_SIZE < 1:
+        logger.error("Batch size must be at least 1, got %s", BATCH_SIZE)
+        sys.exit(2)
 
     # Resolve Excel path relative to this script directory if not absolute,
     # so it works both when run directly and via run_all_imports.py.
@@ -588,12 +838,14 @@ def main():
     logger.info("Excel file: %s", EXCEL_FILE)
     logger.info("Sheet name: %s", SHEET_NAME)
     logger.info("Dry run: %s", DRY_RUN)
+    logger.info("Batch size: %s", BATCH_SIZE)
 
     importer = OdooSaleWorkOrderImporter(ODOO_URL, ODOO_DB, ODOO_USERNAME, ODOO_PASSWORD)
     importer.import_sale_work_orders(
         excel_path=EXCEL_FILE,
         sheet_name=SHEET_NAME,
         dry_run=DRY_RUN,
+        batch_size=BATCH_SIZE,
     )
 
 
@@ -30,6 +30,8 @@ OPERATION_EXCEL_FILE = 'Book1.xlsx'  # Excel file with domain, work center, and
 OPERATION_SHEET_NAME = None  # None = use active sheet
 OPERATION_DRY_RUN = False  # Set to False to actually import
 OPERATION_RETRIEVE = False  # Set to True to only retrieve matching BOMs without creating records
+OPERATION_LOCAL_DOMAINS = False  # Set to True to evaluate Column A domains against a one-time product snapshot
+OPERATION_SNAPSHOT_FIELDS = []  # Extra product.product fields used in domains (default_code, name, categ_id always loaded)
 OPERATION_CATEGORY_COL = 1  # Column A: Domain filter for product_id (1-based)
 OPERATION_COL = 2  # Column B: Operation Name (1-based) - DEPRECATED, now using new format
 
@@ -40,6 +42,7 @@ OPERATION_COL = 2  # Column B: Operation Name (1-based) - DEPRECATED, now using
 SWO_EXCEL_FILE = 'output.xlsx'
 SWO_SHEET_NAME = 'Outstanding SWO Listing'
 SWO_DRY_RUN = False  # Set to False to actually import
+SWO_CREATE_BATCH_SIZE = 50  # SWOs per multi-record create (--batch-size overrides)
 
 # ============================================================================
 # MRP (Manufacturing) IMPORT SETTINGS
@@ -48,6 +51,9 @@ SWO_DRY_RUN = False  # Set to False to actually import
 MRP_EXCEL_FILE = 'output.xlsx'
 MRP_SHEET_NAME = None  # None = use active sheet, or specify like 'Manufacturing Order (mrp.produc'
 MRP_DRY_RUN = False  # Set to False to actually import
+MRP_PIPELINE_WINDOW = 25  # PWOs whose products/lots are resolved together
+MRP_CREATE_WORKERS = 4  # Concurrent mrp.production creates
+MRP_CREATE_BATCH_SIZE = 20  # MOs per multi-record create
 
 # ============================================================================
 # EMPLOYEE IMPORT SETTINGS
@@ -22,7 +22,11 @@ from datetime import datetime, date
 from collections import defaultdict
 
 import xmlrpc.client
-from openpyxl import load_workbook
+
+# excel_cache.py (parsed-workbook cache) and odoo_batch.py (chunked calls and creates) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from excel_cache import iter_sheet_rows  # noqa: E402
+from odoo_batch import create_many, run_chunked  # noqa: E402
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -54,6 +58,18 @@ NON_STOCK_PRODUCT_ID = 37341
 USE_FALLBACK_SALE_ORDER_WHEN_NOT_FOUND = False
 FALLBACK_SALE_ORDER_ID = 500
 
+# Max ids/codes per bulk read or "in" domain
+READ_CHUNK_SIZE = 500
+
+# product.product fields kept in the per-run product attribute cache
+PRODUCT_INFO_FIELDS = ['default_code', 'uom_id', 'tracking', 'product_tmpl_id']
+
+# Records per state-transition / grouped write call (failing chunks are bisected down to single ids)
+TRANSITION_CHUNK_SIZE = 50
+
+# MOs per multi-record mrp.production create (a failing batch is retried one MO at a time)
+MO_CREATE_BATCH_SIZE = 50
+
 
 class OdooMRPSWOImporter:
     """Import MRP productions and Sale Work Orders from Excel to Odoo 18 via RPC."""
@@ -69,6 +85,20 @@ class OdooMRPSWOImporter:
             raise Exception(f"Authentication failed for '{username}' on database '{db}'.")
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo DB '%s' as '%s'", db, username)
+        # Per-run product caches: default_code -> id (None = not found), id -> uom_id/tracking/product_tmpl_id
+        self._product_ids_by_code: Dict[str, Optional[int]] = {}
+        self._product_info: Dict[int, dict] = {}
+        # Per-run reference data (loaded once, shared by all seven steps)
+        self._uom_ids_by_name: Optional[Dict[str, int]] = None
+        self._sale_orders_by_name: Dict[str, Optional[int]] = {}
+        self._sale_order_company: Dict[int, Optional[int]] = {}
+        self._ref_cache: Dict[str, Optional[int]] = {}
+        # MOs already in Odoo (loaded once per run): old_pwo_id / old_pwo_number -> mrp.production id
+        self._existing_mo_by_pwo_id: Optional[Dict[str, int]] = None
+        self._existing_mo_by_pwo_number: Dict[str, int] = {}
+        self._existing_mo_info: Dict[int, dict] = {}
+        # Existing MOs reused by this run that are only linked to SWO lines (not confirmed/started/swapped again)
+        self._link_only_mo_ids: set = set()
 
     def _search(self, model: str, domain: list, limit: Optional[int] = 1) -> List[int]:
         kwargs = {} if limit is None else {'limit': limit}
@@ -87,6 +117,20 @@ class OdooMRPSWOImporter:
             [filtered]
         )
 
+    def _create_many(self, model: str, vals_list: List[dict]) -> List[Optional[int]]:
+        """Create records with one multi-record create; a failing batch is bisected. Returns ids in order (None = failed)."""
+        ids, failed = create_many(
+            [{k: v for k, v in vals.items() if v is not None} for vals in vals_list],
+            lambda batch: self.models.execute_kw(
+                self.db, self.uid, self.password,
+                model, 'create',
+                [batch]
+            ),
+        )
+        for error in failed.values():
+            logger.error("Create %s failed: %s", model, error)
+        return ids
+
     def _read(self, model: str, ids: List[int], fields: List[str]) -> List[dict]:
         if not ids:
             return []
@@ -97,6 +141,17 @@ class OdooMRPSWOImporter:
             {'fields': fields}
         )
 
+    def _search_read(self, model: str, domain: list, fields: List[str], limit: Optional[int] = None) -> List[dict]:
+        kwargs = {'fields': fields}
+        if limit is not None:
+            kwargs['limit'] = limit
+        return self.models.execute_kw(
+            self.db, self.uid, self.password,
+            model, 'search_read',
+            [domain],
+            kwargs
+        )
+
     def _write(self, model: str, ids: List[int], vals: dict) -> bool:
         filtered = {k: v for k, v in vals.items() if v is not None}
         return self.models.execute_kw(
@@ -113,14 +168,91 @@ class OdooMRPSWOImporter:
             kwargs or {}
         )
 
+    def call_batch(self, model: str, method: str, ids: List[int],
+                   log_level: int = logging.ERROR) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Call a record method (action_confirm, button_plan, swap_old_name, ...) on chunks of ids.
+        A failing chunk is bisected so only the failing records are skipped (and logged).
+
+        Returns:
+            tuple: (ok_ids, {failed_id: error message})
+        """
+        ok_ids, failed = run_chunked(
+            ids, lambda chunk: self._call(model, method, chunk), chunk_size=TRANSITION_CHUNK_SIZE
+        )
+        for rec_id, error in failed.items():
+            logger.log(log_level, "Failed %s.%s id=%s: %s", model, method, rec_id, error)
+        if ok_ids:
+            logger.info("%s.%s done on %d record(s)", model, method, len(ok_ids))
+        return ok_ids, failed
+
+    def write_grouped(self, model: str, vals_by_id: Dict[int, dict], log_level: int = logging.WARNING) -> List[int]:
+        """Write per-record vals with one write per group of records sharing identical vals. Returns failed ids."""
+        groups = defaultdict(list)
+        group_vals = {}
+        for rec_id, vals in vals_by_id.items():
+            filtered = {k: v for k, v in vals.items() if v is not None}
+            if filtered:
+                # repr() so x2many command lists can be part of the grouping key
+                key = repr(sorted(filtered.items()))
+                group_vals[key] = filtered
+                groups[key].append(rec_id)
+        failed: List[int] = []
+        for key, ids in groups.items():
+            vals = group_vals[key]
+            _, group_failed = run_chunked(
+                ids, lambda chunk, vals=vals: self._write(model, chunk, vals), chunk_size=TRANSITION_CHUNK_SIZE
+            )
+            for rec_id, error in group_failed.items():
+                logger.log(log_level, "Failed %s.write id=%s: %s", model, rec_id, error)
+            failed.extend(group_failed)
+        return failed
+
+    def _store_product_info(self, rec: dict) -> None:
+        self._product_info[rec['id']] = {
+            'uom_id': rec['uom_id'][0] if rec.get('uom_id') else None,
+            'tracking': rec.get('tracking') or 'none',
+            'product_tmpl_id': rec['product_tmpl_id'][0] if rec.get('product_tmpl_id') else None,
+        }
+
+    def preload_products(self, codes: List[str]) -> None:
+        """Resolve distinct default_codes and snapshot uom_id/tracking/product_tmpl_id with one chunked search_read."""
+        codes = sorted({
+            str(c).strip() for c in codes
+            if c and str(c).strip() and str(c).strip().lower() != 'non-stock'
+        } - set(self._product_ids_by_code))
+        for i in range(0, len(codes), READ_CHUNK_SIZE):
+            chunk = codes[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('product.product', [('default_code', 'in', chunk)], PRODUCT_INFO_FIELDS)
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['default_code'], rec['id'])
+                self._store_product_info(rec)
+            for code in chunk:
+                self._product_ids_by_code[code] = found.get(code)
+        logger.info("Preloaded %d product code(s), %d product snapshot(s)", len(codes), len(self._product_info))
+
+    def get_product_info(self, product_id: int) -> dict:
+        """Cached uom_id/tracking/product_tmpl_id; read once on first use for products not preloaded (e.g. newly created)."""
+        if product_id not in self._product_info:
+            records = self._read('product.product', [product_id], PRODUCT_INFO_FIELDS)
+            if records:
+                self._store_product_info(records[0])
+            else:
+                self._product_info[product_id] = {'uom_id': None, 'tracking': 'none', 'product_tmpl_id': None}
+        return self._product_info[product_id]
+
     def find_product_by_default_code(self, default_code: str) -> Optional[int]:
         if not default_code or not str(default_code).strip():
             return None
         code = str(default_code).strip()
         if code.lower() == 'non-stock':
             return NON_STOCK_PRODUCT_ID
+        if code in self._product_ids_by_code:
+            return self._product_ids_by_code[code]
         ids = self._search('product.product', [('default_code', '=', code)], limit=1)
-        return ids[0] if ids else None
+        self._product_ids_by_code[code] = ids[0] if ids else None
+        return self._product_ids_by_code[code]
 
     def create_product(self, reference: str, name: Optional[str] = None) -> Optional[int]:
         """
@@ -131,12 +263,7 @@ class OdooMRPSWOImporter:
             return None
         reference = str(reference).strip()
         name = (name or reference).strip() or reference
-        try:
-            categ_ids = self._search('product.category', [('name', '=', 'All')], limit=1)
-            categ_id = categ_ids[0] if categ_ids else None
-        except Exception as e:
-            logger.debug("Could not find product category: %s", e)
-            categ_id = None
+        categ_id = self.find_default_product_category()
         uom_id = self.find_uom_by_name('Units')
         product_vals = {
             'name': name,
@@ -154,6 +281,7 @@ class OdooMRPSWOImporter:
             template_id = self._create('product.template', product_vals)
             product_ids = self._search('product.product', [('product_tmpl_id', '=', template_id)], limit=1)
             if product_ids:
+                self._product_ids_by_code[reference] = product_ids[0]
                 logger.info("Created product: %s (reference=%s, id=%s)", name, reference, product_ids[0])
                 return product_ids[0]
             return None
@@ -176,11 +304,107 @@ class OdooMRPSWOImporter:
             return product_id
         return self.create_product(code, name=name or code)
 
+    def load_existing_mo_index(self) -> None:
+        """Index every imported (non-cancelled) mrp.production by old_pwo_id and old_pwo_number in one search_read (product_id and state kept per id)."""
+        records = self._search_read(
+            'mrp.production',
+            [('state', '!=', 'cancel'), '|', ('old_pwo_id', '!=', False), ('old_pwo_number', '!=', False)],
+            ['old_pwo_id', 'old_pwo_number', 'product_id', 'state'],
+        )
+        self._existing_mo_by_pwo_id = {}
+        self._existing_mo_by_pwo_number = {}
+        self._existing_mo_info = {}
+        for rec in records:
+            self._existing_mo_info[rec['id']] = {
+                'product_id': rec['product_id'][0] if rec.get('product_id') else None,
+                'state': rec.get('state'),
+            }
+            if rec.get('old_pwo_id'):
+                self._existing_mo_by_pwo_id.setdefault(str(rec['old_pwo_id']).strip(), rec['id'])
+            if rec.get('old_pwo_number'):
+                self._existing_mo_by_pwo_number.setdefault(str(rec['old_pwo_number']).strip(), rec['id'])
+        logger.info("Found %d MO(s) already imported in Odoo", len(records))
+
+    def find_existing_mo(self, pwo_id: Optional[str], pwo_number: Optional[str]) -> Optional[int]:
+        """Existing mrp.production id for a PWO, matched by old_pwo_id first, then old_pwo_number."""
+        if self._existing_mo_by_pwo_id is None:
+            self.load_existing_mo_index()
+        if pwo_id and pwo_id in self._existing_mo_by_pwo_id:
+            return self._existing_mo_by_pwo_id[pwo_id]
+        if pwo_number:
+            return self._existing_mo_by_pwo_number.get(pwo_number)
+        return None
+
+    def find_default_product_category(self) -> Optional[int]:
+        """product.category 'All' (cached for the run)."""
+        if 'categ_all' not in self._ref_cache:
+            try:
+                categ_ids = self._search('product.category', [('name', '=', 'All')], limit=1)
+                self._ref_cache['categ_all'] = categ_ids[0] if categ_ids else None
+            except Exception as e:
+                logger.debug("Could not find product category: %s", e)
+                return None
+        return self._ref_cache['categ_all']
+
+    def preload_sale_orders(self, names: List[str]) -> None:
+        """Load sale.order id and company_id for all distinct names with one chunked search_read."""
+        names = sorted({str(n).strip() for n in names if n and str(n).strip()} - set(self._sale_orders_by_name))
+        for i in range(0, len(names), READ_CHUNK_SIZE):
+            chunk = names[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('sale.order', [('name', 'in', chunk)], ['name', 'company_id'])
+            found = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                found.setdefault(rec['name'], rec['id'])
+                self._sale_order_company[rec['id']] = rec['company_id'][0] if rec.get('company_id') else None
+            for name in chunk:
+                self._sale_orders_by_name[name] = found.get(name)
+        logger.info("Preloaded %d sale order name(s)", len(names))
+
+    def load_existing_swos(self, swo_numbers: List[str]) -> Dict[Tuple[str, str], Tuple[int, Optional[int], Optional[str], List[dict]]]:
+        """Imported sale.work.order per (old_swo_number, old_so_number) -> (swo_id, sale_order_id, state, lines), read in chunked search_reads."""
+        swo_numbers = sorted({str(n).strip() for n in swo_numbers if n and str(n).strip()})
+        swos = {}
+        for i in range(0, len(swo_numbers), READ_CHUNK_SIZE):
+            chunk = swo_numbers[i:i + READ_CHUNK_SIZE]
+            for rec in sorted(
+                self._search_read('sale.work.order', [('old_swo_number', 'in', chunk)],
+                                  ['old_swo_number', 'old_so_number', 'sale_order_id', 'state']),
+                key=lambda r: r['id'],
+            ):
+                swos.setdefault(rec['id'], rec)
+        lines_by_swo = defaultdict(list)
+        swo_ids = sorted(swos)
+        for i in range(0, len(swo_ids), READ_CHUNK_SIZE):
+            chunk = swo_ids[i:i + READ_CHUNK_SIZE]
+            records = self._search_read('sale.work.order.line', [('work_order_id', 'in', chunk)],
+                                        ['work_order_id', 'product_id', 'old_pwo_number'])
+            for rec in sorted(records, key=lambda r: r['id']):
+                lines_by_swo[rec['work_order_id'][0]].append(rec)
+        existing = {}
+        for swo_id, rec in swos.items():
+            key = (str(rec['old_swo_number']).strip(), str(rec.get('old_so_number') or '').strip())
+            sale_order_id = rec['sale_order_id'][0] if rec.get('sale_order_id') else None
+            existing.setdefault(key, (swo_id, sale_order_id, rec.get('state'), lines_by_swo.get(swo_id, [])))
+        logger.info("Found %d SWO(s) already imported in Odoo", len(swos))
+        return existing
+
     def find_sale_order_by_name(self, name: str) -> Optional[int]:
         if not name or not str(name).strip():
             return None
-        ids = self._search('sale.order', [('name', '=', str(name).strip())], limit=1)
-        return ids[0] if ids else None
+        name = str(name).strip()
+        if name not in self._sale_orders_by_name:
+            ids = self._search('sale.order', [('name', '=', name)], limit=1)
+            self._sale_orders_by_name[name] = ids[0] if ids else None
+        return self._sale_orders_by_name[name]
+
+    def get_sale_order_company(self, sale_order_id: int) -> Optional[int]:
+        """company_id of a sale.order (preloaded with the order, otherwise read once)."""
+        if sale_order_id not in self._sale_order_company:
+            so_data = self._read('sale.order', [sale_order_id], ['company_id'])
+            self._sale_order_company[sale_order_id] = (
+                so_data[0]['company_id'][0] if so_data and so_data[0].get('company_id') else None
+            )
+        return self._sale_order_company[sale_order_id]
 
     def find_user_by_name(self, name: str) -> Optional[int]:
         if not name or not str(name).strip():
@@ -190,21 +414,21 @@ class OdooMRPSWOImporter:
 
     def find_uom_by_name(self, name: str = 'Units') -> Optional[int]:
         name = (name or 'Units').strip() or 'Units'
-        ids = self._search('uom.uom', [('name', '=', name)], limit=1)
-        if ids:
-            return ids[0]
-        ids = self._search('uom.uom', [('name', '=', 'Units')], limit=1)
-        return ids[0] if ids else None
+        if self._uom_ids_by_name is None:
+            # uom.uom is a small table: load every name once
+            self._uom_ids_by_name = {}
+            for rec in sorted(self._search_read('uom.uom', [], ['name']), key=lambda r: r['id']):
+                self._uom_ids_by_name.setdefault(rec['name'], rec['id'])
+        return self._uom_ids_by_name.get(name) or self._uom_ids_by_name.get('Units')
 
     def find_first_bom_for_product(self, product_id: int) -> Optional[int]:
         """Return first mrp.bom id for this product (by product_tmpl_id)."""
         if not product_id:
             return None
         try:
-            prod = self._read('product.product', [product_id], ['product_tmpl_id'])
-            if not prod or not prod[0].get('product_tmpl_id'):
+            pt_id = self.get_product_info(product_id)['product_tmpl_id']
+            if not pt_id:
                 return None
-            pt_id = prod[0]['product_tmpl_id'][0]
             bom_ids = self._search('mrp.bom', [('product_tmpl_id', '=', pt_id)], limit=1)
             return bom_ids[0] if bom_ids else None
         except Exception as e:
@@ -212,18 +436,15 @@ class OdooMRPSWOImporter:
             return None
 
     def find_manufacture_picking_type_id(self) -> Optional[int]:
-        """Return the manufacture picking type (manu_type_id) from the default warehouse so MO has picking_type_id/warehouse for pick component creation."""
-        try:
-            wh_ids = self._search('stock.warehouse', [], limit=1)
-            if not wh_ids:
-                return None
-            wh = self._read('stock.warehouse', [wh_ids[0]], ['manu_type_id'])
-            if not wh or not wh[0].get('manu_type_id'):
+        """Return the manufacture picking type (manu_type_id) from the default warehouse so MO has picking_type_id/warehouse for pick component creation. Cached for the run."""
+        if 'manu_type_id' not in self._ref_cache:
+            try:
+                wh = self._search_read('stock.warehouse', [], ['manu_type_id'], limit=1)
+                self._ref_cache['manu_type_id'] = wh[0]['manu_type_id'][0] if wh and wh[0].get('manu_type_id') else None
+            except Exception as e:
+                logger.debug("find_manufacture_picking_type_id: %s", e)
                 return None
-            return wh[0]['manu_type_id'][0]
-        except Exception as e:
-            logger.debug("find_manufacture_picking_type_id: %s", e)
-            return None
+        return self._ref_cache['manu_type_id']
 
     def _to_datetime_str(self, value) -> Optional[str]:
         if value is None:
@@ -249,13 +470,10 @@ class OdooMRPSWOImporter:
     # MO product_qty = F - O (Quantity To Produce - quantity_produced); qty_producing is not set
 
     def parse_outstanding_mo(self, excel_path: str, sheet_name: Optional[str] = None, header_row: int = 1) -> Dict[str, Dict]:
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
         start_row = header_row + 1
         mo_data = defaultdict(lambda: {'mo_data': None, 'components': []})
 
-        for row_idx in range(start_row, ws.max_row + 1):
-            row_cells = [cell.value for cell in ws[row_idx]]
+        for row_idx, row_cells in enumerate(iter_sheet_rows(excel_path, sheet_name, min_row=start_row), start_row):
             # Require at least 10 columns (A–J) so component rows with H=code, J=qty are not skipped
             if len(row_cells) < 10:
                 continue
@@ -309,7 +527,6 @@ class OdooMRPSWOImporter:
                     'row_index': row_idx,
                 })
 
-        wb.close()
         total_components = sum(len(d['components']) for d in mo_data.values())
         logger.info("Parsed %d PWO groups from Outstanding-MO (%d total components)", len(mo_data), total_components)
         return dict(mo_data)
@@ -320,12 +537,9 @@ class OdooMRPSWOImporter:
     # product_qty for line = max(M, N) else M
 
     def parse_swo_template(self, excel_path: str, sheet_name: Optional[str] = None, header_row: int = 1) -> List[Dict]:
-        wb = load_workbook(excel_path, read_only=True, data_only=True)
-        ws = wb[sheet_name] if sheet_name else wb.active
         start_row = header_row + 1
         records = []
-        for row_idx in range(start_row, ws.max_row + 1):
-            row_cells = [cell.value for cell in ws[row_idx]]
+        for row_idx, row_cells in enumerate(iter_sheet_rows(excel_path, sheet_name, min_row=start_row), start_row):
             if len(row_cells) < 17:
                 continue
             swo_number = row_cells[1] if len(row_cells) > 1 else None
@@ -366,7 +580,6 @@ class OdooMRPSWOImporter:
                 'row_index': row_idx,
                 'col_n_val': col_n_val,
             })
-        wb.close()
         logger.info("Parsed %d SWO rows from template", len(records))
         return records
 
@@ -381,16 +594,88 @@ class OdooMRPSWOImporter:
         excel_path: str,
         sheet_name: Optional[str] = None,
         dry_run: bool = True,
+        batch_size: int = MO_CREATE_BATCH_SIZE,
     ) -> Tuple[Dict[str, int], Dict[str, bool], Dict[str, Dict], Dict[str, int], set]:  # mo_ids_with_non_stock: set of mo_id
-        """Create all mrp.production from Outstanding-MO. Returns (mo_map, in_progress_map, mo_data_by_pwo, mo_product_map, mo_ids_with_non_stock). MOs with Non-Stock component are created but not confirmed (ids in mo_ids_with_non_stock)."""
+        """Create all mrp.production from Outstanding-MO, batch_size MOs per create call. Returns (mo_map, in_progress_map, mo_data_by_pwo, mo_product_map, mo_ids_with_non_stock). MOs with Non-Stock component are created but not confirmed (ids in mo_ids_with_non_stock)."""
         mo_data = self.parse_outstanding_mo(excel_path, sheet_name)
         mo_map = {}
         in_progress_map = {}
         mo_data_by_pwo = {}
         mo_product_map = {}
         mo_ids_with_non_stock = set()
+        # Prepared MOs waiting for the next multi-record create: (pwo_id, mo_info, product_id, has_non_stock, n_components, mo_vals)
+        pending = []
+
+        def flush() -> None:
+            mo_ids = self._create_many('mrp.production', [item[5] for item in pending])
+            for (pwo_id, mo_info, product_id, has_non_stock, n_components, _), mo_id in zip(pending, mo_ids):
+                if not mo_id:
+                    logger.error("PWO %s (old_pwo_number=%s): MO create failed, skipped", pwo_id, mo_info['pwo_number'])
+                    continue
+                pwo_key = mo_info['pwo_number'] or pwo_id
+                mo_map[pwo_key] = mo_id
+                in_progress_map[pwo_key] = self._is_in_progress_state(mo_info.get('state'))
+                mo_data_by_pwo[pwo_key] = mo_info
+                mo_product_map[pwo_key] = product_id
+                if has_non_stock:
+                    mo_ids_with_non_stock.add(mo_id)
+                    logger.info(
+                        "Created MO %s (old_pwo_number=%s) with %d component(s) [Non-Stock: will not confirm]",
+                        mo_id, mo_info['pwo_number'], n_components
+                    )
+                else:
+                    logger.info(
+                        "Created MO %s (old_pwo_number=%s) with %d component(s)",
+                        mo_id, mo_info['pwo_number'], n_components
+                    )
+            pending.clear()
+
+        # PWOs imported by an earlier run are not created again (reruns after a partial failure do not
+        # duplicate MOs), but their MOs are put in the maps so the SWO steps still link them.
+        # An MO still in draft without a Non-Stock component never got past Step 5, so it goes through
+        # the remaining steps like a new one; any other existing MO is only linked.
+        self.load_existing_mo_index()
+        self._link_only_mo_ids = set()
+        existing_pwo_ids = set()
+        for pwo_id, data in mo_data.items():
+            mo_info = data.get('mo_data')
+            existing_id = mo_info and self.find_existing_mo(mo_info['pwo_id'], mo_info['pwo_number'])
+            if not existing_id:
+                continue
+            existing = self._existing_mo_info.get(existing_id, {})
+            has_non_stock = any(
+                str(comp['component_code']).strip().lower() == 'non-stock' for comp in data.get('components', [])
+            )
+            pwo_key = mo_info['pwo_number'] or pwo_id
+            mo_map[pwo_key] = existing_id
+            in_progress_map[pwo_key] = self._is_in_progress_state(mo_info.get('state'))
+            mo_data_by_pwo[pwo_key] = mo_info
+            mo_product_map[pwo_key] = existing.get('product_id')
+            if has_non_stock:
+                mo_ids_with_non_stock.add(existing_id)
+            if has_non_stock or existing.get('state') != 'draft':
+                self._link_only_mo_ids.add(existing_id)
+            existing_pwo_ids.add(pwo_id)
+            logger.info("PWO %s (old_pwo_number=%s): MO %s already exists, not created again", pwo_id, mo_info['pwo_number'], existing_id)
+        if existing_pwo_ids:
+            logger.info(
+                "Reusing %d MO(s) already imported (%d only linked to SWO lines)",
+                len(existing_pwo_ids), len(self._link_only_mo_ids),
+            )
+
+        # Resolve all MO/component product codes and snapshot uom_id in bulk
+        all_codes = []
+        for pwo_id, data in mo_data.items():
+            if pwo_id in existing_pwo_ids:
+                continue
+            if data.get('mo_data'):
+                all_codes.append(data['mo_data']['product_code'])
+            all_codes.extend(comp['component_code'] for comp in data.get('components', []))
+        self.preload_products(all_codes)
 
         for pwo_id, data in mo_data.items():
+            if pwo_id in existing_pwo_ids:
+                continue
             mo_info = data.get('mo_data')
             if not mo_info:
                 logger.warning("PWO %s: no main MO data (missing product column)", pwo_id)
@@ -399,8 +684,7 @@ class OdooMRPSWOImporter:
             if not product_id:
                 logger.error("PWO %s: product not found/created for '%s'", pwo_id, mo_info['product_code'])
                 continue
-            product_data = self._read('product.product', [product_id], ['uom_id'])
-            uom_id = product_data[0]['uom_id'][0] if product_data and product_data[0].get('uom_id') else None
+            uom_id = self.get_product_info(product_id)['uom_id']
 
             move_raw_vals = []
             has_non_stock_component = False
@@ -414,9 +698,7 @@ class OdooMRPSWOImporter:
                     has_non_stock_component = True
                 comp_uom_id = None
                 try:
-                    comp_data = self._read('product.product', [comp_product_id], ['uom_id'])
-                    if comp_data and comp_data[0].get('uom_id'):
-                        comp_uom_id = comp_data[0]['uom_id'][0]
+                    comp_uom_id = self.get_product_info(comp_product_id)['uom_id']
                 except Exception:
                     pass
                 raw_vals = {
@@ -465,26 +747,15 @@ class OdooMRPSWOImporter:
                 mo_vals['move_raw_ids'] = move_raw_vals
 
             if not dry_run:
-                mo_id = self._create('mrp.production', mo_vals)
-                pwo_key = mo_info['pwo_number'] or pwo_id
-                mo_map[pwo_key] = mo_id
-                in_progress_map[pwo_key] = self._is_in_progress_state(mo_info.get('state'))
-                mo_data_by_pwo[pwo_key] = mo_info
-                mo_product_map[pwo_key] = product_id
-                if has_non_stock_component:
-                    mo_ids_with_non_stock.add(mo_id)
-                    logger.info(
-                        "Created MO %s (old_pwo_number=%s) with %d component(s) [Non-Stock: will not confirm]",
-                        mo_id, mo_info['pwo_number'], len(move_raw_vals)
-                    )
-                else:
-                    logger.info(
-                        "Created MO %s (old_pwo_number=%s) with %d component(s)",
-                        mo_id, mo_info['pwo_number'], len(move_raw_vals)
-                    )
+                pending.append((pwo_id, mo_info, product_id, has_non_stock_component, len(move_raw_vals), mo_vals))
+                if len(pending) >= max(1, batch_size):
+                    flush()
             else:
                 logger.info("[DRY RUN] Would create MO for PWO %s", pwo_id)
 
+        if pending:
+            flush()
+
         return mo_map, in_progress_map, mo_data_by_pwo, mo_product_map, mo_ids_with_non_stock
 
     # --------------- Step 2: Create SWOs (grouped; create all groups even if column I / PWO is empty) ---------------
@@ -494,8 +765,8 @@ class OdooMRPSWOImporter:
         mo_map: Dict[str, int],
         sheet_name: Optional[str] = None,
         dry_run: bool = True,
-    ) -> Tuple[List[int], List[Dict]]:
-        """Create sale.work.order for all groups (B, C); create even when column I (old_pwo_number) is empty. Returns (swo_ids, lines_with_pwo) with product_id on each line for linkage."""
+    ) -> Tuple[List[int], List[Dict], Dict[Tuple[str, int], List[Dict]]]:
+        """Create sale.work.order for all groups (B, C); create even when column I (old_pwo_number) is empty. Returns (swo_ids, lines_with_pwo, lines_by_pwo_product): lines carry product_id, work_order_id and sale_order_id for linkage, indexed by (old_pwo_number, product_id)."""
         records = self.parse_swo_template(swo_excel_path, sheet_name)
         groups = defaultdict(list)
         for rec in records:
@@ -504,8 +775,23 @@ class OdooMRPSWOImporter:
 
         swo_ids = []
         lines_with_pwo = []
+        lines_by_pwo_product = defaultdict(list)
+        self.preload_products([rec['item_code'] for rec in records])
+        self.preload_sale_orders([so_number for _, so_number in groups])
+        # SWOs imported by an earlier run are not created again; their lines are reused for Step 4 and
+        # the lines that run did not get to are created
+        existing_swos = {} if dry_run else self.load_existing_swos([swo_number for swo_number, _ in groups])
 
         for (swo_number, so_number), rows in groups.items():
+            existing = existing_swos.get((str(swo_number or '').strip(), str(so_number or '').strip()))
+            if existing:
+                swo_id, sale_order_id, swo_state, existing_lines = existing
+                logger.info("SWO %s already exists (id=%s, state=%s), not created again", swo_number, swo_id, swo_state)
+                if swo_state == 'draft':
+                    # An earlier run stopped before Step 3: confirm and swap it with this run's SWOs
+                    swo_ids.append(swo_id)
+                self._add_swo_lines(swo_id, sale_order_id, rows, existing_lines, lines_with_pwo, lines_by_pwo_product)
+                continue
             sale_order_id = self.find_sale_order_by_name(so_number)
             company_id = None
             if not sale_order_id:
@@ -523,8 +809,7 @@ class OdooMRPSWOImporter:
                     )
                     sale_order_id = False
             if sale_order_id:
-                so_data = self._read('sale.order', [sale_order_id], ['company_id'])
-                company_id = so_data[0]['company_id'][0] if so_data and so_data[0].get('company_id') else None
+                company_id = self.get_sale_order_company(sale_order_id)
 
             request_date = self._to_datetime_str(rows[0].get('request_date'))
             old_issue_date = self._to_datetime_str(rows[0].get('old_issue_date'))
@@ -550,17 +835,43 @@ class OdooMRPSWOImporter:
             swo_id = self._create('sale.work.order', swo_vals)
             swo_ids.append(swo_id)
 
-            for r in rows:
-                item_code = r.get('item_code')
-                if not item_code or not str(item_code).strip():
-                    logger.debug("Row %s: skip line (product/item_code is empty)", r['row_index'])
-                    continue
-                product_id = self.find_or_create_product(item_code, name=item_code)
-                if not product_id:
-                    logger.warning("Row %s: product not found/created '%s', skip line", r['row_index'], item_code)
-                    continue
-                product_data = self._read('product.product', [product_id], ['uom_id'])
-                uom_id = product_data[0]['uom_id'][0] if product_data and product_data[0].get('uom_id') else None
+            self._add_swo_lines(swo_id, sale_order_id, rows, None, lines_with_pwo, lines_by_pwo_product)
+
+        return swo_ids, lines_with_pwo, dict(lines_by_pwo_product)
+
+    def _add_swo_lines(
+        self,
+        swo_id: int,
+        sale_order_id: Optional[int],
+        rows: List[Dict],
+        existing_lines: Optional[List[dict]],
+        lines_with_pwo: List[Dict],
+        lines_by_pwo_product: Dict[Tuple[str, int], List[Dict]],
+    ) -> None:
+        """
+        Add one SWO's sheet rows to the Step 4 linkage. A row reuses an existing line of the SWO with the
+        same (old_pwo_number, product_id) (imported by an earlier run); any other row gets a new line.
+        existing_lines is None for a SWO created by this run.
+        """
+        existing_by_key = defaultdict(list)
+        for rec in existing_lines or []:
+            product_id = rec['product_id'][0] if rec.get('product_id') else None
+            existing_by_key[(rec.get('old_pwo_number') or None, product_id)].append(rec['id'])
+
+        for r in rows:
+            item_code = r.get('item_code')
+            if not item_code or not str(item_code).strip():
+                logger.debug("Row %s: skip line (product/item_code is empty)", r['row_index'])
+                continue
+            product_id = self.find_or_create_product(item_code, name=item_code)
+            if not product_id:
+                logger.warning("Row %s: product not found/created '%s', skip line", r['row_index'], item_code)
+                continue
+            existing_ids = existing_by_key.get((r.get('old_pwo_number') or None, product_id))
+            if existing_ids:
+                line_id = existing_ids.pop(0)
+            else:
+                uom_id = self.get_product_info(product_id)['uom_id']
                 line_vals = {
                     'work_order_id': swo_id,
                     'product_id': product_id,
@@ -570,27 +881,25 @@ class OdooMRPSWOImporter:
                     'remarks': r.get('remarks'),
                 }
                 line_id = self._create('sale.work.order.line', line_vals)
-                lines_with_pwo.append({
-                    'line_id': line_id,
-                    'work_order_id': swo_id,
-                    'old_pwo_number': r.get('old_pwo_number'),
-                    'product_id': product_id,
-                    'sale_order_id': sale_order_id,
-                    'col_n_val': r.get('col_n_val', 0.0),
-                })
-
-        return swo_ids, lines_with_pwo
+                if existing_lines is not None:
+                    logger.info("Row %s: created missing line %s on existing SWO %s", r['row_index'], line_id, swo_id)
+            line = {
+                'line_id': line_id,
+                'work_order_id': swo_id,
+                'old_pwo_number': r.get('old_pwo_number'),
+                'product_id': product_id,
+                'sale_order_id': sale_order_id,
+                'col_n_val': r.get('col_n_val', 0.0),
+            }
+            lines_with_pwo.append(line)
+            if line['old_pwo_number']:
+                lines_by_pwo_product[(line['old_pwo_number'], product_id)].append(line)
 
     # --------------- Step 3: Confirm all SWOs ---------------
     def confirm_swo_all(self, swo_ids: List[int], dry_run: bool = True) -> None:
         if dry_run or not swo_ids:
             return
-        for sid in swo_ids:
-            try:
-                self._call('sale.work.order', 'action_confirm', [sid])
-                logger.info("Confirmed SWO id=%s", sid)
-            except Exception as e:
-                logger.error("Failed to confirm SWO id=%s: %s", sid, e)
+        self.call_batch('sale.work.order', 'action_confirm', swo_ids)
 
     # --------------- Step 4: Link SWO to MO (match by old_pwo_number and product_id) ---------------
     def link_swo_to_mo(
@@ -599,26 +908,28 @@ class OdooMRPSWOImporter:
         mo_product_map: Dict[str, int],
         lines_with_pwo: List[Dict],
         dry_run: bool = True,
+        lines_by_pwo_product: Optional[Dict[Tuple[str, int], List[Dict]]] = None,
     ) -> None:
         if dry_run or not lines_with_pwo:
             return
+        if lines_by_pwo_product is None:
+            lines_by_pwo_product = defaultdict(list)
+            for L in lines_with_pwo:
+                if L.get('old_pwo_number'):
+                    lines_by_pwo_product[(L['old_pwo_number'], L.get('product_id'))].append(L)
         linked_line_ids = set()
+        line_vals_by_id = {}
         # Link MO only to SWO lines that match both old_pwo_number (PWO name) and product_id
         for old_pwo_number, mo_id in mo_map.items():
             mo_product_id = mo_product_map.get(old_pwo_number)
             if not mo_product_id:
                 continue
-            lines_for_mo = [
-                L for L in lines_with_pwo
-                if L.get('old_pwo_number') == old_pwo_number and L.get('product_id') == mo_product_id
-            ]
+            lines_for_mo = lines_by_pwo_product.get((old_pwo_number, mo_product_id), [])
             line_ids = [L['line_id'] for L in lines_for_mo]
             if not line_ids:
                 continue
-            line_data = self._read('sale.work.order.line', line_ids, ['work_order_id'])
-            work_order_ids = list({r['work_order_id'][0] for r in line_data if r.get('work_order_id')})
-            swo_data = self._read('sale.work.order', work_order_ids, ['sale_order_id'])
-            sale_order_ids = list({r['sale_order_id'][0] for r in swo_data if r.get('sale_order_id')})
+            work_order_ids = sorted({L['work_order_id'] for L in lines_for_mo if L.get('work_order_id')})
+            sale_order_ids = sorted({L['sale_order_id'] for L in lines_for_mo if L.get('sale_order_id')})
 
             try:
                 self._write('mrp.production', [mo_id], {
@@ -627,11 +938,12 @@ class OdooMRPSWOImporter:
                     'sale_order_ids': [(6, 0, sale_order_ids)],
                 })
                 # Link MO and set old_qty_produced from column N for all lines with this PWO
+                # (written below, one write per MO and column N value)
                 for L in lines_for_mo:
-                    self._write('sale.work.order.line', [L['line_id']], {
+                    line_vals_by_id[L['line_id']] = {
                         'production_ids': [(4, mo_id)],
                         'old_qty_produced': float(L.get('col_n_val', 0.0)),
-                    })
+                    }
                     linked_line_ids.add(L['line_id'])
                 logger.info("Linked MO %s (PWO=%s, product_id=%s) to SWO lines %s", mo_id, old_pwo_number, mo_product_id, line_ids)
             except Exception as e:
@@ -646,11 +958,9 @@ class OdooMRPSWOImporter:
             col_n_val = L.get('col_n_val')
             if col_n_val is None:
                 continue
-            try:
-                self._write('sale.work.order.line', [L['line_id']], {'old_qty_produced': float(col_n_val)})
-                logger.info("Set old_qty_produced=%.2f on SWO line %s (PWO %s not found)", float(col_n_val), L['line_id'], L.get('old_pwo_number'))
-            except Exception as e:
-                logger.warning("Failed to set old_qty_produced on line %s: %s", L['line_id'], e)
+            line_vals_by_id[L['line_id']] = {'old_qty_produced': float(col_n_val)}
+            logger.info("Set old_qty_produced=%.2f on SWO line %s (PWO %s not found)", float(col_n_val), L['line_id'], L.get('old_pwo_number'))
+        self.write_grouped('sale.work.order.line', line_vals_by_id)
 
     # --------------- Step 5: Confirm all MOs (skip Non-Stock); write dates before button_plan ---------------
     def confirm_mo_all(
@@ -662,31 +972,26 @@ class OdooMRPSWOImporter:
     ) -> None:
         if dry_run or not mo_map:
             return
+        to_confirm = []
         for old_pwo_number, mo_id in mo_map.items():
             if mo_id in mo_ids_with_non_stock:
                 logger.info("Skip confirm MO id=%s (PWO=%s, has Non-Stock component)", mo_id, old_pwo_number)
                 continue
-            try:
-                self._call('mrp.production', 'action_import_confirm', [mo_id])
-                logger.info("Confirmed MO id=%s", mo_id)
-            except Exception as e:
-                logger.error("Failed to confirm MO id=%s: %s", mo_id, e)
-                continue
+            to_confirm.append(mo_id)
+        confirmed_ids, _ = self.call_batch('mrp.production', 'action_import_confirm', to_confirm)
+        confirmed = set(confirmed_ids)
+        # Write dates before button_plan, grouped by identical (date_start, date_finished)
+        dates_by_mo = {}
+        for old_pwo_number, mo_id in mo_map.items():
             mo_info = mo_data_by_pwo.get(old_pwo_number)
-            if mo_info:
-                try:
-                    self._write('mrp.production', [mo_id], {
-                        'date_start': self._to_datetime_str(mo_info.get('start_date')),
-                        'date_finished': self._to_datetime_str(mo_info.get('end_date')),
-                    })
-                    logger.debug("Wrote dates on MO id=%s (before button_plan)", mo_id)
-                except Exception as e:
-                    logger.warning("Failed to write dates on MO id=%s: %s", mo_id, e)
-            try:
-                self._call('mrp.production', 'button_plan', [mo_id])
-                logger.info("Planned MO id=%s (pick component created if warehouse manufacture_steps=pbm)", mo_id)
-            except Exception as e:
-                logger.warning("button_plan MO id=%s: %s", mo_id, e)
+            if mo_id in confirmed and mo_info:
+                dates_by_mo[mo_id] = {
+                    'date_start': self._to_datetime_str(mo_info.get('start_date')),
+                    'date_finished': self._to_datetime_str(mo_info.get('end_date')),
+                }
+        self.write_grouped('mrp.production', dates_by_mo)
+        # pick component created if warehouse manufacture_steps=pbm
+        self.call_batch('mrp.production', 'button_plan', confirmed_ids, log_level=logging.WARNING)
 
     # --------------- Step 6: action_start for in-progress MOs (exclude Non-Stock MOs) ---------------
     def action_start_in_progress_mos(
@@ -697,14 +1002,8 @@ class OdooMRPSWOImporter:
     ) -> None:
         if dry_run or not mo_ids_in_progress:
             return
-        for mo_id in mo_ids_in_progress:
-            if mo_id in mo_ids_with_non_stock:
-                continue
-            try:
-                self._call('mrp.production', 'action_start', [mo_id])
-                logger.info("Started MO id=%s", mo_id)
-            except Exception as e:
-                logger.error("Failed action_start MO id=%s: %s", mo_id, e)
+        to_start = [mo_id for mo_id in mo_ids_in_progress if mo_id not in mo_ids_with_non_stock]
+        self.call_batch('mrp.production', 'action_start', to_start)
 
     # --------------- Step 7: Dates (draft/Non-Stock MOs only) and swap_old_name ---------------
     def apply_dates_and_swap_names(
@@ -717,27 +1016,17 @@ class OdooMRPSWOImporter:
     ) -> None:
         if dry_run:
             return
+        dates_by_mo = {}
         for old_pwo_number, mo_id in mo_map.items():
-            if mo_id in mo_ids_with_non_stock:
-                mo_info = mo_data_by_pwo.get(old_pwo_number)
-                if mo_info:
-                    try:
-                        self._write('mrp.production', [mo_id], {
-                            'date_start': self._to_datetime_str(mo_info.get('start_date')),
-                            'date_finished': self._to_datetime_str(mo_info.get('end_date')),
-                        })
-                        logger.debug("Wrote dates on draft MO id=%s (Non-Stock)", mo_id)
-                    except Exception as e:
-                        logger.warning("Failed to write dates on MO %s: %s", mo_id, e)
-            try:
-                self._call('mrp.production', 'swap_old_name', [mo_id])
-            except Exception as e:
-                logger.error("Failed swap_old_name MO %s: %s", mo_id, e)
-        for swo_id in swo_ids:
-            try:
-                self._call('sale.work.order', 'swap_old_name', [swo_id])
-            except Exception as e:
-                logger.error("Failed swap_old_name SWO %s: %s", swo_id, e)
+            mo_info = mo_data_by_pwo.get(old_pwo_number)
+            if mo_id in mo_ids_with_non_stock and mo_info:
+                dates_by_mo[mo_id] = {
+                    'date_start': self._to_datetime_str(mo_info.get('start_date')),
+                    'date_finished': self._to_datetime_str(mo_info.get('end_date')),
+                }
+        self.write_grouped('mrp.production', dates_by_mo)
+        self.call_batch('mrp.production', 'swap_old_name', list(mo_map.values()))
+        self.call_batch('sale.work.order', 'swap_old_name', swo_ids)
 
     # --------------- Full run ---------------
     def run_import(
@@ -747,33 +1036,38 @@ class OdooMRPSWOImporter:
         mo_sheet_name: Optional[str] = None,
         swo_sheet_name: Optional[str] = None,
         dry_run: bool = True,
+        mo_batch_size: int = MO_CREATE_BATCH_SIZE,
     ) -> None:
         logger.info("Step 1: Import all MO from Outstanding-MO")
         mo_map, in_progress_map, mo_data_by_pwo, mo_product_map, mo_ids_with_non_stock = self.import_mrp_all(
-            mo_excel_path, mo_sheet_name, dry_run
+            mo_excel_path, mo_sheet_name, dry_run, mo_batch_size
         )
         if not mo_map:
-            logger.warning("No MOs created; aborting rest of import.")
+            logger.warning("No MOs created or found (none parsed); aborting rest of import.")
             return
+        # Steps 5-7 (confirm, start, swap_old_name) only run on MOs created by this run or left in draft by an earlier one
+        new_mo_map = {pwo: mo_id for pwo, mo_id in mo_map.items() if mo_id not in self._link_only_mo_ids}
 
         logger.info("Step 2: Import SWO (all groups; column I may be empty)")
-        swo_ids, lines_with_pwo = self.import_swo_where_mo_exists(swo_excel_path, mo_map, swo_sheet_name, dry_run)
+        swo_ids, lines_with_pwo, lines_by_pwo_product = self.import_swo_where_mo_exists(
+            swo_excel_path, mo_map, swo_sheet_name, dry_run
+        )
 
         logger.info("Step 3: Confirm all SWO")
         self.confirm_swo_all(swo_ids, dry_run)
 
         logger.info("Step 4: Link SWO to MO (by PWO name + product_id)")
-        self.link_swo_to_mo(mo_map, mo_product_map, lines_with_pwo, dry_run)
+        self.link_swo_to_mo(mo_map, mo_product_map, lines_with_pwo, dry_run, lines_by_pwo_product)
 
         logger.info("Step 5: Confirm MO (skip Non-Stock); write dates before button_plan")
-        self.confirm_mo_all(mo_map, mo_data_by_pwo, mo_ids_with_non_stock, dry_run)
+        self.confirm_mo_all(new_mo_map, mo_data_by_pwo, mo_ids_with_non_stock, dry_run)
 
         logger.info("Step 6: action_start for in-progress MOs (exclude Non-Stock)")
-        in_progress_ids = [mo_id for pwo, mo_id in mo_map.items() if in_progress_map.get(pwo)]
+        in_progress_ids = [mo_id for pwo, mo_id in new_mo_map.items() if in_progress_map.get(pwo)]
         self.action_start_in_progress_mos(in_progress_ids, mo_ids_with_non_stock, dry_run)
 
         logger.info("Step 7: Apply dates (draft/Non-Stock MOs only) and swap_old_name")
-        self.apply_dates_and_swap_names(mo_map, mo_data_by_pwo, mo_ids_with_non_stock, swo_ids, dry_run)
+        self.apply_dates_and_swap_names(new_mo_map, mo_data_by_pwo, mo_ids_with_non_stock, swo_ids, dry_run)
 
         logger.info("Import complete. MOs: %d, SWOs: %d", len(mo_map), len(swo_ids))
 
@@ -808,6 +1102,7 @@ def main():
     MO_EXCEL = os.environ.get('MRP_MO_EXCEL', str(default_mo_path))
     SWO_EXCEL = os.environ.get('MRP_SWO_EXCEL', str(default_swo_path))
     DRY_RUN = os.environ.get('MRP_SWO_DRY_RUN', '1').lower() in ('1', 'true', 'yes')
+    MO_BATCH_SIZE = int(os.environ.get('MRP_MO_CREATE_BATCH_SIZE', MO_CREATE_BATCH_SIZE))
 
     if '--execute' in sys.argv:
         DRY_RUN = False
@@ -830,6 +1125,7 @@ def main():
         mo_excel_path=MO_EXCEL,
         swo_excel_path=SWO_EXCEL,
         dry_run=DRY_RUN,
+        mo_batch_size=MO_BATCH_SIZE,
     )
 
 
@@ -20,6 +20,7 @@ Edge cases:
   - If move_line not found and setsco serial not found: create setsco.serial.number and set state to 'warehouse'.
 """
 
+import csv
 import sys
 import logging
 import re
@@ -61,6 +62,13 @@ config_path = bom_dir / "config.py"
 if bom_dir.exists() and config_path.exists() and str(bom_dir) not in sys.path:
     sys.path.insert(0, str(bom_dir))
 
+# csv_sidecar.py (CSV sidecar cell round-trip, shared with the Servicing List sink) and
+# excel_cache.py (parsed-workbook cache, needs openpyxl) live at the repository root
+sys.path.insert(0, str(script_dir.parent))
+from csv_sidecar import csv_cell  # noqa: E402
+if HAS_OPENPYXL:
+    from excel_cache import iter_sheet_rows, read_excel_cached  # noqa: E402
+
 # Odoo connection (override via env or config if needed)
 ODOO_URL = 'http://localhost:8099'
 ODOO_DB = 'lingjack-test4'
@@ -90,6 +98,9 @@ COL_ITEM_CODE = 3     # product.product.default_code
 COL_QUANTITY = 4      # quantity
 COL_SETSCO_REMARKS = 5  # setsco.serial.number name(s)
 
+# Max values per "in" domain when preloading lookups (pickings, invoices, products)
+LOOKUP_CHUNK_SIZE = 500
+
 
 def _normalize_str(val: Any) -> Optional[str]:
     if val is None:
@@ -121,6 +132,21 @@ def _normalize_item_code(val: Any) -> Optional[str]:
     return s if s else None
 
 
+def _chunked(values: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def _old_move_key(old_move_val: Optional[str]) -> Optional[int]:
+    """account.move.old_move is an integer; Excel may give '123', '123.0' or 123.0."""
+    if not old_move_val:
+        return None
+    try:
+        return int(float(str(old_move_val).strip()))
+    except (ValueError, TypeError):
+        return None
+
+
 def _expand_one_range(segment: str) -> List[str]:
     """Expand a single segment to a list of serial names.
     - 'A2011247 - A2011261' -> A2011247, A2011248, ..., A2011261 (same prefix, zero-padded).
@@ -174,7 +200,10 @@ def load_excel(path: Path, header_row: int = 0) -> List[dict]:
         raise FileNotFoundError(f"Excel not found: {path}")
     rows = []
     if HAS_PANDAS:
-        df = pd.read_excel(path, sheet_name=0, header=0)
+        if HAS_OPENPYXL:
+            df = read_excel_cached(str(path), sheet_name=0, header=0)
+        else:
+            df = pd.read_excel(path, sheet_name=0, header=0)
         # Normalize column access by index if no headers
         for _, row in df.iterrows():
             old_move = row.iloc[COL_OLD_MOVE_ID] if len(row) > COL_OLD_MOVE_ID else None
@@ -203,11 +232,7 @@ def load_excel(path: Path, header_row: int = 0) -> List[dict]:
                 "raw_row": [old_move, picking_name, delivery_date, item_str, qty, remarks],
             })
     elif HAS_OPENPYXL:
-        wb = load_workbook(path, read_only=True, data_only=True)
-        ws = wb.active
-        for i, row in enumerate(ws.iter_rows(values_only=True)):
-            if i < 1:
-                continue
+        for row in iter_sheet_rows(str(path), min_row=2):
             if not row:
                 continue
             old_move = row[COL_OLD_MOVE_ID] if len(row) > COL_OLD_MOVE_ID else None
@@ -235,63 +260,118 @@ def load_excel(path: Path, header_row: int = 0) -> List[dict]:
                 "setsco_names": names,
                 "raw_row": [old_move, picking_name, delivery_date, item_str, qty, remarks],
             })
-        wb.close()
     else:
         raise RuntimeError("Install pandas or openpyxl to read Excel.")
     return rows
 
 
-def _ensure_error_sheets(wb: Any) -> None:
-    """Ensure workbook has the 4 error sheets with headers (openpyxl)."""
-    headers = ["Old Move ID", "Picking Name", "Delivery Date", "Item Code", "Quantity", "Setsco Remarks", "Reason"]
-    sheet_names = [SHEET_DO_FOUND, SHEET_MOVE_LINE_NOT_FOUND, SHEET_SETCO_NOT_CREATED, SHEET_PICKING_NOT_CREATED]
-    for name in sheet_names:
-        if name not in wb.sheetnames:
+ERROR_HEADERS = ["Old Move ID", "Picking Name", "Delivery Date", "Item Code", "Quantity", "Setsco Remarks", "Reason"]
+ERROR_SHEETS = [SHEET_DO_FOUND, SHEET_MOVE_LINE_NOT_FOUND, SHEET_SETCO_NOT_CREATED, SHEET_PICKING_NOT_CREATED]
+
+
+def _error_row_values(raw_row: List[Any], reason: str) -> List[Any]:
+    """Pad raw_row to the 6 Excel columns and append the reason. Item Code is always text."""
+    row_values = list(raw_row or [])[:6]
+    while len(row_values) < 6:
+        row_values.append("")
+    row_values = ["" if v is None or (isinstance(v, float) and v != v) else v for v in row_values]
+    row_values[3] = _normalize_item_code(row_values[3]) or ""
+    row_values.append(reason or "")
+    return row_values
+
+
+class ErrorListSink:
+    """Streams error rows to do-setsco-error-list.xlsx without keeping them in memory.
+
+    Each row is appended (and flushed) to a per-sheet CSV sidecar next to the workbook as it occurs,
+    so a crash leaves a partial report on disk. close() merges the existing workbook rows and the
+    sidecars into a write-only workbook and removes the sidecars. Sidecars left by a crashed run
+    are picked up and merged by the next run.
+    """
+
+    def __init__(self, path: Path, sheet_names: List[str] = ERROR_SHEETS):
+        self.path = path
+        self.sheet_names = list(sheet_names)
+        self.counts: Dict[str, int] = {name: 0 for name in self.sheet_names}
+        self._files: Dict[str, Any] = {}
+        self._writers: Dict[str, Any] = {}
+
+    def sidecar_path(self, sheet_name: str) -> Path:
+        return self.path.with_name(f"{self.path.stem} - {sheet_name}.csv")
+
+    def add(self, sheet_name: str, raw_row: List[Any], reason: str = "") -> None:
+        writer = self._writers.get(sheet_name)
+        if writer is None:
+            sidecar = self.sidecar_path(sheet_name)
+            is_new = not sidecar.exists() or sidecar.stat().st_size == 0
+            f = open(sidecar, "a", newline="", encoding="utf-8")
+            writer = csv.writer(f)
+            if is_new:
+                writer.writerow(ERROR_HEADERS)
+            self._files[sheet_name] = f
+            self._writers[sheet_name] = writer
+            if sheet_name not in self.counts:
+                self.sheet_names.append(sheet_name)
+                self.counts[sheet_name] = 0
+        writer.writerow(_error_row_values(raw_row, reason))
+        self._files[sheet_name].flush()
+        self.counts[sheet_name] += 1
+
+    def close(self) -> None:
+        """Close sidecars and write the workbook (existing rows first, then this run's rows)."""
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        self._writers.clear()
+        if not HAS_OPENPYXL:
+            logger.warning("openpyxl not available; error rows kept in CSV sidecars next to %s", self.path)
+            return
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        existing = load_workbook(self.path, read_only=True) if self.path.exists() else None
+        wb = Workbook(write_only=True)
+        sidecars = []
+        existing_names = list(existing.sheetnames) if existing is not None else []
+        for name in existing_names:
+            if name not in self.sheet_names:
+                # Keep unrelated sheets of the existing workbook as they are
+                ws = wb.create_sheet(name)
+                for values in existing[name].iter_rows(values_only=True):
+                    ws.append(list(values))
+        for name in self.sheet_names:
             ws = wb.create_sheet(name)
-            ws.append(headers)
-        else:
-            ws = wb[name]
-            if ws.max_row == 0:
-                ws.append(headers)
-
-
-def write_error_excel(collector: Dict[str, List[dict]], path: Path) -> None:
-    """Append collected rows to do-setsco-error-list.xlsx (4 sheets)."""
-    if not HAS_OPENPYXL:
-        logger.warning("openpyxl not available; cannot write error list %s", path)
-        return
-    from openpyxl import load_workbook, Workbook
-    if path.exists():
-        wb = load_workbook(path)
-    else:
-        wb = Workbook()
-        wb.remove(wb.active)
-    _ensure_error_sheets(wb)
-    for sheet_name, rows in collector.items():
-        if not rows:
-            continue
-        ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.create_sheet(sheet_name)
-        if ws.max_row == 0:
-            ws.append(["Old Move ID", "Picking Name", "Delivery Date", "Item Code", "Quantity", "Setsco Remarks", "Reason"])
-        for item in rows:
-            raw = item.get("raw_row") or []
-            reason = item.get("reason", "")
-            row_values = list(raw)[:6]
-            while len(row_values) < 6:
-                row_values.append("")
-            # Item Code (column D, index 3): always text so Excel does not show scientific notation
-            if len(row_values) > 3:
-                row_values[3] = _normalize_item_code(row_values[3]) or ""
-            row_values.append(reason)
-            ws.append(row_values)
-            # Set Item Code cell format to text so it displays as full digits
-            if len(row_values) > 3:
-                _cell = ws.cell(row=ws.max_row, column=4)
-                _cell.number_format = "@"
-                if row_values[3] != "":
-                    _cell.value = row_values[3]
-    wb.save(path)
-    logger.info("Wrote error list to %s", path)
+            ws.append(ERROR_HEADERS)
+            if existing is not None and name in existing.sheetnames:
+                for i, values in enumerate(existing[name].iter_rows(values_only=True)):
+                    if i == 0 or not any(v is not None for v in values):
+                        continue
+                    ws.append(self._text_item_code(ws, WriteOnlyCell, list(values)))
+            sidecar = self.sidecar_path(name)
+            if sidecar.exists():
+                sidecars.append(sidecar)
+                with open(sidecar, newline="", encoding="utf-8") as f:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    for values in reader:
+                        ws.append(self._text_item_code(ws, WriteOnlyCell, [v if c == 3 else csv_cell(v) for c, v in enumerate(values)]))
+        if existing is not None:
+            existing.close()
+        tmp_path = self.path.with_name(f"~tmp-{self.path.name}")
+        wb.save(tmp_path)
+        tmp_path.replace(self.path)
+        for sidecar in sidecars:
+            sidecar.unlink()
+        logger.info("Wrote error list to %s (%s)", self.path,
+                    ", ".join(f"{name}: {count}" for name, count in self.counts.items()))
+
+    @staticmethod
+    def _text_item_code(ws: Any, cell_cls: Any, values: List[Any]) -> List[Any]:
+        # Item Code (column D) as a text cell so Excel does not show scientific notation
+        if len(values) > 3:
+            cell = cell_cls(ws, value=_normalize_item_code(values[3]) or "")
+            cell.number_format = "@"
+            values[3] = cell
+        return values
 
 
 class OdooDoSetscoImporter:
@@ -305,6 +385,17 @@ class OdooDoSetscoImporter:
             raise Exception(f"Authentication failed for {username} on {db}")
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo %s as %s", db, username)
+        # Run-scoped lookup caches (filled by preload_lookups, lazily extended by the find_* methods).
+        # A value of None is a negative cache entry: looked up once, not found, never re-queried.
+        self._picking_cache: Dict[str, Optional[int]] = {}
+        self._invoice_cache: Dict[int, Optional[int]] = {}
+        self._product_cache: Dict[str, Optional[int]] = {}
+        self._setsco_category_cache: Dict[int, Optional[int]] = {}
+        self._stock_location_loaded = False
+        self._stock_location_id: Optional[int] = None
+        # (picking_name, product_id) -> stock.move.line ids, for pickings fetched by preload_move_lines
+        self._move_line_index: Dict[Tuple[str, int], List[int]] = {}
+        self._indexed_pickings: set = set()
 
     def _search(self, model: str, domain: list, limit: Optional[int] = None) -> List[int]:
         kwargs = {}
@@ -317,6 +408,12 @@ class OdooDoSetscoImporter:
             return []
         return self.models.execute_kw(self.db, self.uid, self.password, model, "read", [ids], {"fields": fields})
 
+    def _search_read(self, model: str, domain: list, fields: List[str], limit: Optional[int] = None) -> List[dict]:
+        kwargs = {"fields": fields}
+        if limit is not None:
+            kwargs["limit"] = limit
+        return self.models.execute_kw(self.db, self.uid, self.password, model, "search_read", [domain], kwargs)
+
     def _write(self, model: str, ids: List[int], vals: dict) -> bool:
         vals = {k: v for k, v in vals.items() if v is not None}
         return self.models.execute_kw(self.db, self.uid, self.password, model, "write", [ids, vals])
@@ -328,42 +425,130 @@ class OdooDoSetscoImporter:
     def _call(self, model: str, method: str, ids: List[int], *args, **kwargs) -> Any:
         return self.models.execute_kw(self.db, self.uid, self.password, model, method, [ids] + list(args), kwargs)
 
+    def preload_lookups(self, rows: List[dict]) -> None:
+        """Pre-scan loaded rows and fetch every distinct picking, invoice and product in bulk.
+        One chunked search_read per model; results (including misses) are kept for the whole run.
+        """
+        picking_names = sorted({str(r["picking_name"]).strip() for r in rows if r.get("picking_name")})
+        old_moves = sorted({k for k in (_old_move_key(r.get("old_move_id")) for r in rows) if k is not None})
+        item_codes = sorted({str(r["item_code"]).strip() for r in rows if r.get("item_code")})
+
+        picking_names = [n for n in picking_names if n not in self._picking_cache]
+        for chunk in _chunked(picking_names, LOOKUP_CHUNK_SIZE):
+            recs = self._search_read("stock.picking", [("name", "in", chunk)], ["name"])
+            found: Dict[str, int] = {}
+            for rec in sorted(recs, key=lambda r: r["id"]):
+                found.setdefault(rec["name"], rec["id"])
+            for name in chunk:
+                self._picking_cache[name] = found.get(name)
+
+        old_moves = [k for k in old_moves if k not in self._invoice_cache]
+        for chunk in _chunked(old_moves, LOOKUP_CHUNK_SIZE):
+            recs = self._search_read("account.move", [
+                ("old_move", "in", chunk),
+                ("move_type", "in", ["out_invoice", "out_refund"]),
+            ], ["old_move"])
+            found_inv: Dict[int, int] = {}
+            for rec in recs:
+                key = _old_move_key(rec.get("old_move"))
+                if key is not None:
+                    found_inv.setdefault(key, rec["id"])
+            for key in chunk:
+                self._invoice_cache[key] = found_inv.get(key)
+
+        item_codes = [c for c in item_codes if c not in self._product_cache]
+        tmpl_by_product: Dict[int, int] = {}
+        for chunk in _chunked(item_codes, LOOKUP_CHUNK_SIZE):
+            recs = self._search_read("product.product", [("default_code", "in", chunk)], ["default_code", "product_tmpl_id"])
+            found_prod: Dict[str, int] = {}
+            for rec in sorted(recs, key=lambda r: r["id"]):
+                if rec["default_code"] in found_prod:
+                    continue
+                found_prod[rec["default_code"]] = rec["id"]
+                if rec.get("product_tmpl_id"):
+                    tmpl_by_product[rec["id"]] = rec["product_tmpl_id"][0]
+            for code in chunk:
+                self._product_cache[code] = found_prod.get(code)
+
+        tmpl_ids = sorted(set(tmpl_by_product.values()))
+        categ_by_tmpl: Dict[int, Optional[int]] = {}
+        for chunk in _chunked(tmpl_ids, LOOKUP_CHUNK_SIZE):
+            for tmpl in self._read("product.template", chunk, ["setsco_category_id"]):
+                categ = tmpl.get("setsco_category_id")
+                categ_by_tmpl[tmpl["id"]] = categ[0] if categ else None
+        for product_id, tmpl_id in tmpl_by_product.items():
+            self._setsco_category_cache[product_id] = categ_by_tmpl.get(tmpl_id)
+
+        self.get_stock_location_stock()
+        logger.info(
+            "Preloaded lookups: %d pickings (%d missing), %d invoices (%d missing), %d products (%d missing)",
+            len(self._picking_cache), sum(1 for v in self._picking_cache.values() if v is None),
+            len(self._invoice_cache), sum(1 for v in self._invoice_cache.values() if v is None),
+            len(self._product_cache), sum(1 for v in self._product_cache.values() if v is None),
+        )
+
+    def preload_move_lines(self) -> None:
+        """Fetch every stock.move.line of the preloaded pickings in bulk and index them by
+        (picking_name, product_id), so move-line matching in process_row is a local lookup.
+        """
+        name_by_picking = {pid: name for name, pid in self._picking_cache.items()
+                           if pid and name not in self._indexed_pickings}
+        picking_ids = sorted(name_by_picking)
+        total = 0
+        for chunk in _chunked(picking_ids, LOOKUP_CHUNK_SIZE):
+            recs = self._search_read("stock.move.line", [("picking_id", "in", chunk)], ["picking_id", "product_id"])
+            for rec in sorted(recs, key=lambda r: r["id"]):
+                if not rec.get("picking_id") or not rec.get("product_id"):
+                    continue
+                key = (name_by_picking[rec["picking_id"][0]], rec["product_id"][0])
+                self._move_line_index.setdefault(key, []).append(rec["id"])
+                total += 1
+            self._indexed_pickings.update(name_by_picking[pid] for pid in chunk)
+        logger.info("Indexed %d move lines across %d pickings", total, len(picking_ids))
+
     def find_invoice_by_old_move(self, old_move_val: Optional[str]) -> Optional[int]:
-        if not old_move_val:
-            return None
-        try:
-            old_id = int(float(str(old_move_val).strip()))
-        except (ValueError, TypeError):
+        old_id = _old_move_key(old_move_val)
+        if old_id is None:
             return None
+        if old_id in self._invoice_cache:
+            return self._invoice_cache[old_id]
         ids = self._search("account.move", [
             ("old_move", "=", old_id),
             ("move_type", "in", ["out_invoice", "out_refund"]),
         ], limit=1)
-        return ids[0] if ids else None
+        self._invoice_cache[old_id] = ids[0] if ids else None
+        return self._invoice_cache[old_id]
 
     def find_picking_by_name(self, name: Optional[str]) -> Optional[int]:
         if not name:
             return None
         name = str(name).strip()
+        if name in self._picking_cache:
+            return self._picking_cache[name]
         ids = self._search("stock.picking", [("name", "=", name)], limit=1)
-        return ids[0] if ids else None
+        self._picking_cache[name] = ids[0] if ids else None
+        return self._picking_cache[name]
 
     def find_product_by_default_code(self, code: Optional[str]) -> Optional[int]:
         if not code:
             return None
         code = str(code).strip()
-        if isinstance(code, float):
-            code = str(int(code))
+        if code in self._product_cache:
+            return self._product_cache[code]
         ids = self._search("product.product", [("default_code", "=", code)], limit=1)
-        return ids[0] if ids else None
+        self._product_cache[code] = ids[0] if ids else None
+        return self._product_cache[code]
 
     def find_move_lines(self, picking_name: str, product_id: int) -> List[int]:
         """Stock move lines for this picking and product (outgoing)."""
-        picking_ids = self._search("stock.picking", [("name", "=", picking_name)], limit=1)
-        if not picking_ids:
+        picking_name = str(picking_name).strip()
+        if picking_name in self._indexed_pickings:
+            return list(self._move_line_index.get((picking_name, product_id), []))
+        picking_id = self.find_picking_by_name(picking_name)
+        if not picking_id:
             return []
         ids = self._search("stock.move.line", [
-            ("picking_id", "=", picking_ids[0]),
+            ("picking_id", "=", picking_id),
             ("product_id", "=", product_id),
         ], limit=None)
         return ids
@@ -375,22 +560,28 @@ class OdooDoSetscoImporter:
 
     def get_product_setsco_category(self, product_id: int) -> Optional[int]:
         """Get setsco_category_id from product.template (product.product has related)."""
+        if product_id in self._setsco_category_cache:
+            return self._setsco_category_cache[product_id]
+        categ_id = None
         prods = self._read("product.product", [product_id], ["product_tmpl_id"])
-        if not prods or not prods[0].get("product_tmpl_id"):
-            return None
-        tmpl_id = prods[0]["product_tmpl_id"][0]
-        tmpls = self._read("product.template", [tmpl_id], ["setsco_category_id"])
-        if not tmpls or not tmpls[0].get("setsco_category_id"):
-            return None
-        return tmpls[0]["setsco_category_id"][0]
+        if prods and prods[0].get("product_tmpl_id"):
+            tmpl_id = prods[0]["product_tmpl_id"][0]
+            tmpls = self._read("product.template", [tmpl_id], ["setsco_category_id"])
+            if tmpls and tmpls[0].get("setsco_category_id"):
+                categ_id = tmpls[0]["setsco_category_id"][0]
+        self._setsco_category_cache[product_id] = categ_id
+        return categ_id
 
     def get_stock_location_stock(self) -> Optional[int]:
-        ids = self._search("stock.location", [("usage", "=", "internal"), ("name", "=", "Stock")], limit=1)
-        return ids[0] if ids else None
+        if not self._stock_location_loaded:
+            ids = self._search("stock.location", [("usage", "=", "internal"), ("name", "=", "Stock")], limit=1)
+            self._stock_location_id = ids[0] if ids else None
+            self._stock_location_loaded = True
+        return self._stock_location_id
 
-    def process_row(self, row: dict, error_collector: Dict[str, List[dict]]) -> Tuple[int, int, int]:
+    def process_row(self, row: dict, error_sink: ErrorListSink) -> Tuple[int, int, int]:
         """Process one Excel row. Returns (linked_count, warehouse_count, created_count).
-        Appends to error_collector for DO Found, Move Line not found, Setco not created as needed.
+        Streams to error_sink for DO Found, Move Line not found, Setco not created as needed.
         """
         old_move_val = row.get("old_move_id")
         picking_name = row.get("picking_name")
@@ -404,14 +595,11 @@ class OdooDoSetscoImporter:
         # Picking check: when column B (picking_name) is present, picking must exist (handled in run() before calling process_row)
         picking_id = self.find_picking_by_name(picking_name) if picking_name else None
         if picking_name and not picking_id:
-            error_collector[SHEET_PICKING_NOT_CREATED].append({
-                "raw_row": raw_row,
-                "reason": "Picking not found in Odoo",
-            })
+            error_sink.add(SHEET_PICKING_NOT_CREATED, raw_row, "Picking not found in Odoo")
             return (0, 0, 0)
 
         if picking_name and picking_id:
-            error_collector[SHEET_DO_FOUND].append({"raw_row": raw_row, "reason": ""})
+            error_sink.add(SHEET_DO_FOUND, raw_row)
 
         invoice_id = self.find_invoice_by_old_move(old_move_val)
         product_id = self.find_product_by_default_code(item_code) if item_code else None
@@ -420,18 +608,10 @@ class OdooDoSetscoImporter:
             move_line_ids = self.find_move_lines(picking_name, product_id)
 
         move_line_id = move_line_ids[0] if move_line_ids else None
-        picking_id_from_line = None
-        if move_line_ids:
-            lines = self._read("stock.move.line", [move_line_ids[0]], ["picking_id"])
-            if lines and lines[0].get("picking_id"):
-                picking_id_from_line = lines[0]["picking_id"][0]
-        picking_id = picking_id or picking_id_from_line
+        # Move lines are matched on the picking found above, so it is also the line's picking_id
 
         if picking_name and product_id and not move_line_id:
-            error_collector[SHEET_MOVE_LINE_NOT_FOUND].append({
-                "raw_row": raw_row,
-                "reason": "No move line for this picking + product",
-            })
+            error_sink.add(SHEET_MOVE_LINE_NOT_FOUND, raw_row, "No move line for this picking + product")
 
         linked, to_warehouse, created = 0, 0, 0
         stock_location_id = self.get_stock_location_stock() if (not move_line_id) else None
@@ -507,34 +687,30 @@ class OdooDoSetscoImporter:
                     logger.info("Created serial %s (no move line), state=warehouse", name)
 
         if setco_not_created_reasons:
-            error_collector[SHEET_SETCO_NOT_CREATED].append({
-                "raw_row": raw_row,
-                "reason": "; ".join(setco_not_created_reasons),
-            })
+            error_sink.add(SHEET_SETCO_NOT_CREATED, raw_row, "; ".join(setco_not_created_reasons))
 
         return (linked, to_warehouse, created)
 
     def run(self, excel_path: Path, error_list_path: Optional[Path] = None) -> dict:
         rows = load_excel(excel_path)
         logger.info("Loaded %d rows from %s", len(rows), excel_path)
-        error_collector = {
-            SHEET_DO_FOUND: [],
-            SHEET_MOVE_LINE_NOT_FOUND: [],
-            SHEET_SETCO_NOT_CREATED: [],
-            SHEET_PICKING_NOT_CREATED: [],
-        }
-        total_linked, total_warehouse, total_created = 0, 0, 0
-        for i, row in enumerate(rows):
-            try:
-                a, b, c = self.process_row(row, error_collector)
-                total_linked += a
-                total_warehouse += b
-                total_created += c
-            except Exception as e:
-                logger.exception("Row %s error: %s", i + 1, e)
+        self.preload_lookups(rows)
+        self.preload_move_lines()
         if error_list_path is None:
             error_list_path = ERROR_LIST_FILE
-        write_error_excel(error_collector, error_list_path)
+        error_sink = ErrorListSink(error_list_path)
+        total_linked, total_warehouse, total_created = 0, 0, 0
+        try:
+            for i, row in enumerate(rows):
+                try:
+                    a, b, c = self.process_row(row, error_sink)
+                    total_linked += a
+                    total_warehouse += b
+                    total_created += c
+                except Exception as e:
+                    logger.exception("Row %s error: %s", i + 1, e)
+        finally:
+            error_sink.close()
         return {"linked": total_linked, "to_warehouse": total_warehouse, "created": total_created}
 
 
@@ -24,6 +24,7 @@ and field keys in _row_to_vals().
 """
 
 import argparse
+import csv
 import sys
 import logging
 from datetime import datetime, date
@@ -36,6 +37,12 @@ import pandas as pd
 # Path setup
 script_dir = Path(__file__).resolve().parent
 
+# excel_cache.py (parsed-workbook cache), csv_sidecar.py and odoo_batch.py live at the repository root
+sys.path.insert(0, str(script_dir.parent))
+from excel_cache import read_excel_cached  # noqa: E402
+from csv_sidecar import csv_cell  # noqa: E402
+from odoo_batch import create_many  # noqa: E402
+
 # Odoo connection (override via env or config if needed)
 ODOO_URL = 'http://localhost:8099'
 ODOO_DB = 'lingjack-migration-2'
@@ -65,6 +72,9 @@ LJ_ENGINEERING_MARKER = 'LJ Engineering'
 DEFAULT_EXCEL_FILE = 'QRServiceReport.xlsx'
 # Rows skipped due to missing product type are written here (same folder as this script)
 SKIPPED_PRODUCT_TYPE_EXCEL = 'servicing_list_skipped_product_type.xlsx'
+SKIP_REASON_COL = 'Skip reason'
+# Records per multi-record create call (x_fe_service_in_house / x_fe_service_onsite)
+CREATE_BATCH_SIZE = 200
 
 # Logging
 logger = logging.getLogger(__name__)
@@ -114,6 +124,53 @@ def _parse_date(value: Any) -> Optional[date]:
         return None
 
 
+class SkippedRowSink:
+    """
+    Streams skipped rows to servicing_list_skipped_product_type.xlsx as they occur.
+
+    Rows are appended (and flushed) to a CSV sidecar next to the Excel file, so memory stays flat
+    and a crash still leaves the partial list on disk. close() converts the sidecar into the Excel
+    file with a write-only workbook and removes it.
+    """
+
+    def __init__(self, path: Path, columns: List[str]):
+        self.path = path
+        self.sidecar_path = path.with_suffix('.csv')
+        self.columns = [str(c) for c in columns] + [SKIP_REASON_COL]
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, row: pd.Series, reason: str) -> None:
+        """Append one source row plus its skip reason."""
+        if self._writer is None:
+            self._file = open(self.sidecar_path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+        values = ['' if v is None or (not isinstance(v, str) and pd.isna(v)) else v for v in row.tolist()]
+        self._writer.writerow(values + [reason])
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the Excel file from the sidecar (only if anything was skipped)."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._writer = None
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        with open(self.sidecar_path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            ws.append(next(reader, self.columns))
+            for values in reader:
+                ws.append([csv_cell(v) for v in values])
+        wb.save(self.path)
+        self.sidecar_path.unlink()
+
+
 class ServicingListImporter:
     """Import QRServiceReport.xlsx to Odoo x_fe_service_in_house / x_fe_service_onsite via XML-RPC."""
 
@@ -129,6 +186,8 @@ class ServicingListImporter:
             raise Exception(f"Authentication failed for user '{username}' on database '{db}'.")
         self.models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
         logger.info("Connected to Odoo DB '%s' as '%s'", db, username)
+        # x_product_type_fe x_name (normalized) -> id; loaded once by load_product_types()
+        self._product_types: Optional[Dict[str, int]] = None
 
     def _search(self, model: str, domain: list, limit: int = 1) -> List[int]:
         """Search records in Odoo."""
@@ -161,30 +220,71 @@ class ServicingListImporter:
             model, 'create', [filtered_vals]
         )
 
+    def _create_many(self, model: str, vals_list: List[dict]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+        """
+        Create several records in one call; if it fails, bisect the batch down to the failing records.
+        Returns (ids in vals_list order, None for failed records; {index: error message}).
+        """
+        return create_many(
+            [{k: v for k, v in vals.items() if v is not None} for vals in vals_list],
+            lambda batch: self.models.execute_kw(
+                self.db, self.uid, self.password,
+                model, 'create', [batch]
+            ),
+        )
+
+    def _flush_creates(self, model: str, pending: List[Tuple[int, dict]], stats: Dict[str, int]) -> None:
+        """
+        Create buffered (row_num, vals) for one model with a single multi-record create.
+        If the batch fails, bisect it so only the failing rows are logged as errors.
+        """
+        if not pending:
+            return
+        stat_key = 'in_house' if model == MODEL_IN_HOUSE else 'onsite'
+        _ids, failed = self._create_many(model, [vals for _, vals in pending])
+        for index, error in failed.items():
+            logger.error("Row %s create failed (%s): %s", pending[index][0], model, error)
+        stats[stat_key] += len(pending) - len(failed)
+        stats['errors'] += len(failed)
+
+    def load_product_types(self) -> Dict[str, int]:
+        """Load all x_product_type_fe names in one search_read (normalized x_name -> id)."""
+        if self._product_types is None:
+            records = self._search_read('x_product_type_fe', [], ['x_name'])
+            product_types: Dict[str, int] = {}
+            for rec in sorted(records, key=lambda r: r['id']):
+                name = _normalize_str(rec.get('x_name'))
+                if name:
+                    product_types.setdefault(name, rec['id'])
+            self._product_types = product_types
+            logger.info("Loaded %s product types from x_product_type_fe", len(product_types))
+        return self._product_types
+
     def find_product_type_by_name(self, name: str) -> Optional[int]:
-        """Find x_product_type_fe id by x_name (exact match)."""
+        """Find x_product_type_fe id by x_name (exact match, from the preloaded dictionary)."""
         if not name:
             return None
         name = _normalize_str(name)
         if not name:
             return None
-        ids = self._search('x_product_type_fe', [('x_name', '=', name)], limit=1)
-        return ids[0] if ids else None
+        return self.load_product_types().get(name)
 
-    def dry_run_product_types(self, excel_path: str) -> Tuple[bool, List[str]]:
+    def dry_run_product_types(self, excel_path: str, df: Optional[pd.DataFrame] = None) -> Tuple[bool, List[str]]:
         """
         Validate that every unique product type (Column B) in the Excel exists in x_product_type_fe.
+        Pass the already-loaded DataFrame as df to avoid parsing the Excel a second time.
         Returns (all_found, list of error messages).
         """
         errors: List[str] = []
-        if not Path(excel_path).exists():
-            errors.append(f"Excel file not found: {excel_path}")
-            return False, errors
-        try:
-            df = pd.read_excel(excel_path)
-        except Exception as e:
-            errors.append(f"Failed to read Excel: {e}")
-            return False, errors
+        if df is None:
+            if not Path(excel_path).exists():
+                errors.append(f"Excel file not found: {excel_path}")
+                return False, errors
+            try:
+                df = read_excel_cached(excel_path)
+            except Exception as e:
+                errors.append(f"Failed to read Excel: {e}")
+                return False, errors
         if COL_SERVICE_PRODUCT_NAME not in df.columns:
             errors.append(f"Column '{COL_SERVICE_PRODUCT_NAME}' (Column B) not found.")
             return False, errors
@@ -257,10 +357,11 @@ class ServicingListImporter:
             return False
         return LJ_ENGINEERING_MARKER.lower() in str(val).strip().lower()
 
-    def import_from_excel(self, excel_path: str, dry_run: bool = False) -> bool:
+    def import_from_excel(self, excel_path: str, dry_run: bool = False, batch_size: int = CREATE_BATCH_SIZE) -> bool:
         """
         Run dry-run validation first; then create records.
         - If dry_run: only validate product types and log what would be created (no create).
+        - Records are created per target model in multi-record batches of batch_size.
         """
         logger.info("=" * 80)
         logger.info("QRServiceReport.xlsx Servicing List Import")
@@ -271,7 +372,7 @@ class ServicingListImporter:
             logger.error("Excel file not found: %s", excel_path)
             return False
         try:
-            df = pd.read_excel(excel_path)
+            df = read_excel_cached(excel_path)
         except Exception as e:
             logger.error("Failed to read Excel: %s", e)
             return False
@@ -281,14 +382,45 @@ class ServicingListImporter:
             logger.error("Missing columns: %s", missing)
             return False
         if dry_run:
-            passed, errs = self.dry_run_product_types(excel_path)
+            passed, errs = self.dry_run_product_types(excel_path, df)
             for e in errs:
                 logger.error("%s", e)
             if not passed:
                 logger.error("Dry run: not all product types exist in x_product_type_fe (see above).")
                 return False
         stats = {'in_house': 0, 'onsite': 0, 'errors': 0, 'skipped': 0, 'skipped_product_type': 0}
-        skipped_product_type_rows: List[pd.Series] = []
+        skipped_path = (script_dir / SKIPPED_PRODUCT_TYPE_EXCEL).resolve()
+        skipped_sink = SkippedRowSink(skipped_path, list(df.columns))
+        try:
+            self._import_rows(df, dry_run, stats, skipped_sink, max(1, batch_size))
+        finally:
+            try:
+                skipped_sink.close()
+                if skipped_sink.count:
+                    logger.info("Skipped rows (product type not found) written to: %s (%s rows)", skipped_path, skipped_sink.count)
+            except Exception as e:
+                logger.error("Failed to write skipped-product-type Excel (rows kept in %s): %s",
+                             skipped_sink.sidecar_path, e, exc_info=True)
+        logger.info("=" * 80)
+        logger.info("IMPORT SUMMARY")
+        logger.info("  In-house (%s): %s", MODEL_IN_HOUSE, stats['in_house'])
+        logger.info("  Onsite (%s): %s", MODEL_ONSITE, stats['onsite'])
+        logger.info("  Errors: %s", stats['errors'])
+        logger.info("  Skipped (product type not found): %s -> %s", stats['skipped_product_type'], skipped_path)
+        logger.info("  Skipped (other): %s", stats['skipped'])
+        logger.info("=" * 80)
+        return stats['errors'] == 0
+
+    def _import_rows(
+        self,
+        df: pd.DataFrame,
+        dry_run: bool,
+        stats: Dict[str, int],
+        skipped_sink: SkippedRowSink,
+        batch_size: int,
+    ) -> None:
+        """Create (or log in dry run) one record per row; skipped rows go to skipped_sink."""
+        pending: Dict[str, List[Tuple[int, dict]]] = {MODEL_IN_HOUSE: [], MODEL_ONSITE: []}
         for idx, row in df.iterrows():
             row_num = idx + 2
             try:
@@ -300,9 +432,7 @@ class ServicingListImporter:
                 product_type_id = self.find_product_type_by_name(product_name) if product_name else None
                 if product_name and product_type_id is None:
                     logger.warning("Row %s: product type '%s' not found; skip and add to skipped list.", row_num, product_name)
-                    row_with_reason = row.copy()
-                    row_with_reason['Skip reason'] = f"Product type not found in x_product_type_fe: {product_name}"
-                    skipped_product_type_rows.append(row_with_reason)
+                    skipped_sink.add(row, f"Product type not found in x_product_type_fe: {product_name}")
                     stats['skipped_product_type'] += 1
                     continue
                 vals = self._row_to_vals(row, product_type_id, dry_run)
@@ -318,37 +448,15 @@ class ServicingListImporter:
                     else:
                         stats['onsite'] += 1
                     continue
-                try:
-                    self._create(model, vals)
-                    if is_in_house:
-                        stats['in_house'] += 1
-                    else:
-                        stats['onsite'] += 1
-                except Exception as e:
-                    logger.error("Row %s create failed (%s): %s", row_num, model, e)
-                    stats['errors'] += 1
+                pending[model].append((row_num, vals))
+                if len(pending[model]) >= batch_size:
+                    self._flush_creates(model, pending[model], stats)
+                    pending[model] = []
             except Exception as e:
                 logger.error("Row %s error: %s", row_num, e, exc_info=True)
                 stats['errors'] += 1
-        if skipped_product_type_rows:
-            skipped_path = (script_dir / SKIPPED_PRODUCT_TYPE_EXCEL).resolve()
-            try:
-                # Build from list of dicts so columns and data align; preserve original columns + Skip reason
-                skipped_dicts = [s.to_dict() for s in skipped_product_type_rows]
-                skipped_df = pd.DataFrame(skipped_dicts)
-                skipped_df.to_excel(skipped_path, index=False)
-                logger.info("Skipped rows (product type not found) written to: %s (%s rows)", skipped_path, len(skipped_product_type_rows))
-            except Exception as e:
-                logger.error("Failed to write skipped-product-type Excel: %s", e, exc_info=True)
-        logger.info("=" * 80)
-        logger.info("IMPORT SUMMARY")
-        logger.info("  In-house (%s): %s", MODEL_IN_HOUSE, stats['in_house'])
-        logger.info("  Onsite (%s): %s", MODEL_ONSITE, stats['onsite'])
-        logger.info("  Errors: %s", stats['errors'])
-        logger.info("  Skipped (product type not found): %s -> %s", stats['skipped_product_type'], (script_dir / SKIPPED_PRODUCT_TYPE_EXCEL).resolve())
-        logger.info("  Skipped (other): %s", stats['skipped'])
-        logger.info("=" * 80)
-        return stats['errors'] == 0
+        for model, items in pending.items():
+            self._flush_creates(model, items, stats)
 
 
 def main():
@@ -357,11 +465,13 @@ def main():
     )
     parser.add_argument('--dry-run', action='store_true', help='Only validate product types and log would-be creates')
     parser.add_argument('--file', type=str, default=None, help=f'Path to Excel (default: {DEFAULT_EXCEL_FILE} in script dir)')
+    parser.add_argument('--batch-size', type=int, default=CREATE_BATCH_SIZE,
+                        help=f'Records per create call (default: {CREATE_BATCH_SIZE})')
     args = parser.parse_args()
     excel_file = args.file or str(script_dir / DEFAULT_EXCEL_FILE)
     try:
         importer = ServicingListImporter(ODOO_URL, ODOO_DB, ODOO_USERNAME, ODOO_PASSWORD)
-        success = importer.import_from_excel(excel_file, dry_run=args.dry_run)
+        success = importer.import_from_excel(excel_file, dry_run=args.dry_run, batch_size=args.batch_size)
         return 0 if success else 1
     except Exception as e:
         logger.error("Import failed: %s", e, exc_info=True)
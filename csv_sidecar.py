@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+CSV sidecar cell helper shared by the streamed report sinks
+
+The error / skipped-row reports are streamed row by row to a CSV sidecar and
+converted to xlsx when the run ends. CSV stores every cell as text, so this
+module turns the text back into the value that was written: empty cells become
+None, and ints, floats and datetimes are restored; anything else stays text.
+
+Usage (scripts add the repository root to sys.path first):
+
+    from csv_sidecar import csv_cell
+
+    ws.append([csv_cell(v) for v in values])
+"""
+
+from datetime import datetime
+from typing import Any
+
+
+def csv_cell(value: str) -> Any:
+    """Restore a value written to a CSV sidecar (None, int, float, datetime; else the text)"""
+    if not value:
+        return None
+    try:
+        if str(int(value)) == value:
+            return int(value)
+    except ValueError:
+        pass
+    try:
+        if repr(float(value)) == value:
+            return float(value)
+    except ValueError:
+        pass
+    # str(datetime) / str(date) / str(pd.Timestamp): 'YYYY-MM-DD[ HH:MM:SS[.ffffff]]'
+    if len(value) >= 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
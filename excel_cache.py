@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Parsed-workbook cache shared by the import scripts
+
+Parsing large xlsx files with openpyxl or pandas dominates the start of every
+run. The first read of a sheet stores its parsed rows in a local pickle file
+under `.excel_cache/` next to the workbook, keyed by the file content hash and
+sheet name; later reads of the unchanged file (reruns, dry runs, pre-run
+checks) load the cache instead. Editing the workbook changes its hash, so a
+stale cache is never used and is removed on the next write.
+
+Usage (scripts add the repository root to sys.path first):
+
+    from excel_cache import iter_sheet_rows, read_excel_cached
+
+    for row in iter_sheet_rows('output.xlsx', 'Sheet1', min_row=2):
+        ...
+    df = read_excel_cached('QRServiceReport.xlsx')
+"""
+
+import glob
+import hashlib
+import itertools
+import logging
+import os
+import pickle
+import re
+from typing import Iterator, Optional, Tuple
+
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+# Set to False to always parse the workbook (e.g. when debugging the cache itself)
+USE_EXCEL_CACHE = os.environ.get('EXCEL_CACHE', '1').lower() not in ('0', 'false', 'no')
+
+CACHE_DIR_NAME = '.excel_cache'
+
+# Rows per pickled chunk; rows are streamed chunk by chunk, so memory stays bounded
+CACHE_CHUNK_ROWS = 1000
+
+
+def _cache_paths(excel_path: str, key: str) -> Tuple[str, str]:
+    """Return (cache file, glob matching every cache file of this workbook + key) for one workbook sheet"""
+    digest = hashlib.sha1()
+    with open(excel_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    stem = os.path.splitext(os.path.basename(excel_path))[0]
+    safe_key = re.sub(r'[^A-Za-z0-9_.-]+', '_', key)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(excel_path)), CACHE_DIR_NAME)
+    cache_path = os.path.join(cache_dir, f"{stem}-{digest.hexdigest()[:16]}-{safe_key}.pkl")
+    stale_glob = os.path.join(glob.escape(cache_dir), f"{glob.escape(stem)}-*-{glob.escape(safe_key)}.pkl")
+    return cache_path, stale_glob
+
+
+def _open_cache_for_write(cache_path: str):
+    """Open a temp file next to cache_path, or return None if the cache directory is not writable"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        return open(cache_path + '.tmp', 'wb')
+    except OSError as e:
+        logger.warning("Excel cache disabled for %s: %s", cache_path, e)
+        return None
+
+
+def _discard_cache(out, cache_path: str) -> None:
+    out.close()
+    if os.path.exists(cache_path + '.tmp'):
+        os.remove(cache_path + '.tmp')
+
+
+def _commit_cache(cache_path: str, stale_glob: str) -> None:
+    """Move the finished temp file into place and drop caches of older versions of the workbook"""
+    os.replace(cache_path + '.tmp', cache_path)
+    for path in glob.glob(stale_glob):
+        if path != cache_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _iter_cached_rows(cache_path: str) -> Iterator[tuple]:
+    with open(cache_path, 'rb') as f:
+        while True:
+            # EOFError here means the end marker is missing, i.e. the cache is truncated
+            chunk = pickle.load(f)
+            if chunk is None:
+                return
+            yield from chunk
+
+
+def _iter_and_cache_rows(excel_path: str, sheet_name: Optional[str],
+                         cache_path: Optional[str], stale_glob: Optional[str]) -> Iterator[tuple]:
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    out = _open_cache_for_write(cache_path) if cache_path else None
+    complete = False
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        chunk = []
+        for row in ws.iter_rows(values_only=True):
+            yield row
+            if out:
+                chunk.append(row)
+                if len(chunk) >= CACHE_CHUNK_ROWS:
+                    try:
+                        pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+                    except OSError as e:
+                        logger.warning("Could not write Excel cache %s: %s", cache_path, e)
+                        _discard_cache(out, cache_path)
+                        out = None
+                    chunk = []
+        if out:
+            try:
+                if chunk:
+                    pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(None, out, protocol=pickle.HIGHEST_PROTOCOL)  # end marker
+                out.close()
+                _commit_cache(cache_path, stale_glob)
+                complete = True
+                logger.info("Cached parsed sheet '%s' of %s", sheet_name or ws.title, excel_path)
+            except OSError as e:
+                logger.warning("Could not write Excel cache %s: %s", cache_path, e)
+    finally:
+        wb.close()
+        if out and not complete:
+            # Reader stopped early or parsing failed: never leave a partial cache behind
+            _discard_cache(out, cache_path)
+
+
+def iter_sheet_rows(excel_path: str, sheet_name: Optional[str] = None, min_row: int = 1) -> Iterator[tuple]:
+    """
+    Yield the rows of a sheet as tuples of cell values, starting at min_row (1-based)
+
+    Equivalent to ``ws.iter_rows(min_row=min_row, values_only=True)`` on a read-only,
+    data-only workbook, but served from the local cache when the file is unchanged.
+    A corrupt or truncated cache is removed and the workbook is parsed again; rows
+    already yielded from the cache are not yielded twice.
+
+    Args:
+        excel_path: Path to the xlsx file
+        sheet_name: Sheet name (default: active sheet)
+        min_row: First row to yield (1-based)
+    """
+    cache_path = stale_glob = None
+    if USE_EXCEL_CACHE:
+        cache_path, stale_glob = _cache_paths(excel_path, sheet_name or '_active')
+    skip = max(0, min_row - 1)
+    served = 0
+    if cache_path and os.path.exists(cache_path):
+        logger.info("Loading sheet '%s' of %s from cache", sheet_name or '_active', excel_path)
+        try:
+            for row in _iter_cached_rows(cache_path):
+                if served >= skip:
+                    yield row
+                served += 1
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable Excel cache %s: %s", cache_path, e)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+    rows = _iter_and_cache_rows(excel_path, sheet_name, cache_path, stale_glob)
+    yield from itertools.islice(rows, max(skip, served), None)
+
+
+def read_excel_cached(excel_path: str, sheet_name=0, **kwargs):
+    """
+    ``pandas.read_excel`` with the same local cache
+
+    The cache key includes the sheet and every read option, so different
+    ``header``/``skiprows``/... arguments on the same sheet are cached separately.
+    """
+    import pandas as pd
+
+    if not USE_EXCEL_CACHE:
+        return pd.read_excel(excel_path, sheet_name=sheet_name, **kwargs)
+
+    options = hashlib.sha1(repr(sorted(kwargs.items())).encode('utf-8')).hexdigest()[:8]
+    cache_path, stale_glob = _cache_paths(excel_path, f"{sheet_name}-{options}")
+    if os.path.exists(cache_path):
+        try:
+            logger.info("Loading sheet '%s' of %s from cache", sheet_name, excel_path)
+            return pd.read_pickle(cache_path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable Excel cache %s: %s", cache_path, e)
+
+    df = pd.read_excel(excel_path, sheet_name=sheet_name, **kwargs)
+    out = _open_cache_for_write(cache_path)
+    if out:
+        try:
+            pickle.dump(df, out, protocol=pickle.HIGHEST_PROTOCOL)
+            out.close()
+            _commit_cache(cache_path, stale_glob)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning("Could not write Excel cache %s: %s", cache_path, e)
+            _discard_cache(out, cache_path)
+    return df
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Batched XML-RPC call helpers shared by the import scripts
+
+Record methods (action_confirm, button_set_done, swap_old_name, write, ...)
+are called on chunks of ids instead of one id at a time. When a chunk fails,
+it is bisected until only the failing records are left, so one bad record
+does not block the rest of its chunk.
+
+Records are created with one multi-record create per batch. When the batch
+fails, it is bisected the same way, so the bad records are found in about
+2*log2(batch) creates and only they are lost.
+
+Usage (scripts add the repository root to sys.path first):
+
+    from odoo_batch import create_many, run_chunked
+
+    ok_ids, failed = run_chunked(ids, lambda chunk: models.execute_kw(
+        db, uid, password, 'mrp.production', 'button_set_done', [chunk]))
+    for mo_id, error in failed.items():
+        ...
+
+    ids, failed = create_many(vals_list, lambda batch: models.execute_kw(
+        db, uid, password, 'mrp.production', 'create', [batch]))
+    for index, error in failed.items():
+        ...
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Records per chunked call (a failing chunk is bisected down to single ids)
+DEFAULT_CHUNK_SIZE = 50
+
+
+def run_chunked(
+    ids: List[int],
+    action: Callable[[List[int]], object],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Run action(chunk_of_ids) over ids in chunks, bisecting failing chunks
+
+    Returns:
+        tuple: (ok_ids, {failed_id: error message}), ok_ids in call order
+    """
+    ok_ids: List[int] = []
+    failed: Dict[int, str] = {}
+
+    def run(chunk: List[int]) -> None:
+        try:
+            action(chunk)
+            ok_ids.extend(chunk)
+        except Exception as e:
+            if len(chunk) == 1:
+                failed[chunk[0]] = str(e)
+                return
+            mid = len(chunk) // 2
+            run(chunk[:mid])
+            run(chunk[mid:])
+
+    for i in range(0, len(ids), max(1, chunk_size)):
+        run(list(ids[i:i + chunk_size]))
+    return ok_ids, failed
+
+
+def create_many(
+    vals_list: List[dict],
+    create: Callable[[List[dict]], List[int]],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+    """
+    Create records with create(vals_list), bisecting a failing batch down to single records
+
+    Returns:
+        tuple: (ids in vals_list order, None for failed records; {index in vals_list: error message})
+    """
+    ids: List[Optional[int]] = [None] * len(vals_list)
+    failed: Dict[int, str] = {}
+
+    def run(start: int, end: int) -> None:
+        try:
+            for index, rec_id in enumerate(create(list(vals_list[start:end])), start):
+                ids[index] = rec_id
+        except Exception as e:
+            if end - start == 1:
+                failed[start] = str(e)
+                return
+            mid = (start + end) // 2
+            run(start, mid)
+            run(mid, end)
+
+    if vals_list:
+        run(0, len(vals_list))
+    return ids, failed